@@ -0,0 +1,89 @@
+"""Rows per second and peak RSS of ``python -m residency batch`` on a synthetic log.
+
+    PYTHONPATH=. python benchmarks/bench_batch_cli.py --trips 10000000 --format parquet
+
+The synthetic file is written to a temporary directory (or ``--keep DIR``),
+then the CLI runs in a child process so its peak RSS can be read from
+``getrusage(RUSAGE_CHILDREN)``.
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from residency import engine
+
+ROOT = Path(__file__).resolve().parent.parent
+TAX_YEAR = 2025
+
+
+def write_synthetic(path: Path, trips: int, trips_per_person: int, seed: int = 0, block: int = 1_000_000):
+    """Write ``trips`` rows grouped by person, ``block`` rows at a time."""
+    rng = np.random.default_rng(seed)
+    parquet = path.suffix == ".parquet"
+    schema = pa.schema([
+        ("person_id", pa.string()), ("visa_type", pa.string()), ("exempt_years", pa.int64()),
+        ("start", pa.date32()), ("end", pa.date32()),
+    ])
+    writer = pq.ParquetWriter(path, schema) if parquet else pa_csv.CSVWriter(path, schema)
+    visas = np.array(engine.VISA_TYPES, dtype=object)
+    first_day = np.datetime64(f"{TAX_YEAR - 2}-01-01")
+    with writer:
+        for lo in range(0, trips, block):
+            n = min(block, trips - lo)
+            row = np.arange(lo, lo + n)
+            person = row // trips_per_person
+            visa = visas[(person * 2654435761) % len(visas)]
+            start = first_day + rng.integers(0, 3 * 365, n).astype("timedelta64[D]")
+            end = start + rng.integers(0, 60, n).astype("timedelta64[D]")
+            writer.write_table(pa.table([
+                pa.array([f"P{p:09d}" for p in person]),
+                pa.array(visa, pa.string()),
+                pa.array(person % 7),
+                pa.array(start),
+                pa.array(end),
+            ], schema=schema))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trips", type=int, default=10_000_000)
+    parser.add_argument("--trips-per-person", type=int, default=6)
+    parser.add_argument("--format", choices=("parquet", "csv"), default="parquet")
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    parser.add_argument("--keep", type=Path, help="directory to keep the generated files in")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work = args.keep or Path(tmp)
+        source = work / f"trips.{args.format}"
+        target = work / f"results.{args.format}"
+        if not source.exists():
+            t0 = time.perf_counter()
+            write_synthetic(source, args.trips, args.trips_per_person)
+            print(f"generated {source} ({source.stat().st_size:,} bytes) in {time.perf_counter() - t0:.1f}s")
+
+        cmd = [sys.executable, "-m", "residency", "batch", str(source), "-o", str(target),
+               "--tax-year", str(TAX_YEAR), "--chunk-rows", str(args.chunk_rows)]
+        env = dict(os.environ, PYTHONPATH=str(ROOT))
+        t0 = time.perf_counter()
+        subprocess.run(cmd, check=True, env=env)
+        elapsed = time.perf_counter() - t0
+        peak_kib = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+        print(f"{args.trips:,} trips in {elapsed:.1f}s: {args.trips / elapsed:,.0f} rows/s, "
+              f"peak RSS {peak_kib / 1024:,.0f} MiB (chunk rows {args.chunk_rows:,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Transferred bytes and time-to-interactive: CDN + in-browser Babel vs the prebuilt page.
+
+    PYTHONPATH=. python benchmarks/bench_frontend.py
+
+The "cdn" page is the calculator as it used to ship: React development
+builds, Babel standalone and the Tailwind Play CDN from unpkg and
+cdn.tailwindcss.com, with ``frontend/src/App.jsx`` compiled in the browser.
+The "prebuilt" page is ``residency/frontend/index.html`` with its hashed
+assets. Both pages are sent the ``streamlit:render`` message Streamlit would
+send, so that they render.
+
+If Playwright and Chromium are installed, both pages are loaded in a real
+browser. The report shows bytes received and the time until the app has
+rendered. Otherwise, or if Chromium cannot be launched, only byte counts
+are reported: the size of each page, plus the CDN assets if they can be
+downloaded from here.
+"""
+
+import gzip
+import json
+import shutil
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from residency.engine import client_rules
+
+ROOT = Path(__file__).resolve().parent.parent
+PREBUILT = ROOT / "residency" / "frontend"
+SRC = ROOT / "frontend" / "src"
+
+CDN_ASSETS = (
+    "https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap",
+    "https://cdn.tailwindcss.com",
+    "https://unpkg.com/react@18/umd/react.development.js",
+    "https://unpkg.com/react-dom@18/umd/react-dom.development.js",
+    "https://unpkg.com/@babel/standalone/babel.min.js",
+)
+
+READY = "document.getElementById('root').childElementCount > 0"
+
+
+def cdn_page() -> str:
+    links = "\n".join(
+        f'<link href="{url}" rel="stylesheet">' if "fonts" in url else f'<script src="{url}"></script>'
+        for url in CDN_ASSETS
+    )
+    bridge = (SRC / "streamlit.js").read_text(encoding="utf-8")
+    app = (SRC / "App.jsx").read_text(encoding="utf-8")
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8">'
+        f"{links}</head>"
+        '<body class="p-4 md:p-8 flex justify-center items-start">'
+        '<div id="root" class="w-full max-w-4xl"></div>'
+        f'<script>{bridge}</script><script type="text/babel">{app}</script></body></html>'
+    )
+
+
+def prebuilt_bytes() -> bytes:
+    """The shell followed by every asset it links, as the browser fetches them."""
+    files = [PREBUILT / "index.html", *sorted((PREBUILT / "assets").iterdir())]
+    return b"".join(f.read_bytes() for f in files)
+
+
+def download_size(url: str):
+    try:
+        with urllib.request.urlopen(url, timeout=10) as response:
+            return len(response.read())
+    except OSError:
+        return None
+
+
+def static_report(cdn_html: str) -> None:
+    for name, raw in (("cdn", cdn_html.encode()), ("prebuilt", prebuilt_bytes())):
+        print(f"{name:9s} page: {len(raw):>10,} bytes ({len(gzip.compress(raw)):,} gzip)")
+    total = 0
+    for url in CDN_ASSETS:
+        size = download_size(url)
+        print(f"  cdn asset {url}: {'unreachable' if size is None else f'{size:,} bytes'}")
+        total += size or 0
+    if total:
+        print(f"cdn assets total: {total:,} bytes (uncompressed)")
+
+
+def browser_report(cdn_html: str, rules: dict, sync_playwright, runs: int = 5) -> None:
+    render = "window.postMessage({type: 'streamlit:render', args: {rules: %s}}, '*')" % json.dumps(rules)
+    with sync_playwright() as pw, tempfile.TemporaryDirectory() as tmp:
+        site = Path(tmp) / "site"
+        shutil.copytree(PREBUILT, site)
+        (site / "cdn.html").write_text(cdn_html, encoding="utf-8")
+        browser = pw.chromium.launch()
+        for name, path in (("cdn", site / "cdn.html"), ("prebuilt", site / "index.html")):
+            timings, received = [], []
+            for _ in range(runs):
+                context = browser.new_context()
+                page = context.new_page()
+                sizes = []
+                page.on("response", lambda r, sizes=sizes: sizes.append(len(r.body())))
+                start = time.perf_counter()
+                page.goto(path.as_uri())
+                # The Babel-compiled app registers its listener late; keep posting until it renders.
+                page.wait_for_function(f"({render}, {READY})", polling=10, timeout=60_000)
+                timings.append(time.perf_counter() - start)
+                received.append(sum(sizes))
+                context.close()
+            timings.sort()
+            print(
+                f"{name:9s} median time-to-interactive {timings[len(timings) // 2] * 1000:8.1f} ms, "
+                f"{max(received):,} bytes received"
+            )
+        browser.close()
+
+
+def main() -> None:
+    cdn_html = cdn_page()
+    try:
+        from playwright.sync_api import Error as PlaywrightError, sync_playwright
+    except ImportError:
+        print("playwright not installed; reporting byte counts only")
+        static_report(cdn_html)
+        return
+    try:
+        browser_report(cdn_html, client_rules(), sync_playwright)
+    except PlaywrightError as exc:
+        print(f"chromium could not be launched ({str(exc).splitlines()[0]}); reporting byte counts only")
+        static_report(cdn_html)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Scaling of the parallel SPT evaluator from 1 to N worker processes.
+
+    PYTHONPATH=. python benchmarks/bench_parallel.py --people 1000000 --max-workers 8
+
+Each run is checked against the serial ``presence.evaluate_batch`` result.
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from generators import TAX_YEAR, travel_history
+from residency import parallel, presence
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--people", type=int, default=1_000_000)
+    parser.add_argument("--trips-per-person", type=int, default=6)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-people", type=int, default=parallel.DEFAULT_CHUNK_PEOPLE)
+    args = parser.parse_args()
+
+    person, start, end, _, visa, exempt_years = travel_history(args.people, args.trips_per_person)
+
+    t0 = time.perf_counter()
+    serial = presence.evaluate_batch(person, start, end, visa, exempt_years, TAX_YEAR)
+    base = time.perf_counter() - t0
+    print(f"{args.people:,} people, {len(person):,} trips on {os.cpu_count()} CPUs")
+    print(f"serial      {base:7.2f}s  {args.people / base:12,.0f} people/s")
+
+    workers = 1
+    while workers <= args.max_workers:
+        with parallel.ParallelEvaluator(workers, args.chunk_people) as evaluator:
+            evaluator.evaluate(person[:1], start[:1], end[:1], visa[:1], exempt_years[:1], TAX_YEAR)
+            t0 = time.perf_counter()
+            result = evaluator.evaluate(person, start, end, visa, exempt_years, TAX_YEAR)
+            elapsed = time.perf_counter() - t0
+        for a, b in zip(result, serial):
+            np.testing.assert_array_equal(a, b)
+        print(f"workers={workers:<3d} {elapsed:7.2f}s  {args.people / elapsed:12,.0f} people/s  "
+              f"speedup {base / elapsed:5.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Roster evaluation against scoring each tax year on its own.
+
+    PYTHONPATH=. python benchmarks/bench_roster.py --people 10000 --years 10
+
+The per-year loop calls :func:`residency.presence.evaluate_batch` once per
+tax year, so each calendar year's days are counted three times.
+:func:`residency.roster.evaluate` counts each calendar year once and
+classifies every person-year in one call. Both run on the same random
+history spread over the range, and their results are checked for
+agreement.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from generators import TAX_YEAR
+from residency import engine, presence, roster
+
+
+def history(n_people, n_years, trips_per_year, seed=0):
+    rng = np.random.default_rng(seed)
+    n_trips = n_people * n_years * trips_per_year
+    person = np.repeat(np.arange(n_people), n_years * trips_per_year)
+    first = np.datetime64(f"{TAX_YEAR - n_years - 1}-01-01")
+    start = first + rng.integers(0, (n_years + 2) * 365, n_trips).astype("timedelta64[D]")
+    end = start + rng.integers(0, 90, n_trips).astype("timedelta64[D]")
+    visa = rng.integers(0, len(engine.VISA_TYPES), n_people)
+    exempt_years = rng.integers(0, 7, n_people)
+    return person, start, end, visa, exempt_years
+
+
+def per_year(person, start, end, visa, exempt_years, first_year, last_year):
+    # The exempt-year counts come from the roster so that both score the same inputs.
+    return [
+        presence.evaluate_batch(person, start, end, visa, exempt_years[:, j], year).reason
+        for j, year in enumerate(range(first_year, last_year + 1))
+    ]
+
+
+def best_of(repeat, fn, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--people", type=int, default=10_000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--trips-per-year", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    first_year, last_year = TAX_YEAR - args.years + 1, TAX_YEAR
+    person, start, end, visa, exempt_years = history(args.people, args.years, args.trips_per_year)
+    print(f"{args.people:,} people x {args.years} years, {len(person):,} trips")
+
+    fast, result = best_of(args.repeat, roster.evaluate, person, start, end, visa, exempt_years, first_year, last_year)
+    slow, reasons = best_of(
+        args.repeat, per_year, person, start, end, visa, result.exempt_years, first_year, last_year
+    )
+    assert (np.stack(reasons, axis=1) == result.reason).all()
+    print(f"roster.evaluate  {fast:8.3f} s")
+    print(f"per-year loop    {slow:8.3f} s  ({slow / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""p50/p99 latency and requests per second of ``python -m residency serve``.
+
+    PYTHONPATH=. python benchmarks/bench_service.py --concurrency 64 --duration 10
+
+For each configuration the service is started in a child process. Micro-
+batching is measured on (the defaults) and off (``--max-batch 1``). The
+load generator then keeps ``--concurrency`` keep-alive connections busy
+with ``POST /evaluate`` for ``--duration`` seconds. A last run posts
+``/evaluate:batch`` bodies of ``--batch-people`` people from
+``--batch-concurrency`` connections and reports people per second. The
+load generator shares the machine with the server, so run it with spare
+cores to measure the server alone.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from generators import TAX_YEAR, calculator_inputs, travel_history
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def person_json(profile, trips) -> dict:
+    return {
+        "visaType": profile.visa_type,
+        "exemptYears": profile.exempt_years,
+        "taxYear": TAX_YEAR,
+        "trips": [[[str(t.start), str(t.end)] for t in bucket] for bucket in trips],
+    }
+
+
+def request_bytes(path: str, body: dict, port: int) -> bytes:
+    payload = json.dumps(body).encode()
+    head = (
+        f"POST {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n"
+    )
+    return head.encode() + payload
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = next(
+        int(line.split(b":", 1)[1])
+        for line in head.split(b"\r\n")
+        if line.lower().startswith(b"content-length:")
+    )
+    await reader.readexactly(length)
+    return status
+
+
+async def client(port: int, requests: list, deadline: float, latencies: list, offset: int) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    i = offset
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        writer.write(requests[i % len(requests)])
+        if await read_response(reader) != 200:
+            raise RuntimeError("request failed")
+        latencies.append(time.perf_counter() - start)
+        i += 1
+    writer.close()
+
+
+async def load(port: int, requests: list, concurrency: int, duration: float) -> list:
+    latencies = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *(client(port, requests, deadline, latencies, k * 997) for k in range(concurrency))
+    )
+    return latencies
+
+
+def wait_for_port(port: int, timeout: float = 20.0) -> None:
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"service did not start on port {port}")
+
+
+def run(
+    label: str, options: list, port: int, requests: list, args, concurrency: int, per_request: int = 1
+) -> None:
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "residency", "serve", "--port", str(port), *options], env=env
+    )
+    try:
+        wait_for_port(port)
+        asyncio.run(load(port, requests, concurrency, 1.0))  # warm up
+        latencies = np.array(asyncio.run(load(port, requests, concurrency, args.duration)))
+    finally:
+        server.terminate()
+        server.wait()
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    rate = len(latencies) / args.duration
+    extra = f"  {rate * per_request:>10,.0f} people/s" if per_request > 1 else ""
+    print(f"{label:24s} p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  {rate:>9,.0f} req/s{extra}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--trips-per-person", type=int, default=6)
+    parser.add_argument("--batch-people", type=int, default=1000)
+    parser.add_argument("--batch-concurrency", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    profiles, trips = calculator_inputs(travel_history(10_000, args.trips_per_person))
+    people = [person_json(p, t) for p, t in zip(profiles, trips)]
+    print(f"{args.concurrency} connections, {args.trips_per_person} trips per person, {os.cpu_count()} CPUs")
+
+    singles = [request_bytes("/evaluate", person, args.port) for person in people]
+    run("micro-batched", [], args.port, singles, args, args.concurrency)
+    run("unbatched (max-batch 1)", ["--max-batch", "1"], args.port, singles, args, args.concurrency)
+
+    n = args.batch_people
+    batches = [
+        request_bytes("/evaluate:batch", {"people": people[i:i + n]}, args.port)
+        for i in range(0, len(people) - n + 1, n)
+    ]
+    run(f"/evaluate:batch x{n}", [], args.port, batches, args, args.batch_concurrency, per_request=n)
+
+
+if __name__ == "__main__":
+    main()
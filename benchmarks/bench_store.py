@@ -0,0 +1,72 @@
+"""Latency of loading and scoring one person from a large ``TripStore``.
+
+    PYTHONPATH=. python benchmarks/bench_store.py --trips 2000000 --trips-per-person 10
+
+Fills a SQLite store in a temporary directory with synthetic histories
+spread over five years. Then, for ``--lookups`` random people, it times
+``year_trips`` (the page's view of a tax year) and ``evaluate`` (load plus
+score), and reports p50/p99.
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from generators import TAX_YEAR
+from residency import engine
+from residency.store import TripStore
+
+
+def fill(store: TripStore, trips: int, per_person: int, seed: int = 0) -> int:
+    rng = np.random.default_rng(seed)
+    people = trips // per_person
+    first = date(TAX_YEAR - 4, 1, 1).toordinal()
+    for p in range(people):
+        start = first + rng.integers(0, 5 * 365, per_person)
+        end = start + rng.integers(0, 60, per_person)
+        key = f"person-{p}"
+        store.set_profile(key, engine.Profile(engine.VISA_TYPES[p % len(engine.VISA_TYPES)], p % 7))
+        store.add_trips(
+            key,
+            [engine.Trip(date.fromordinal(s), date.fromordinal(e)) for s, e in zip(start.tolist(), end.tolist())],
+        )
+    return people
+
+
+def timed(fn, keys) -> np.ndarray:
+    out = []
+    for key in keys:
+        start = time.perf_counter()
+        fn(key)
+        out.append(time.perf_counter() - start)
+    return np.array(out) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trips", type=int, default=2_000_000)
+    parser.add_argument("--trips-per-person", type=int, default=10)
+    parser.add_argument("--lookups", type=int, default=5_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, TripStore(str(Path(tmp) / "trips.db")) as store:
+        start = time.perf_counter()
+        people = fill(store, args.trips, args.trips_per_person)
+        print(f"stored {args.trips:,} trips for {people:,} people in {time.perf_counter() - start:.1f}s")
+
+        keys = [f"person-{p}" for p in np.random.default_rng(1).integers(0, people, args.lookups)]
+        for label, fn in (
+            ("year_trips", lambda key: store.year_trips(key, TAX_YEAR)),
+            ("evaluate", lambda key: store.evaluate(key, TAX_YEAR)),
+        ):
+            ms = timed(fn, keys)
+            p50, p99 = np.percentile(ms, [50, 99])
+            print(f"{label:12s} p50 {p50:6.3f} ms  p99 {p99:6.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Throughput of the vectorized SPT evaluator against the per-person engine.
+
+    PYTHONPATH=. python benchmarks/bench_vectorized.py --people 200000 --trips-per-person 6
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from generators import TAX_YEAR, calculator_inputs, travel_history
+from residency import engine, presence
+
+
+def naive(columns):
+    """One :func:`residency.engine.evaluate` call per person, returning RA/NRA codes."""
+    profiles, trips = calculator_inputs(columns)
+    return [engine.evaluate(p, t, TAX_YEAR).code for p, t in zip(profiles, trips)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--people", type=int, default=200_000)
+    parser.add_argument("--trips-per-person", type=int, default=6)
+    args = parser.parse_args()
+
+    columns = travel_history(args.people, args.trips_per_person)
+    person, start, end, _, visa, exempt_years = columns
+
+    t0 = time.perf_counter()
+    batch = presence.evaluate_batch(person, start, end, visa, exempt_years, TAX_YEAR)
+    t_vec = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    codes = naive(columns)
+    t_naive = time.perf_counter() - t0
+
+    expected = np.array([c == engine.RESIDENT for c in codes])
+    assert (batch.resident == expected).all(), "vectorized result differs from the engine"
+
+    print(f"{args.people} people, {len(person)} trips")
+    print(f"vectorized: {t_vec:8.3f}s  {args.people / t_vec:12,.0f} people/s")
+    print(f"naive:      {t_naive:8.3f}s  {args.people / t_naive:12,.0f} people/s")
+    print(f"speedup:    {t_naive / t_vec:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Fixtures for the pytest-benchmark suite.
+
+    pytest benchmarks                          # 1, 1k and 100k trips
+    pytest benchmarks --huge                   # and 10M trips
+    pytest benchmarks --benchmark-autosave     # keep results in .benchmarks/
+    pytest benchmarks --benchmark-compare      # compare with the last saved run
+
+The throughput benchmarks record ``trips_per_s`` in ``extra_info``.
+"""
+
+import os
+
+import pytest
+
+from generators import HUGE, SIZES, calculator_inputs, travel_history, trips_for_size
+from residency import engine, parallel
+
+def pytest_addoption(parser):
+    parser.addoption("--huge", action="store_true", help="also run the 10M-trip benchmarks")
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=lambda n: f"{n}-trips")
+def history(request):
+    """``(n_trips, columns)`` with the columns of :func:`generators.travel_history`."""
+    n_trips = request.param
+    if n_trips >= HUGE and not request.config.getoption("--huge"):
+        pytest.skip("10M-trip benchmarks run with --huge")
+    return n_trips, trips_for_size(n_trips)
+
+
+@pytest.fixture(scope="session", params=SIZES[:2], ids=lambda n: f"{n}-trips")
+def one_person(request):
+    """One non-exempt person with ``n`` trips: ``(profile, YearTrips)``."""
+    columns = travel_history(1, request.param, seed=1)
+    _, trips = calculator_inputs(columns)
+    return engine.Profile("H1B", 0), trips[0]
+
+
+@pytest.fixture(scope="session")
+def evaluator():
+    with parallel.ParallelEvaluator(os.cpu_count()) as pool:
+        yield pool
+
+
+@pytest.fixture
+def throughput(benchmark):
+    """``throughput(n_trips, fn, *args)``: benchmark ``fn`` and record trips per second.
+
+    Calibration would repeat a 10M-trip call many times, so the largest
+    sizes run a fixed three rounds.
+    """
+
+    def measure(n_trips, fn, *args, **kwargs):
+        if n_trips >= HUGE:
+            result = benchmark.pedantic(fn, args, kwargs, rounds=3, iterations=1)
+        else:
+            result = benchmark(fn, *args, **kwargs)
+        if benchmark.stats is not None:
+            benchmark.extra_info["trips_per_s"] = n_trips / benchmark.stats.stats.mean
+        return result
+
+    return measure
@@ -0,0 +1,49 @@
+"""Synthetic travel histories for the benchmarks."""
+
+import numpy as np
+
+from residency import engine
+
+TAX_YEAR = 2025
+# Trip counts of the standard benchmark histories; the last is opt-in.
+SIZES = (1, 1_000, 100_000, 10_000_000)
+HUGE = SIZES[-1]
+
+
+def travel_history(n_people, trips_per_person, seed=0, max_trip_days=90):
+    """Random trip and profile columns for ``n_people`` people.
+
+    Returns ``(person, start, end, year_offset, visa, exempt_years)`` in the
+    layout of :func:`residency.presence.evaluate_batch`, plus the year box
+    each trip is entered in. Trips are sorted by person, and each one starts
+    in the CY-``year_offset`` year before ``TAX_YEAR``.
+    """
+    rng = np.random.default_rng(seed)
+    n_trips = n_people * trips_per_person
+    person = np.repeat(np.arange(n_people), trips_per_person)
+    year_offset = rng.integers(0, 3, n_trips)
+    start = (
+        np.datetime64(f"{TAX_YEAR}-01-01")
+        - (year_offset * 365).astype("timedelta64[D]")
+        + rng.integers(0, 330, n_trips).astype("timedelta64[D]")
+    )
+    end = start + rng.integers(0, max_trip_days, n_trips).astype("timedelta64[D]")
+    visa = rng.integers(0, len(engine.VISA_TYPES), n_people)
+    exempt_years = rng.integers(0, 7, n_people)
+    return person, start, end, year_offset, visa, exempt_years
+
+
+def trips_for_size(n_trips, trips_per_person=5, seed=0):
+    """A history with ``n_trips`` trips in total (exactly, for the standard sizes)."""
+    per_person = min(trips_per_person, n_trips)
+    return travel_history(max(n_trips // per_person, 1), per_person, seed)
+
+
+def calculator_inputs(columns):
+    """The same history as Profile and YearTrips objects for :mod:`residency.engine`."""
+    person, start, end, year_offset, visa, exempt_years = columns
+    profiles = [engine.Profile(engine.VISA_TYPES[v], int(e)) for v, e in zip(visa, exempt_years)]
+    buckets = [([], [], []) for _ in profiles]
+    for p, s, e, k in zip(person.tolist(), start.tolist(), end.tolist(), year_offset.tolist()):
+        buckets[p][k].append(engine.Trip(s, e))
+    return profiles, [engine.YearTrips(*b) for b in buckets]
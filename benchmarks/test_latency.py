@@ -0,0 +1,37 @@
+"""Latency of one evaluation, as the page or a single API call makes it."""
+
+from datetime import date
+
+import numpy as np
+
+from generators import TAX_YEAR
+from residency import engine, planner, presence, solver, vectorized
+
+
+def test_engine_evaluate(benchmark, one_person):
+    benchmark(engine.evaluate, *one_person, TAX_YEAR)
+
+
+def test_presence_evaluate(benchmark, one_person):
+    profile, trips = one_person
+    benchmark(presence.evaluate, profile, [t for bucket in trips for t in bucket], TAX_YEAR)
+
+
+def test_batch_single(benchmark, one_person):
+    """Fixed per-call overhead of the columnar path for a batch of one."""
+    profile, trips = one_person
+    trips = [t for bucket in trips for t in bucket]
+    start = np.array([t.start for t in trips], dtype="datetime64[D]")
+    end = np.array([t.end for t in trips], dtype="datetime64[D]")
+    person = np.zeros(len(start), dtype=np.int64)
+    visa = np.array([vectorized.VISA_CODES[profile.visa_type]])
+    exempt_years = np.array([profile.exempt_years])
+    benchmark(presence.evaluate_batch, person, start, end, visa, exempt_years, TAX_YEAR)
+
+
+def test_start_date(benchmark, one_person):
+    benchmark(solver.start_date, *one_person, TAX_YEAR, as_of=date(TAX_YEAR, 6, 30))
+
+
+def test_plan(benchmark, one_person):
+    benchmark(planner.plan, *one_person, TAX_YEAR, arrive=date(TAX_YEAR, 7, 1))
@@ -0,0 +1,24 @@
+"""Batch throughput over the synthetic histories in :mod:`generators`."""
+
+import pytest
+
+from generators import HUGE, TAX_YEAR, calculator_inputs
+from residency import engine, presence
+
+
+def test_engine_batch(throughput, history):
+    n_trips, columns = history
+    if n_trips >= HUGE:
+        pytest.skip("the per-person Python path is not run at 10M trips")
+    profiles, trips = calculator_inputs(columns)
+    throughput(n_trips, engine.evaluate_batch, profiles, trips, TAX_YEAR)
+
+
+def test_presence(throughput, history):
+    n_trips, (person, start, end, _, visa, exempt_years) = history
+    throughput(n_trips, presence.evaluate_batch, person, start, end, visa, exempt_years, TAX_YEAR)
+
+
+def test_parallel(throughput, history, evaluator):
+    n_trips, (person, start, end, _, visa, exempt_years) = history
+    throughput(n_trips, evaluator.evaluate, person, start, end, visa, exempt_years, TAX_YEAR)
@@ -0,0 +1,90 @@
+"""Build the calculator page into static, content-hashed assets.
+
+    pip install -r frontend/requirements.txt
+    python frontend/build.py
+
+Steps:
+
+1. ``src/App.jsx`` is compiled to plain JavaScript with esbuild, so the
+   browser no longer downloads and runs Babel. ``src/streamlit.js`` is
+   prepended to it.
+2. Tailwind scans ``src/`` and emits minified CSS for only the classes used.
+3. The vendored React 18 production builds are concatenated into one file.
+
+Each asset is written to ``residency/frontend/assets/`` under a name that
+includes a hash of its content, and ``src/index.html`` becomes the small
+``residency/frontend/index.html`` shell that links them. Streamlit serves
+this directory as a custom component. Non-HTML files are sent with
+``Cache-Control: public``, and the hashed names mean browsers can keep
+them until a rebuild changes them. Commit the rebuilt directory together
+with any change under ``src/``.
+"""
+
+import hashlib
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import esbuild_py
+
+ROOT = Path(__file__).resolve().parent
+SRC = ROOT / "src"
+VENDOR = ROOT / "vendor"
+OUTPUT = ROOT.parent / "residency" / "frontend"
+
+VENDOR_SCRIPTS = ("react.production.min.js", "react-dom.production.min.js")
+
+
+def compile_jsx(path: Path) -> str:
+    return esbuild_py.transform(path.read_text(encoding="utf-8"))
+
+
+def build_css() -> str:
+    result = subprocess.run(
+        ["tailwindcss", "--input", str(SRC / "styles.css"), "--minify", "--silent"],
+        cwd=SRC,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout
+
+
+def write_asset(assets: Path, stem: str, suffix: str, content: str) -> str:
+    """Write ``content`` as ``<stem>.<hash><suffix>`` and return its relative URL."""
+    data = content.encode("utf-8")
+    name = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{suffix}"
+    (assets / name).write_bytes(data)
+    return f"assets/{name}"
+
+
+def build() -> dict:
+    assets = OUTPUT / "assets"
+    shutil.rmtree(assets, ignore_errors=True)
+    assets.mkdir(parents=True)
+
+    vendor = "\n".join((VENDOR / name).read_text(encoding="utf-8") for name in VENDOR_SCRIPTS)
+    app = (SRC / "streamlit.js").read_text(encoding="utf-8") + "\n" + compile_jsx(SRC / "App.jsx")
+    urls = {
+        "vendor": write_asset(assets, "vendor", ".js", vendor),
+        "app": write_asset(assets, "app", ".js", app),
+        "styles": write_asset(assets, "styles", ".css", build_css()),
+    }
+
+    html = (SRC / "index.html").read_text(encoding="utf-8")
+    for key, url in urls.items():
+        html = html.replace("{{ %s }}" % key, url)
+    (OUTPUT / "index.html").write_text(html, encoding="utf-8")
+    return urls
+
+
+def main() -> int:
+    for url in build().values():
+        size = (OUTPUT / url).stat().st_size
+        print(f"wrote residency/frontend/{url} ({size:,} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
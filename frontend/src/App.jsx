@@ -0,0 +1,697 @@
+const { useState, useReducer, useMemo, useCallback, useEffect, useLayoutEffect, useRef, memo } = React;
+
+// --- Rules (sent from residency.engine as component args) ---
+let RULES = null;
+
+// --- Icons ---
+const PlusIcon = () => <svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2" strokeLinecap="round" strokeLinejoin="round"><line x1="12" y1="5" x2="12" y2="19"/><line x1="5" y1="12" x2="19" y2="12"/></svg>;
+const TrashIcon = () => <svg xmlns="http://www.w3.org/2000/svg" width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2" strokeLinecap="round" strokeLinejoin="round"><polyline points="3 6 5 6 21 6"/><path d="M19 6v14a2 2 0 0 1-2 2H7a2 2 0 0 1-2-2V6m3 0V4a2 2 0 0 1 2-2h4a2 2 0 0 1 2 2v2"/></svg>;
+const CalendarIcon = () => <svg xmlns="http://www.w3.org/2000/svg" width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2" strokeLinecap="round" strokeLinejoin="round"><rect width="18" height="18" x="3" y="4" rx="2" ry="2"/><line x1="16" y1="2" x2="16" y2="6"/><line x1="8" y1="2" x2="8" y2="6"/><line x1="3" y1="10" x2="21" y2="10"/></svg>;
+const AlertIcon = () => <svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2" strokeLinecap="round" strokeLinejoin="round" className="text-amber-500"><circle cx="12" cy="12" r="10"/><line x1="12" y1="8" x2="12" y2="12"/><line x1="12" y1="16" x2="12.01" y2="16"/></svg>;
+const CheckIcon = () => <svg xmlns="http://www.w3.org/2000/svg" width="32" height="32" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="3" strokeLinecap="round" strokeLinejoin="round" className="text-green-600"><polyline points="20 6 9 17 4 12"/></svg>;
+const XCircleIcon = () => <svg xmlns="http://www.w3.org/2000/svg" width="32" height="32" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2" strokeLinecap="round" strokeLinejoin="round" className="text-blue-600"><circle cx="12" cy="12" r="10"/><line x1="15" y1="9" x2="9" y2="15"/><line x1="9" y1="9" x2="15" y2="15"/></svg>;
+
+// --- Instrumentation: performance.measure per stage, sent to Python (residency.metrics) ---
+const MAX_PENDING_TIMINGS = 50;
+const pendingTimings = [];
+let reportSeq = 0;
+
+const measureSince = (stage, startMark) => {
+    const { duration } = performance.measure(stage, startMark);
+    pendingTimings.push([stage, duration]);
+    if (pendingTimings.length > MAX_PENDING_TIMINGS) pendingTimings.shift();
+    performance.clearMarks(startMark);
+    performance.clearMeasures(stage);
+};
+
+// --- Helper: Date Difference ---
+const getDaysDiff = (start, end) => {
+    if (!start || !end) return 0;
+    const s = new Date(start);
+    const e = new Date(end);
+    if (isNaN(s) || isNaN(e)) return 0;
+    // Difference in time / milliseconds per day
+    const diffTime = Math.abs(e - s);
+    const diffDays = Math.ceil(diffTime / (1000 * 60 * 60 * 24)); 
+    return diffDays + 1; // Include both start and end dates
+};
+
+// --- Trip State: each trip caches its own length for display ---
+const emptyYear = { trips: [] };
+let nextTripId = 1;
+
+// A year's state from saved [start, end] pairs
+const loadYear = (pairs) => ({
+    trips: pairs.map(([start, end]) => ({ id: nextTripId++, start, end, days: getDaysDiff(start, end) }))
+});
+
+const yearReducer = (state, action) => {
+    switch (action.type) {
+        case 'load':
+            return loadYear(action.trips);
+        case 'add':
+            return { ...state, trips: [...state.trips, { id: nextTripId++, start: '', end: '', days: 0 }] };
+        case 'update':
+            return {
+                trips: state.trips.map(t => {
+                    if (t.id !== action.id) return t;
+                    const next = { ...t, [action.field]: action.value };
+                    next.days = getDaysDiff(next.start, next.end);
+                    return next;
+                })
+            };
+        case 'remove':
+            return { trips: state.trips.filter(t => t.id !== action.id) };
+        default:
+            return state;
+    }
+};
+
+// --- Presence: days counted by date (mirrors residency.presence) ---
+// Each day counts once, in the calendar year it falls in, whichever year box
+// its trip was entered under and however many trips cover it.
+const DAY_MS = 1000 * 60 * 60 * 24;
+const dayNumber = (iso) => {
+    const t = Date.parse(iso);
+    return isNaN(t) ? null : Math.floor(t / DAY_MS);
+};
+const firstDay = (year) => Date.UTC(year, 0, 1) / DAY_MS;
+
+// Day counts for the tax year, CY-1 and CY-2, and the tax year's days present (0/1 per day)
+const countPresence = (taxYear, years) => {
+    const year = Number(taxYear);
+    if (!Number.isInteger(year)) return { days: [0, 0, 0], present: new Uint8Array(0) };
+    const bounds = [year - 2, year - 1, year, year + 1].map(firstDay);
+    const present = new Uint8Array(bounds[3] - bounds[0]);
+    for (const { trips } of years) {
+        for (const trip of trips) {
+            const s = dayNumber(trip.start);
+            const e = dayNumber(trip.end);
+            if (s === null || e === null) continue;
+            const lo = Math.max(Math.min(s, e), bounds[0]);
+            const hi = Math.min(Math.max(s, e), bounds[3] - 1);
+            if (lo <= hi) present.fill(1, lo - bounds[0], hi - bounds[0] + 1);
+        }
+    }
+    const count = (k) => present.subarray(bounds[k] - bounds[0], bounds[k + 1] - bounds[0]).reduce((a, b) => a + b, 0);
+    return { days: [count(2), count(1), count(0)], present: present.subarray(bounds[2] - bounds[0]) };
+};
+
+// --- Helper: SPT evaluation from the three year totals ---
+const evaluateResidency = (visaType, exemptYears, daysCY, daysCY1, daysCY2) => {
+    // 1. Check Exempt Status
+    const exemptLimit = RULES.exemptYearLimits[visaType];
+    if (exemptLimit !== undefined && exemptYears < exemptLimit) {
+        return {
+            status: RULES.status.NRA,
+            code: 'NRA',
+            form: RULES.forms.NRA,
+            reason: RULES.exemptReasons[visaType],
+            isExempt: true
+        };
+    }
+
+    // 2. Apply SPT Logic
+    if (daysCY < RULES.minCurrentYearDays) {
+        return {
+            status: RULES.status.NRA,
+            code: 'NRA',
+            form: RULES.forms.NRA,
+            reason: RULES.reasons.underMinimum,
+            score: daysCY,
+            isExempt: false
+        };
+    }
+
+    const [, div1, div2] = RULES.yearDivisors;
+    const weightedScore = daysCY + (daysCY1 / div1) + (daysCY2 / div2);
+    const passed = weightedScore >= RULES.threshold;
+    const code = passed ? 'RA' : 'NRA';
+
+    return {
+        status: RULES.status[code],
+        code,
+        form: RULES.forms[code],
+        reason: passed ? RULES.reasons.passed : RULES.reasons.failed,
+        score: weightedScore.toFixed(1),
+        details: { daysCY, daysCY1, daysCY2 },
+        isExempt: false,
+        passed
+    };
+};
+
+// --- Helper Component: Trip Row (re-renders only when its own trip changes) ---
+const TripRow = memo(({ trip, dispatch }) => (
+    <div className="flex items-end gap-3 animate-fade-in">
+        <div className="flex-1">
+            <label className="text-[10px] uppercase font-bold text-gray-400 mb-1 block">Start Date</label>
+            <input 
+                type="date" 
+                className="w-full text-sm p-2 bg-gray-50 border border-gray-200 rounded-sm focus:ring-2 focus:ring-indigo-500 outline-hidden"
+                value={trip.start}
+                onChange={(e) => dispatch({ type: 'update', id: trip.id, field: 'start', value: e.target.value })}
+            />
+        </div>
+        <div className="flex-1">
+            <label className="text-[10px] uppercase font-bold text-gray-400 mb-1 block">End Date</label>
+            <input 
+                type="date" 
+                className="w-full text-sm p-2 bg-gray-50 border border-gray-200 rounded-sm focus:ring-2 focus:ring-indigo-500 outline-hidden"
+                value={trip.end}
+                onChange={(e) => dispatch({ type: 'update', id: trip.id, field: 'end', value: e.target.value })}
+            />
+        </div>
+        <div className="w-16 text-center pb-2">
+            <span className="text-xs font-semibold text-gray-600">{trip.days > 0 ? trip.days : '-'} d</span>
+        </div>
+        <button 
+            onClick={() => dispatch({ type: 'remove', id: trip.id })}
+            className="p-2.5 mb-[1px] text-gray-400 hover:text-red-500 hover:bg-red-50 rounded-sm transition-colors"
+        >
+            <TrashIcon />
+        </button>
+    </div>
+));
+
+// --- Helper Component: Year Trip Manager ---
+const YearTripManager = memo(({ label, yearLabel, year, days, dispatch, weight }) => {
+    const addTrip = useCallback(() => dispatch({ type: 'add' }), [dispatch]);
+
+    return (
+        <div className="bg-white rounded-xl border border-gray-200 overflow-hidden shadow-xs hover:shadow-md transition-shadow duration-300">
+            <div className="bg-gray-50 px-5 py-3 border-b border-gray-100 flex justify-between items-center">
+                <div>
+                    <h3 className="text-sm font-bold text-gray-700 uppercase tracking-wide">{label}</h3>
+                    <p className="text-xs text-gray-500">{yearLabel}</p>
+                </div>
+                <div className="flex items-center gap-2">
+                    <span className="text-xs font-medium px-2 py-1 bg-gray-200 rounded-sm text-gray-600">Weight: {weight}</span>
+                    <span className="text-sm font-bold text-indigo-600 bg-indigo-50 px-3 py-1 rounded-full border border-indigo-100">
+                        {days} Days
+                    </span>
+                </div>
+            </div>
+            
+            <div className="p-4 space-y-3">
+                {year.trips.length === 0 ? (
+                    <div className="text-center py-6 text-gray-400 text-sm border-2 border-dashed border-gray-100 rounded-lg">
+                        No trips added for this year.
+                    </div>
+                ) : (
+                    year.trips.map(trip => <TripRow key={trip.id} trip={trip} dispatch={dispatch} />)
+                )}
+                
+                <button 
+                    onClick={addTrip}
+                    className="w-full py-2 flex items-center justify-center gap-2 text-sm font-medium text-indigo-600 bg-white border border-indigo-100 rounded-lg hover:bg-indigo-50 transition-colors"
+                >
+                    <PlusIcon /> Add Trip
+                </button>
+            </div>
+        </div>
+    );
+});
+
+// --- Helper: Date Display ---
+const formatDate = (iso) =>
+    new Date(`${iso}T00:00:00`).toLocaleDateString(undefined, { year: 'numeric', month: 'short', day: 'numeric' });
+
+// --- Helper: What-if Planner (mirrors residency.planner) ---
+const weightedScore = (daysCY, daysCY1, daysCY2) => {
+    const [, div1, div2] = RULES.yearDivisors;
+    return daysCY + (daysCY1 / div1) + (daysCY2 / div2);
+};
+
+// Smallest current-year day count that makes a Resident Alien.
+const requiredCyDays = (daysCY1, daysCY2) => {
+    const [, div1, div2] = RULES.yearDivisors;
+    const passes = (cy) => weightedScore(cy, daysCY1, daysCY2) >= RULES.threshold;
+    let need = Math.max(Math.ceil(RULES.threshold - (daysCY1 / div1 + daysCY2 / div2)), 0);
+    if (need > 0 && passes(need - 1)) need -= 1;
+    if (!passes(need)) need += 1;
+    return Math.max(need, RULES.minCurrentYearDays);
+};
+
+const remainingDays = (daysCY, daysCY1, daysCY2) =>
+    Math.max(requiredCyDays(daysCY1, daysCY2) - 1 - daysCY, 0);
+
+const isoDate = (day) => new Date(day * DAY_MS).toISOString().slice(0, 10);
+
+// Index into present of the last day of a stay from index `from` that adds at most
+// `budget` new days; -1 if not even the arrival day fits (residency.planner.latest_safe_departure)
+const lastSafeIndex = (present, from, budget) => {
+    let added = 0;
+    for (let i = from; i < present.length; i++) {
+        added += 1 - present[i];
+        if (added > budget) return i - 1 < from ? -1 : i - 1;
+    }
+    return present.length - 1;
+};
+
+// Days from index `lo` to `hi` that are not already present
+const newDays = (present, lo, hi) => {
+    let added = 0;
+    for (let i = Math.max(lo, 0); i <= Math.min(hi, present.length - 1); i++) added += 1 - present[i];
+    return added;
+};
+
+// --- Helper Component: Planner Panel (from the year totals and the tax year's days present) ---
+// A planned stay runs from arrival to departure; only its days in the tax year not already present count.
+const PlannerPanel = memo(({ taxYear, days, present, passed }) => {
+    const [arrival, setArrival] = useState('');
+    const [departure, setDeparture] = useState('');
+
+    const yearStart = `${taxYear}-01-01`;
+    const yearEnd = `${taxYear}-12-31`;
+    const inYear = (iso) => iso >= yearStart && iso <= yearEnd;
+    const budget = remainingDays(...days);
+    const origin = dayNumber(yearStart);
+    const last = arrival && inYear(arrival) && !passed ? lastSafeIndex(present, dayNumber(arrival) - origin, budget) : -1;
+    const latestDeparture = last >= 0 ? isoDate(origin + last) : null;
+    // New days of the planned stay inside the tax year
+    const [lo, hi] = [dayNumber(arrival), dayNumber(departure)].sort((a, b) => a - b);
+    const stayDays = arrival && departure && lo !== null && hi !== null && !passed
+        ? newDays(present, lo - origin, hi - origin)
+        : 0;
+    const safe = stayDays <= budget;
+
+    return (
+        <div className="bg-white rounded-2xl shadow-xs border border-gray-100 p-6 mt-6 space-y-4">
+            <div className="flex justify-between items-end">
+                <h4 className="text-xs font-bold text-gray-400 uppercase tracking-wider">Days Left as Non-Resident</h4>
+                <span className="text-2xl font-bold text-gray-800">{budget}</span>
+            </div>
+            <div className="grid grid-cols-2 gap-3">
+                <div>
+                    <label className="text-[10px] uppercase font-bold text-gray-400 mb-1 block">Planned Arrival</label>
+                    <input 
+                        type="date" 
+                        min={yearStart}
+                        max={yearEnd}
+                        className="w-full text-sm p-2 bg-gray-50 border border-gray-200 rounded-sm focus:ring-2 focus:ring-indigo-500 outline-hidden"
+                        value={arrival}
+                        onChange={(e) => setArrival(e.target.value)}
+                    />
+                </div>
+                <div>
+                    <label className="text-[10px] uppercase font-bold text-gray-400 mb-1 block">Planned Departure</label>
+                    <input 
+                        type="date" 
+                        className="w-full text-sm p-2 bg-gray-50 border border-gray-200 rounded-sm focus:ring-2 focus:ring-indigo-500 outline-hidden"
+                        value={departure}
+                        onChange={(e) => setDeparture(e.target.value)}
+                    />
+                </div>
+            </div>
+            {arrival && !inYear(arrival) && (
+                <p className="text-sm text-gray-700">Choose an arrival in {taxYear} to plan this tax year.</p>
+            )}
+            {arrival && inYear(arrival) && (
+                <p className="text-sm text-gray-700">
+                    {passed
+                        ? <>You already meet the test for {taxYear}.</>
+                        : !latestDeparture
+                        ? 'No days left: any further stay makes you a Resident Alien.'
+                        : latestDeparture === yearEnd
+                            ? <>Any departure keeps NRA status for {taxYear}: days after Dec 31 count toward {Number(taxYear) + 1}.</>
+                            : <>Latest departure that keeps NRA status: <strong>{formatDate(latestDeparture)}</strong></>}
+                </p>
+            )}
+            {stayDays > 0 && (
+                <p className={`text-sm font-medium ${safe ? 'text-emerald-600' : 'text-red-500'}`}>
+                    {stayDays} new days in {taxYear} {safe ? 'keep you a Non-Resident Alien.' : 'would make you a Resident Alien.'}
+                </p>
+            )}
+        </div>
+    );
+});
+
+// --- Roster: every person x tax year, rendering only the rows in view ---
+const ROW_HEIGHT = 36;
+const ROSTER_HEIGHT = 560;
+const OVERSCAN_ROWS = 8;
+// Indexed by residency.vectorized reason code: exempt, under 31 days, passed (RA), failed
+const CELL_LABELS = ['Exempt', 'NRA', 'RA', 'NRA'];
+const CELL_STYLES = [
+    'bg-gray-100 text-gray-500',
+    'bg-emerald-50 text-emerald-600',
+    'bg-indigo-100 text-indigo-800',
+    'bg-emerald-50 text-emerald-700'
+];
+
+// `scores` is the whole person-major array, shared by every row so that memo can skip unchanged rows.
+const RosterRow = memo(({ id, codes, scores, offset, years, top }) => (
+    <div className="absolute left-0 right-0 flex items-center border-b border-gray-50" style={{ top, height: ROW_HEIGHT }}>
+        <div className="w-40 shrink-0 px-3 truncate text-sm font-medium text-gray-700" title={id}>{id}</div>
+        {years.map((year, j) => {
+            const code = codes.charCodeAt(j) - 48;
+            const score = scores[offset + j];
+            return (
+                <div key={year} className="flex-1 min-w-0 px-0.5">
+                    <span
+                        title={score < 0 ? `${year}: exempt individual` : `${year}: score ${(score / 10).toFixed(1)}`}
+                        className={`block text-center text-xs font-bold rounded-sm py-1 ${CELL_STYLES[code]}`}
+                    >
+                        {CELL_LABELS[code]}
+                    </span>
+                </div>
+            );
+        })}
+    </div>
+));
+
+const Roster = ({ data }) => {
+    const { years, ids, codes, scores } = data;
+    const nYears = years.length;
+    const [query, setQuery] = useState('');
+    const [scrollTop, setScrollTop] = useState(0);
+    const scroller = useRef(null);
+
+    // Indices of the people matching the filter
+    const rows = useMemo(() => {
+        const q = query.trim().toLowerCase();
+        const out = [];
+        for (let i = 0; i < ids.length; i++) {
+            if (!q || ids[i].toLowerCase().includes(q)) out.push(i);
+        }
+        return out;
+    }, [ids, query]);
+
+    const residents = useMemo(() => {
+        const counts = new Array(nYears).fill(0);
+        for (let k = 0; k < codes.length; k++) {
+            if (codes.charCodeAt(k) === 50) counts[k % nYears]++;
+        }
+        return counts;
+    }, [codes, nYears]);
+
+    useEffect(() => {
+        if (scroller.current) scroller.current.scrollTop = 0;
+        setScrollTop(0);
+    }, [query, data]);
+
+    const first = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN_ROWS);
+    const last = Math.min(rows.length, Math.ceil((scrollTop + ROSTER_HEIGHT) / ROW_HEIGHT) + OVERSCAN_ROWS);
+    const visible = [];
+    for (let r = first; r < last; r++) {
+        const i = rows[r];
+        visible.push(
+            <RosterRow
+                key={i}
+                id={ids[i]}
+                codes={codes.substr(i * nYears, nYears)}
+                scores={scores}
+                offset={i * nYears}
+                years={years}
+                top={r * ROW_HEIGHT}
+            />
+        );
+    }
+
+    return (
+        <div className="bg-white p-6 rounded-2xl shadow-xs border border-gray-100 font-sans text-gray-800">
+            <div className="flex items-center justify-between gap-4 mb-4">
+                <h2 className="text-lg font-bold">Roster: {ids.length.toLocaleString()} people, {years[0]}&ndash;{years[nYears - 1]}</h2>
+                <input
+                    type="search"
+                    placeholder="Filter by person"
+                    value={query}
+                    onChange={(e) => setQuery(e.target.value)}
+                    className="p-2 bg-gray-50 border border-gray-200 rounded-lg text-sm focus:ring-2 focus:ring-blue-500 outline-hidden transition"
+                />
+            </div>
+            <div className="flex items-end border-b border-gray-200 pb-2 text-xs font-bold text-gray-500 uppercase">
+                <div className="w-40 shrink-0 px-3">{rows.length.toLocaleString()} shown</div>
+                {years.map((year, j) => (
+                    <div key={year} className="flex-1 min-w-0 px-0.5 text-center">
+                        {year}
+                        <div className="font-medium normal-case text-indigo-600" title="Resident Aliens">{residents[j]} RA</div>
+                    </div>
+                ))}
+            </div>
+            <div
+                ref={scroller}
+                className="overflow-y-auto"
+                style={{ height: ROSTER_HEIGHT }}
+                onScroll={(e) => setScrollTop(e.currentTarget.scrollTop)}
+            >
+                <div className="relative" style={{ height: rows.length * ROW_HEIGHT }}>{visible}</div>
+            </div>
+        </div>
+    );
+};
+
+// Delay before the trips are sent to Python for the start-date solver.
+const SYNC_DELAY_MS = 300;
+
+// --- Main Application ---
+const App = ({ startDate, history }) => {
+    performance.mark('render-start');
+    const [visaType, setVisaType] = useState('H1B');
+    const [exemptYears, setExemptYears] = useState(0);
+    const [taxYear, setTaxYear] = useState(new Date().getFullYear());
+    
+    // Trips State
+    const [yearCY, dispatchCY] = useReducer(yearReducer, emptyYear);
+    const [yearCY1, dispatchCY1] = useReducer(yearReducer, emptyYear);
+    const [yearCY2, dispatchCY2] = useReducer(yearReducer, emptyYear);
+
+    // Saved trips (residency.store): the tax year whose view is loaded, null if none
+    const [windowYear, setWindowYear] = useState(null);
+    useEffect(() => {
+        if (!history || history.taxYear === windowYear) return;
+        if (windowYear === null) {
+            setVisaType(history.visaType);
+            setExemptYears(history.exemptYears);
+            setTaxYear(history.taxYear);
+        }
+        [dispatchCY, dispatchCY1, dispatchCY2].forEach((dispatch, i) => dispatch({ type: 'load', trips: history.trips[i] }));
+        setWindowYear(history.taxYear);
+    }, [history]);
+
+    // Days present in each year of the window, by date across all three year boxes
+    const presence = useMemo(
+        () => countPresence(taxYear, [yearCY, yearCY1, yearCY2]),
+        [taxYear, yearCY, yearCY1, yearCY2]
+    );
+    const [daysCY, daysCY1, daysCY2] = presence.days;
+
+    // Calculation Logic: only the three year totals feed the score
+    const result = useMemo(() => {
+        performance.mark('evaluate-start');
+        const evaluated = evaluateResidency(visaType, exemptYears, daysCY, daysCY1, daysCY2);
+        measureSince('evaluate', 'evaluate-start');
+        return evaluated;
+    }, [visaType, exemptYears, daysCY, daysCY1, daysCY2]);
+
+    // Render time: from the top of this render to the commit of the whole tree
+    useLayoutEffect(() => measureSince('render', 'render-start'));
+
+    // Send the inputs to Python (residency.solver) once typing pauses
+    useEffect(() => {
+        const timer = setTimeout(() => {
+            Streamlit.setComponentValue({
+                visaType,
+                exemptYears,
+                taxYear,
+                window: windowYear,
+                trips: [yearCY, yearCY1, yearCY2].map(year => year.trips.map(t => [t.start, t.end])),
+                seq: ++reportSeq,
+                timings: pendingTimings.splice(0)
+            });
+        }, SYNC_DELAY_MS);
+        return () => clearTimeout(timer);
+    }, [visaType, exemptYears, taxYear, windowYear, yearCY, yearCY1, yearCY2]);
+
+    return (
+        <div className="grid grid-cols-1 lg:grid-cols-12 gap-8 font-sans text-gray-800">
+            
+            {/* Left Column: Inputs */}
+            <div className="lg:col-span-7 space-y-6">
+                
+                {/* 1. Profile Section */}
+                <div className="bg-white p-6 rounded-2xl shadow-xs border border-gray-100">
+                    <h2 className="text-lg font-bold mb-4 flex items-center gap-2">
+                        <span className="w-8 h-8 rounded-full bg-blue-100 flex items-center justify-center text-blue-600"><CalendarIcon /></span>
+                        Profile & Visa
+                    </h2>
+                    <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
+                        <div>
+                            <label className="block text-xs font-bold text-gray-500 uppercase mb-1">Visa Type</label>
+                            <select 
+                                value={visaType} 
+                                onChange={(e) => setVisaType(e.target.value)}
+                                className="w-full p-3 bg-gray-50 border border-gray-200 rounded-lg font-medium focus:ring-2 focus:ring-blue-500 outline-hidden transition"
+                            >
+                                <option value="H1B">H1B (Specialty Occupation)</option>
+                                <option value="L1">L1 (Intracompany)</option>
+                                <option value="F1">F1 (Student)</option>
+                                <option value="J1">J1 (Teacher/Trainee)</option>
+                            </select>
+                        </div>
+                        <div>
+                            <label className="block text-xs font-bold text-gray-500 uppercase mb-1">Tax Year</label>
+                            <input 
+                                type="number" 
+                                value={taxYear}
+                                onChange={(e) => setTaxYear(e.target.value)}
+                                className="w-full p-3 bg-gray-50 border border-gray-200 rounded-lg font-medium focus:ring-2 focus:ring-blue-500 outline-hidden transition"
+                            />
+                        </div>
+                        {(visaType === 'F1' || visaType === 'J1') && (
+                            <div className="animate-fade-in">
+                                <label className="block text-xs font-bold text-gray-500 uppercase mb-1">Prior Exempt Years</label>
+                                <input 
+                                    type="number" 
+                                    min="0"
+                                    value={exemptYears}
+                                    onChange={(e) => setExemptYears(e.target.value)}
+                                    className="w-full p-3 bg-gray-50 border border-gray-200 rounded-lg font-medium focus:ring-2 focus:ring-blue-500 outline-hidden transition"
+                                />
+                                <p className="text-[10px] text-gray-400 mt-1">Calendar years already spent on F/J status.</p>
+                            </div>
+                        )}
+                    </div>
+                </div>
+
+                {/* 2. Trip Calculator (Hidden if Exempt) */}
+                {result && result.isExempt ? (
+                    <div className="bg-blue-50 border border-blue-100 rounded-2xl p-8 text-center">
+                        <p className="text-blue-800 font-medium">
+                            You are currently an Exempt Individual.
+                        </p>
+                        <p className="text-blue-600 text-sm mt-1">
+                            You do not need to count your days for the Substantial Presence Test.
+                        </p>
+                    </div>
+                ) : (
+                    <div className="space-y-4 animate-fade-in">
+                        <div className="flex items-center justify-between">
+                            <h2 className="text-lg font-bold text-gray-800">Travel History</h2>
+                            <p className="text-xs text-gray-400">Add all US visits for calculation</p>
+                        </div>
+                        <YearTripManager 
+                            label="Current Year" 
+                            yearLabel="(Tax Year)" 
+                            weight="100%" 
+                            year={yearCY} 
+                            days={daysCY}
+                            dispatch={dispatchCY} 
+                        />
+                        <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
+                            <YearTripManager 
+                                label="Last Year" 
+                                yearLabel="(CY - 1)" 
+                                weight="~33%" 
+                                year={yearCY1} 
+                                days={daysCY1}
+                                dispatch={dispatchCY1} 
+                            />
+                            <YearTripManager 
+                                label="Year Before" 
+                                yearLabel="(CY - 2)" 
+                                weight="~17%" 
+                                year={yearCY2} 
+                                days={daysCY2}
+                                dispatch={dispatchCY2} 
+                            />
+                        </div>
+                    </div>
+                )}
+            </div>
+
+            {/* Right Column: Results Sticky */}
+            <div className="lg:col-span-5">
+                <div className="sticky top-4">
+                    {result && (
+                        <div className={`rounded-3xl shadow-lg border overflow-hidden transition-all duration-500 ${
+                            result.code === 'RA' ? 'bg-white border-blue-100' : 'bg-white border-green-100'
+                        }`}>
+                            {/* Result Header */}
+                            <div className={`p-8 text-center ${
+                                result.code === 'RA' ? 'bg-linear-to-br from-blue-600 to-indigo-700 text-white' : 'bg-linear-to-br from-emerald-500 to-teal-600 text-white'
+                            }`}>
+                                <div className="bg-white/20 w-16 h-16 rounded-full flex items-center justify-center mx-auto mb-4 backdrop-blur-xs">
+                                    {result.code === 'RA' ? <AlertIcon className="text-white" /> : <CheckIcon className="text-white" />}
+                                </div>
+                                <h3 className="text-3xl font-bold mb-1">{result.status}</h3>
+                                <p className="opacity-90 font-medium text-lg">{result.form}</p>
+                            </div>
+
+                            {/* Result Body */}
+                            <div className="p-6 space-y-6">
+                                <div>
+                                    <h4 className="text-xs font-bold text-gray-400 uppercase tracking-wider mb-2">Reasoning</h4>
+                                    <p className="text-sm text-gray-700 leading-relaxed font-medium bg-gray-50 p-3 rounded-lg border border-gray-100">
+                                        {result.reason}
+                                    </p>
+                                </div>
+
+                                {!result.isExempt && (
+                                    <div>
+                                        <div className="flex justify-between items-end mb-2">
+                                            <h4 className="text-xs font-bold text-gray-400 uppercase tracking-wider">SPT Score</h4>
+                                            <span className="text-2xl font-bold text-gray-800">{result.score}</span>
+                                        </div>
+                                        
+                                        {/* Progress Bar */}
+                                        <div className="relative h-4 bg-gray-100 rounded-full overflow-hidden">
+                                            <div 
+                                                className={`absolute top-0 left-0 h-full transition-all duration-1000 ${
+                                                    result.passed ? 'bg-blue-600' : 'bg-emerald-500'
+                                                }`}
+                                                style={{ width: `${Math.min((result.score / 200) * 100, 100)}%` }}
+                                            ></div>
+                                            {/* 183 Marker */}
+                                            <div className="absolute top-0 bottom-0 w-0.5 bg-red-400 z-10" style={{ left: `${(RULES.threshold/200)*100}%` }}></div>
+                                        </div>
+                                        <div className="flex justify-between text-[10px] text-gray-400 mt-1 font-medium">
+                                            <span>0 Days</span>
+                                            <span className="text-red-500">Threshold: {RULES.threshold} Days</span>
+                                            <span>200+ Days</span>
+                                        </div>
+
+                                        {/* Residency Start Date (from residency.solver) */}
+                                        {startDate && String(startDate.taxYear) === String(taxYear) && (
+                                            <div className="flex justify-between items-center mt-4 text-sm">
+                                                <span className="text-xs font-bold text-gray-400 uppercase tracking-wider">
+                                                    {startDate.reached ? 'Residency Start' : 'Projected Start'}
+                                                </span>
+                                                <span className="font-semibold text-gray-800">
+                                                    {startDate.reached
+                                                        ? formatDate(startDate.reached)
+                                                        : startDate.projected
+                                                            ? formatDate(startDate.projected)
+                                                            : `Not reached in ${taxYear}`}
+                                                </span>
+                                            </div>
+                                        )}
+                                    </div>
+                                )}
+                                
+                                <div className="bg-amber-50 border border-amber-100 p-3 rounded-lg flex gap-3 items-start">
+                                    <div className="mt-0.5"><AlertIcon /></div>
+                                    <p className="text-xs text-amber-800 leading-relaxed">
+                                        <strong>Disclaimer:</strong> This tool is for estimation only. Tax laws are complex. Consult a CPA for official filing.
+                                    </p>
+                                </div>
+                            </div>
+                        </div>
+                    )}
+                    {!result.isExempt && (
+                        <PlannerPanel taxYear={taxYear} days={presence.days} present={presence.present} passed={Boolean(result.passed)} />
+                    )}
+                </div>
+            </div>
+        </div>
+    );
+};
+
+const root = ReactDOM.createRoot(document.getElementById('root'));
+Streamlit.onRender((args) => {
+    RULES = args.rules;
+    root.render(args.roster
+        ? <Roster data={args.roster} />
+        : <App startDate={args.start_date} history={args.history} />);
+});
+Streamlit.ready();
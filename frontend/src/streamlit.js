@@ -0,0 +1,33 @@
+// Minimal Streamlit custom-component bridge (component API v1).
+// Streamlit sends "streamlit:render" messages carrying the Python-side
+// arguments; the component reports its height and values back through
+// postMessage to the parent frame.
+const Streamlit = (() => {
+    const send = (type, data) =>
+        window.parent.postMessage({ isStreamlitMessage: true, type, ...data }, '*');
+
+    let lastHeight;
+    const setFrameHeight = (height = document.body.scrollHeight) => {
+        if (height === lastHeight) return;
+        lastHeight = height;
+        send('streamlit:setFrameHeight', { height });
+    };
+
+    const onRender = (callback) => {
+        window.addEventListener('message', (event) => {
+            if (event.data && event.data.type === 'streamlit:render') {
+                callback(event.data.args || {});
+            }
+        });
+    };
+
+    const ready = () => {
+        send('streamlit:componentReady', { apiVersion: 1 });
+        new ResizeObserver(() => setFrameHeight()).observe(document.body);
+    };
+
+    const setComponentValue = (value) =>
+        send('streamlit:setComponentValue', { value, dataType: 'json' });
+
+    return { onRender, ready, setFrameHeight, setComponentValue };
+})();
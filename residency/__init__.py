@@ -0,0 +1,25 @@
+"""US tax residency (Substantial Presence Test) calculator."""
+
+from residency.engine import (
+    Profile,
+    Result,
+    Trip,
+    YearDays,
+    YearTrips,
+    classify,
+    evaluate,
+    evaluate_batch,
+    trip_days,
+)
+
+__all__ = [
+    "Profile",
+    "Result",
+    "Trip",
+    "YearDays",
+    "YearTrips",
+    "classify",
+    "evaluate",
+    "evaluate_batch",
+    "trip_days",
+]
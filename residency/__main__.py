@@ -0,0 +1,5 @@
+import sys
+
+from residency.cli import main
+
+sys.exit(main())
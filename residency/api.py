@@ -0,0 +1,177 @@
+"""The calculator's JSON wire format, shared by the page and the HTTP service.
+
+A person is sent as the page reports it::
+
+    {"visaType": "H1B", "exemptYears": 0, "taxYear": 2025,
+     "trips": [[["2025-01-02", "2025-03-01"], ...],   # CY
+               [...],                                 # CY-1
+               [...]]}                                # CY-2
+
+``taxYear`` defaults to the current year, as on the page. A blank or
+missing date leaves the trip uncounted, as on the page. Days are
+counted by date, each once, in the year they fall in (see
+:mod:`residency.engine`). Results use the keys of the page's
+``evaluateResidency``. :func:`evaluate_many` scores any number of people
+with one :func:`residency.presence.evaluate_batch` call per tax year.
+"""
+
+from datetime import date
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from residency import engine, presence, vectorized
+
+
+class Person(NamedTuple):
+    """One person as parsed from the wire format."""
+
+    profile: engine.Profile
+    trips: engine.YearTrips
+    tax_year: int
+
+
+_YEARS = len(engine.YEAR_DIVISORS)
+_REASONS = {
+    vectorized.UNDER_MINIMUM: engine.REASON_UNDER_MINIMUM,
+    vectorized.PASSED: engine.REASON_PASSED,
+    vectorized.FAILED: engine.REASON_FAILED,
+}
+# More calendar years than anyone spends in the US; keeps counts well inside int64.
+MAX_EXEMPT_YEARS = 150
+_EPOCH = date(1970, 1, 1).toordinal()
+_NAT = np.iinfo(np.int64).min
+
+
+def _date(value) -> Optional[date]:
+    if value is None or value == "":
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"dates must be YYYY-MM-DD strings, got {value!r}")
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"invalid date {value!r}") from None
+
+
+def parse_person(value) -> Person:
+    """Profile and year buckets from one person's JSON; ``ValueError`` if malformed."""
+    if not isinstance(value, dict):
+        raise ValueError("a person must be a JSON object")
+    visa_type = value.get("visaType")
+    if visa_type not in engine.VISA_TYPES:
+        raise ValueError(f"unknown visa type {visa_type!r}; expected one of {engine.VISA_TYPES}")
+    # The page's number input reports a string.
+    raw = value.get("exemptYears") or 0
+    try:
+        exempt_years = int(raw)
+    except (TypeError, ValueError, OverflowError):  # OverflowError: JSON's Infinity
+        raise ValueError("exemptYears must be a whole number") from None
+    if isinstance(raw, float) and raw != exempt_years:
+        raise ValueError("exemptYears must be a whole number")
+    if exempt_years < 0:
+        raise ValueError("exemptYears must not be negative")
+    if exempt_years > MAX_EXEMPT_YEARS:
+        raise ValueError(f"exemptYears must be at most {MAX_EXEMPT_YEARS}")
+    try:
+        tax_year = int(value.get("taxYear", date.today().year))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("taxYear must be a year") from None
+    if not 1000 <= tax_year <= 9999:
+        raise ValueError("taxYear must be a four-digit year")
+    years = value.get("trips", [[]] * _YEARS)
+    if not isinstance(years, list) or len(years) != _YEARS:
+        raise ValueError(f"trips must be a list of {_YEARS} year lists (CY, CY-1, CY-2)")
+    buckets = []
+    for year in years:
+        if not isinstance(year, list):
+            raise ValueError("each year of trips must be a list of [start, end] pairs")
+        trips = []
+        for pair in year:
+            if not isinstance(pair, list) or len(pair) != 2:
+                raise ValueError("each trip must be a [start, end] pair")
+            trips.append(engine.Trip(_date(pair[0]), _date(pair[1])))
+        buckets.append(trips)
+    return Person(engine.Profile(visa_type, exempt_years), engine.YearTrips(*buckets), tax_year)
+
+
+def result_json(result: engine.Result) -> dict:
+    """An :class:`residency.engine.Result` in the page's result shape."""
+    out = {
+        "status": result.status,
+        "code": result.code,
+        "form": result.form,
+        "reason": result.reason,
+        "isExempt": result.is_exempt,
+    }
+    if result.is_exempt:
+        return out
+    out["score"] = result.score
+    out["passed"] = result.passed
+    if result.details is not None:
+        days_cy, days_cy1, days_cy2 = result.details
+        out["details"] = {"daysCY": days_cy, "daysCY1": days_cy1, "daysCY2": days_cy2}
+    return out
+
+
+_EXEMPT_JSON = {
+    visa: result_json(engine.classify(engine.Profile(visa, 0), 0, 0, 0))
+    for visa in engine.EXEMPT_REASONS
+}
+
+
+def evaluate_many(people: Sequence[Person]) -> List[dict]:
+    """Result JSON for every person, in order, from one vectorized evaluation per tax year.
+
+    Equal to ``result_json(engine.evaluate(*person))`` for each person.
+    """
+    results = [None] * len(people)
+    by_year = {}
+    for i, person in enumerate(people):
+        by_year.setdefault(person.tax_year, []).append(i)
+    for tax_year, indices in by_year.items():
+        group = [people[i] for i in indices]
+        for i, out in zip(indices, _evaluate_year(group, tax_year)):
+            results[i] = out
+    return results
+
+
+def _evaluate_year(people: Sequence[Person], tax_year: int) -> List[dict]:
+    # Day numbers since 1970-01-01, which is what datetime64[D] stores; far
+    # quicker to convert than date objects.
+    person, start, end = [], [], []
+    for i, (_, buckets, _) in enumerate(people):
+        for trips in buckets:
+            for trip in trips:
+                person.append(i)
+                start.append(_NAT if trip.start is None else trip.start.toordinal() - _EPOCH)
+                end.append(_NAT if trip.end is None else trip.end.toordinal() - _EPOCH)
+    batch = presence.evaluate_batch(
+        np.array(person, dtype=np.int64),
+        np.array(start, dtype=np.int64).view("datetime64[D]"),
+        np.array(end, dtype=np.int64).view("datetime64[D]"),
+        np.array([vectorized.VISA_CODES[p.profile.visa_type] for p in people], dtype=np.int64),
+        np.array([p.profile.exempt_years for p in people], dtype=np.int64),
+        tax_year,
+    )
+
+    results = []
+    rows = zip(batch.days.tolist(), batch.score.tolist(), batch.resident.tolist(), batch.reason.tolist())
+    for (profile, _, _), (days, score, resident, reason) in zip(people, rows):
+        if reason == vectorized.EXEMPT:
+            results.append(dict(_EXEMPT_JSON[profile.visa_type]))
+            continue
+        code = engine.RESIDENT if resident else engine.NON_RESIDENT
+        out = {
+            "status": engine.STATUS[code],
+            "code": code,
+            "form": engine.FORMS[code],
+            "reason": _REASONS[reason],
+            "isExempt": False,
+            "score": int(score) if reason == vectorized.UNDER_MINIMUM else score,
+            "passed": resident,
+        }
+        if reason != vectorized.UNDER_MINIMUM:
+            out["details"] = dict(zip(("daysCY", "daysCY1", "daysCY2"), days))
+        results.append(out)
+    return results
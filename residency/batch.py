@@ -0,0 +1,261 @@
+"""Streaming residency classification of travel logs stored as CSV or Parquet.
+
+Input has one row per trip with the columns in ``INPUT_COLUMNS``. Every row
+of a person carries that person's visa type and exempt-year count, and rows
+must be sorted by ``person_id`` (string order), which keeps each person's
+rows together. Unsorted input raises ``ValueError`` rather than splitting a
+person's days between two results. The file is
+read in chunks of roughly ``chunk_rows`` rows. The rows of the last person in
+a chunk are carried over to the next chunk, so each person is evaluated
+exactly once and memory stays bounded by the chunk size. Results are
+written as each chunk completes, in input order.
+
+Days are counted with :mod:`residency.presence`. A day is counted once even
+if trips overlap, and trips crossing Dec 31 are split between the years.
+"""
+
+import contextlib
+import os
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from residency import engine, parallel, presence, vectorized
+
+INPUT_COLUMNS = ("person_id", "visa_type", "exempt_years", "start", "end")
+_VISA_SET = pa.array(engine.VISA_TYPES)
+_INPUT_TYPES = {
+    "person_id": pa.string(),
+    "visa_type": pa.string(),
+    "exempt_years": pa.int64(),
+    "start": pa.date32(),
+    "end": pa.date32(),
+}
+_INPUT_SCHEMA = pa.schema(list(_INPUT_TYPES.items()))
+
+OUTPUT_SCHEMA = pa.schema(
+    [
+        ("person_id", pa.string()),
+        ("code", pa.string()),
+        ("status", pa.string()),
+        ("form", pa.string()),
+        ("reason", pa.string()),
+        ("score", pa.float64()),
+        ("days_cy", pa.int64()),
+        ("days_cy1", pa.int64()),
+        ("days_cy2", pa.int64()),
+    ]
+)
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+# Rough bytes per CSV row, used to size pyarrow's streaming read blocks.
+_CSV_ROW_BYTES = 64
+
+_CODES = np.array([engine.NON_RESIDENT, engine.RESIDENT], dtype=object)
+_STATUS = np.array([engine.STATUS[c] for c in _CODES], dtype=object)
+_FORMS = np.array([engine.FORMS[c] for c in _CODES], dtype=object)
+_EXEMPT_REASONS = np.array(
+    [engine.EXEMPT_REASONS.get(visa) for visa in engine.VISA_TYPES], dtype=object
+)
+_REASONS = np.empty(4, dtype=object)
+_REASONS[vectorized.UNDER_MINIMUM] = engine.REASON_UNDER_MINIMUM
+_REASONS[vectorized.PASSED] = engine.REASON_PASSED
+_REASONS[vectorized.FAILED] = engine.REASON_FAILED
+
+
+class BatchStats(NamedTuple):
+    rows: int
+    people: int
+
+
+def _is_parquet(path: Path) -> bool:
+    return path.suffix.lower() in (".parquet", ".pq")
+
+
+def read_batches(
+    path, chunk_rows: int = DEFAULT_CHUNK_ROWS, parquet: Optional[bool] = None
+) -> Iterator[pa.RecordBatch]:
+    """Stream ``path`` as record batches holding the input columns.
+
+    ``path`` may also be a binary file object; ``parquet`` then says which
+    format it is (by default the path's extension decides).
+    """
+    if parquet is None:
+        parquet = _is_parquet(Path(path))
+    if parquet:
+        yield from pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=list(INPUT_COLUMNS))
+        return
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=chunk_rows * _CSV_ROW_BYTES),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=_INPUT_TYPES, include_columns=list(INPUT_COLUMNS)
+        ),
+    )
+    yield from reader
+
+
+def _check_ids(ids: pa.ChunkedArray) -> None:
+    missing = pc.sum(pc.is_null(ids)).as_py()
+    if missing:
+        raise ValueError(f"person_id is missing in {missing} row(s)")
+
+
+def _unsorted(ids: np.ndarray) -> Optional[int]:
+    """Index of the first id smaller than the one before it, if any."""
+    if len(ids) < 2:
+        return None
+    descending = np.flatnonzero(ids[1:] < ids[:-1])
+    return int(descending[0]) + 1 if len(descending) else None
+
+
+def _unsorted_error(ids, i: int) -> ValueError:
+    return ValueError(f"rows must be sorted by person_id; {ids[i]!r} follows {ids[i - 1]!r}")
+
+
+def group_people(batches: Iterator[pa.RecordBatch]) -> Iterator[pa.Table]:
+    """Re-chunk ``batches`` so that no person's rows are split across tables.
+
+    Raises ``ValueError`` when the rows are not sorted by ``person_id`` or a
+    row has none. The carried-over rows start each new table, so the order
+    is also checked across chunk boundaries.
+    """
+    carry = None
+    for batch in batches:
+        if batch.num_rows == 0:
+            continue
+        table = pa.Table.from_batches([batch]).select(INPUT_COLUMNS).cast(_INPUT_SCHEMA)
+        if carry is not None:
+            table = pa.concat_tables([carry, table])
+        ids = table.column("person_id")
+        _check_ids(ids)
+        descending = pc.less(ids.slice(1), ids.slice(0, len(ids) - 1))
+        if pc.any(descending).as_py():
+            i = pc.index(descending, True).as_py() + 1
+            raise _unsorted_error(ids.slice(i - 1, 2).to_pylist(), 1)
+        # Rows are sorted by person, so the last person's rows are a trailing run.
+        same = pc.equal(ids, ids[-1]).to_numpy(zero_copy_only=False)
+        cut = len(same) - int(np.argmin(same[::-1])) if not same.all() else 0
+        if cut:
+            yield table.slice(0, cut)
+        carry = table.slice(cut)
+    if carry is not None and carry.num_rows:
+        yield carry
+
+
+class Columns(NamedTuple):
+    """A table's trips and profiles in the layout of :mod:`residency.vectorized`."""
+
+    ids: np.ndarray  # person_id of each person, in table order
+    person: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    visa: np.ndarray
+    exempt_years: np.ndarray
+
+
+def columns(table: pa.Table) -> Columns:
+    """Split ``table`` (complete rows per person, sorted by ``person_id``) into columns.
+
+    Raises ``ValueError`` on an unknown visa type, a missing ``person_id``
+    or unsorted rows.
+    """
+    table = table.select(INPUT_COLUMNS).cast(_INPUT_SCHEMA)
+    _check_ids(table.column("person_id"))
+    ids = table.column("person_id").to_numpy(zero_copy_only=False)
+    new_person = np.empty(len(ids), dtype=bool)
+    new_person[:1] = True
+    np.not_equal(ids[1:], ids[:-1], out=new_person[1:])
+    person = np.cumsum(new_person) - 1
+    first = np.flatnonzero(new_person)
+    bad = _unsorted(ids[first])
+    if bad is not None:
+        raise _unsorted_error(ids[first], bad)
+
+    visa_codes = pc.index_in(table.column("visa_type"), value_set=_VISA_SET)
+    if visa_codes.null_count:
+        bad = pc.filter(table.column("visa_type"), pc.is_null(visa_codes))[0].as_py()
+        raise ValueError(f"unknown visa type {bad!r}; expected one of {engine.VISA_TYPES}")
+    return Columns(
+        ids=ids[first],
+        person=person,
+        start=table.column("start").to_numpy(zero_copy_only=False),
+        end=table.column("end").to_numpy(zero_copy_only=False),
+        visa=visa_codes.to_numpy(zero_copy_only=False)[first].astype(np.int64),
+        exempt_years=pc.fill_null(table.column("exempt_years"), 0).to_numpy(zero_copy_only=False)[first],
+    )
+
+
+def evaluate_table(table: pa.Table, tax_year: int, evaluator=presence.evaluate_batch) -> pa.Table:
+    """Classify every person in ``table`` (complete rows per person, sorted by ``person_id``).
+
+    ``evaluator`` has the signature of :func:`residency.presence.evaluate_batch`.
+    """
+    ids, person, start, end, visa, exempt_years = columns(table)
+    result = evaluator(person, start, end, visa, exempt_years, tax_year)
+    resident = result.resident.astype(np.int64)
+    reason = np.where(result.exempt, _EXEMPT_REASONS[visa], _REASONS[result.reason])
+    return pa.table(
+        [
+            pa.array(ids, pa.string()),
+            pa.array(_CODES[resident], pa.string()),
+            pa.array(_STATUS[resident], pa.string()),
+            pa.array(_FORMS[resident], pa.string()),
+            pa.array(reason, pa.string()),
+            pa.array(result.score, pa.float64(), from_pandas=True),
+            pa.array(result.days[:, 0]),
+            pa.array(result.days[:, 1]),
+            pa.array(result.days[:, 2]),
+        ],
+        schema=OUTPUT_SCHEMA,
+    )
+
+
+def _open_writer(path: Path, parquet: bool):
+    if parquet:
+        return pq.ParquetWriter(path, OUTPUT_SCHEMA)
+    return pa_csv.CSVWriter(path, OUTPUT_SCHEMA)
+
+
+def run(
+    input_path: Path,
+    output_path: Path,
+    tax_year: int,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    workers: int = 1,
+) -> BatchStats:
+    """Classify everyone in ``input_path`` and write one row per person to ``output_path``.
+
+    The format of each file follows its extension: ``.parquet``/``.pq`` for
+    Parquet, anything else for CSV. With ``workers > 1`` each chunk is
+    evaluated by a :class:`residency.parallel.ParallelEvaluator`; the output
+    is identical.
+
+    Results are written to a ``.partial`` file next to ``output_path`` and
+    renamed once every person is written, so a run that fails part-way
+    leaves no truncated output (and any earlier file in place).
+    """
+    output_path = Path(output_path)
+    partial = output_path.with_name(output_path.name + ".partial")
+    try:
+        with contextlib.ExitStack() as stack:
+            evaluator = presence.evaluate_batch
+            if workers > 1:
+                evaluator = stack.enter_context(parallel.ParallelEvaluator(workers)).evaluate
+            writer = stack.enter_context(_open_writer(partial, _is_parquet(output_path)))
+            rows = people = 0
+            for table in group_people(read_batches(Path(input_path), chunk_rows)):
+                out = evaluate_table(table, tax_year, evaluator)
+                writer.write_table(out)
+                rows += table.num_rows
+                people += out.num_rows
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    os.replace(partial, output_path)
+    return BatchStats(rows, people)
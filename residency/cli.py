@@ -0,0 +1,92 @@
+"""Command-line entry point: ``python -m residency``."""
+
+import argparse
+import os
+import sys
+import time
+
+from residency import batch, service
+
+
+def _batch(args) -> int:
+    if args.workers == 0:
+        args.workers = os.cpu_count() or 1
+    start = time.perf_counter()
+    stats = batch.run(args.input, args.output, args.tax_year, args.chunk_rows, args.workers)
+    elapsed = time.perf_counter() - start
+    print(
+        f"classified {stats.people:,} people from {stats.rows:,} trips in {elapsed:.1f}s "
+        f"({stats.rows / elapsed if elapsed else 0:,.0f} rows/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _serve(args) -> int:
+    import uvicorn
+
+    app = service.create_app(args.max_batch, args.max_delay_ms / 1000)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m residency", description="US tax residency (SPT) tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser(
+        "batch",
+        help="classify everyone in a CSV/Parquet travel log",
+        description=(
+            "Classify every person in a travel log as Resident or Non-Resident Alien. "
+            f"Columns: {', '.join(batch.INPUT_COLUMNS)}; rows must be sorted by person_id. "
+            "Files ending in .parquet/.pq are Parquet, anything else is CSV."
+        ),
+    )
+    run.add_argument("input", help="travel log, one row per trip")
+    run.add_argument("-o", "--output", required=True, help="results file, one row per person")
+    run.add_argument("--tax-year", type=int, required=True, help="tax year to evaluate")
+    run.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=batch.DEFAULT_CHUNK_ROWS,
+        help="approximate rows held in memory at once (default: %(default)s)",
+    )
+    run.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes per chunk; 0 means one per CPU (default: %(default)s)",
+    )
+    run.set_defaults(func=_batch)
+
+    serve = commands.add_parser(
+        "serve",
+        help="run the HTTP/JSON service",
+        description="Serve POST /evaluate and POST /evaluate:batch (see residency.service).",
+    )
+    serve.add_argument("--host", default="127.0.0.1", help="interface to bind (default: %(default)s)")
+    serve.add_argument("--port", type=int, default=8000, help="port (default: %(default)s)")
+    serve.add_argument(
+        "--max-batch",
+        type=int,
+        default=service.DEFAULT_MAX_BATCH,
+        help="most requests evaluated together (default: %(default)s)",
+    )
+    serve.add_argument(
+        "--max-delay-ms",
+        type=float,
+        default=service.DEFAULT_MAX_DELAY * 1000,
+        help="longest a request waits for others to join its batch (default: %(default)s)",
+    )
+    serve.set_defaults(func=_serve)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
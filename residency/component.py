@@ -0,0 +1,208 @@
+"""Streamlit custom component that renders the calculator page.
+
+The page is the static build in ``residency/frontend`` (see
+``frontend/build.py``). Streamlit serves it from its component route, so
+the iframe URL stays the same across reruns and sessions and browsers cache
+the hashed assets. Only the small ``args`` payload goes over the websocket
+on each rerun.
+
+With a :class:`residency.store.TripStore` and a user key, the page's trips
+and profile are saved as it reports them and loaded on the next visit.
+The store keeps trips by date, so a trip is only saved from the box of the
+year its dates fall in; otherwise the page's trips are left unsaved and a
+warning says which trip is out of place.
+
+Each build is timed with :mod:`residency.metrics`. The browser's own
+evaluation and render timings arrive with the page's reported value.
+
+The same page also renders a roster (:func:`roster_table`): every person
+of an uploaded travel log for every year of a range, scored in Python by
+:mod:`residency.roster`.
+"""
+
+import io
+import time
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pyarrow as pa
+import streamlit as st
+import streamlit.components.v1 as components
+
+from residency import api, batch, engine, metrics, roster, solver
+from residency.store import TripStore
+
+BUILD_DIR = Path(__file__).parent / "frontend"
+
+# Declared once per process, on first import.
+_component = components.declare_component("residency_calculator", path=str(BUILD_DIR))
+_RULES = engine.client_rules()
+# The page's year boxes, CY first.
+BOX_LABELS = ("Current Year", "Last Year", "Year Before")
+# Most tax years in one roster: each year adds a cell per person to the payload.
+MAX_ROSTER_YEARS = 50
+
+
+def start_date(value: Optional[dict], today: Optional[date] = None) -> Optional[dict]:
+    """Residency start date for the inputs the page last reported.
+
+    When the tax year is the current year, the projection assumes presence
+    every day from today on.
+    """
+    if not value:
+        return None
+    try:
+        profile, trips, tax_year = api.parse_person(value)
+    except ValueError:
+        return None
+    today = today or date.today()
+    found = solver.start_date(profile, trips, tax_year, today if today.year == tax_year else None)
+    return {
+        "taxYear": tax_year,
+        "reached": found.reached and found.reached.isoformat(),
+        "projected": found.projected and found.projected.isoformat(),
+    }
+
+
+def _tax_year(value) -> Optional[int]:
+    """A four-digit year, or ``None`` (e.g. while the year is being typed)."""
+    try:
+        year = int(value)
+    except (TypeError, ValueError):
+        return None
+    return year if 1000 <= year <= 9999 else None
+
+
+def misplaced_trips(trips: engine.YearTrips, tax_year: int) -> List[str]:
+    """A message for each dated trip that is not inside its box's year.
+
+    Such a trip would come back in another box, or not at all, once saved
+    by date. Trips missing a date are not checked (they are not saved).
+    """
+    problems = []
+    for offset, (label, bucket) in enumerate(zip(BOX_LABELS, trips)):
+        year = tax_year - offset
+        for trip in bucket:
+            if trip.start is None or trip.end is None:
+                continue
+            if trip.start.year != year or trip.end.year != year:
+                problems.append(f"{label}: the trip {trip.start} to {trip.end} is not within {year}.")
+    return problems
+
+
+def history(store: TripStore, user: str, value: Optional[dict], today: Optional[date] = None) -> dict:
+    """Save what the page last reported and return the stored view it should show.
+
+    The page reports the trips of the window it loaded (``window``), which
+    may differ from ``taxYear`` if the year was just changed. The trips are
+    saved into that window, then the view of the requested year is
+    returned. If any trip is outside its box's year (:func:`misplaced_trips`)
+    the trips are not saved and the messages are returned as ``warnings``.
+    """
+    tax_year = (today or date.today()).year
+    warnings = []
+    if value:
+        window = _tax_year(value.get("window"))
+        if window is not None:
+            try:
+                profile, trips, _ = api.parse_person(value)
+            except ValueError:
+                pass
+            else:
+                store.set_profile(user, profile)
+                warnings = misplaced_trips(trips, window)
+                if not warnings:
+                    store.replace_window(user, window, [t for year in trips for t in year])
+            tax_year = _tax_year(value.get("taxYear")) or window
+    profile = store.profile(user) or engine.Profile()
+    return {
+        "warnings": warnings,
+        "taxYear": tax_year,
+        "visaType": profile.visa_type,
+        "exemptYears": profile.exempt_years,
+        "trips": [
+            [[t.start.isoformat(), t.end.isoformat()] for t in year]
+            for year in store.year_trips(user, tax_year)
+        ],
+    }
+
+
+def _record_client_timings(key: str, value: Optional[dict]) -> None:
+    """Record the browser timings in ``value`` once, however often the script reruns."""
+    if not value or not value.get("timings"):
+        return
+    seen = f"{key}_timings_seq"
+    if st.session_state.get(seen) == value.get("seq"):
+        return
+    st.session_state[seen] = value.get("seq")
+    metrics.record_client(value["timings"])
+
+
+def calculator(key: str = "calculator", store: Optional[TripStore] = None, user: Optional[str] = None):
+    """Render the calculator and return the last value it reported, if any.
+
+    Trips are persisted per ``user`` when both ``store`` and ``user`` are given.
+    """
+    with metrics.timer("page_build"):
+        value = st.session_state.get(key)
+        _record_client_timings(key, value)
+        saved = None
+        if store is not None and user:
+            with metrics.timer("page_history"):
+                saved = history(store, user, value)
+            for warning in saved["warnings"]:
+                st.warning(f"Trips not saved. {warning}")
+        with metrics.timer("page_start_date"):
+            found = start_date(value)
+        return _component(rules=_RULES, start_date=found, history=saved, key=key, default=None)
+
+
+@st.cache_data(max_entries=4)
+def roster_payload(data: bytes, parquet: bool, first_year: int, last_year: int) -> dict:
+    """The roster of a travel log in :data:`residency.batch.INPUT_COLUMNS` form.
+
+    Rows need not be grouped by person. Codes and scores are flattened
+    person-major so the page can slice each row out of one string and one
+    list: a code is a :mod:`residency.vectorized` reason digit, a score is
+    tenths of a day, -1 for an exempt individual.
+
+    Raises ``ValueError`` on an unknown visa type, a missing person_id or a
+    range of more than :data:`MAX_ROSTER_YEARS` years.
+    """
+    if last_year - first_year + 1 > MAX_ROSTER_YEARS:
+        raise ValueError(f"a roster covers at most {MAX_ROSTER_YEARS} tax years")
+    with metrics.timer("roster_build"):
+        table = pa.Table.from_batches(list(batch.read_batches(io.BytesIO(data), parquet=parquet)))
+        cols = batch.columns(table.sort_by("person_id"))
+        result = roster.evaluate(
+            cols.person, cols.start, cols.end, cols.visa, cols.exempt_years, first_year, last_year
+        )
+        scores = np.where(result.exempt, -1, np.round(result.score * 10)).astype(np.int64)
+        return {
+            "years": result.years.tolist(),
+            "ids": cols.ids.tolist(),
+            "codes": (result.reason.astype(np.uint8) + ord("0")).tobytes().decode("ascii"),
+            "scores": scores.reshape(-1).tolist(),
+        }
+
+
+def roster_table(payload: dict, key: str = "roster") -> None:
+    """Render a :func:`roster_payload` as a scrolling table of its visible rows."""
+    _component(rules=_RULES, roster=payload, key=key, default=None)
+
+
+def debug_panel(limit: int = 50) -> None:
+    """The last ``limit`` timings of this server process, newest first."""
+    rows = [
+        {
+            "time": time.strftime("%H:%M:%S", time.localtime(t.at)),
+            "side": t.side,
+            "stage": t.stage,
+            "ms": round(t.seconds * 1000, 3),
+        }
+        for t in metrics.recent(limit)
+    ]
+    with st.expander(f"Timings (last {limit})"):
+        st.dataframe(rows, hide_index=True)
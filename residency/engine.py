@@ -0,0 +1,222 @@
+"""Substantial Presence Test (SPT) rules, free of any UI code.
+
+This is the single source of truth for the residency decision that the
+calculator page renders. It mirrors the rules the page has always applied:
+
+1. F1 students in their first 5 calendar years and J1 teachers/trainees in
+   their first 2 are exempt individuals and therefore Non-Resident Aliens.
+2. Fewer than 31 days in the current year is an automatic NRA result.
+3. Otherwise ``daysCY + daysCY1 / 3 + daysCY2 / 6 >= 183`` makes a
+   Resident Alien.
+
+Days are counted by date, the same way on every path (page, service, batch
+command, store): a day of presence counts once, however many trips cover
+it, and in the calendar year it falls in. The year boxes trips are entered
+in do not change the count. :mod:`residency.presence` does the counting.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import NamedTuple, Optional, Sequence
+
+# --- Rule constants ---
+VISA_TYPES = ("H1B", "L1", "F1", "J1")
+
+# Calendar years a visa holder may spend as an exempt individual.
+EXEMPT_YEAR_LIMITS = {"F1": 5, "J1": 2}
+EXEMPT_REASONS = {
+    "F1": "F1 Student (First 5 calendar years are exempt from SPT)",
+    "J1": "J1 Teacher/Trainee (First 2 calendar years are exempt from SPT)",
+}
+
+MIN_CURRENT_YEAR_DAYS = 31
+SPT_THRESHOLD = 183
+# Divisors applied to days in CY, CY-1 and CY-2 respectively.
+YEAR_DIVISORS = (1, 3, 6)
+
+RESIDENT = "RA"
+NON_RESIDENT = "NRA"
+STATUS = {RESIDENT: "Resident Alien", NON_RESIDENT: "Non-Resident Alien"}
+FORMS = {RESIDENT: "Form 1040", NON_RESIDENT: "Form 1040-NR"}
+
+REASON_UNDER_MINIMUM = "Present less than 31 days in current year."
+REASON_PASSED = "Passed Substantial Presence Test (≥ 183 days)."
+REASON_FAILED = "Failed Substantial Presence Test (< 183 days)."
+
+
+@dataclass(frozen=True)
+class Profile:
+    """Visa holder profile as entered on the calculator page."""
+
+    visa_type: str = "H1B"
+    exempt_years: int = 0
+
+
+@dataclass(frozen=True)
+class Trip:
+    """A single US visit. Either end may be missing while it is being typed."""
+
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+    @classmethod
+    def from_iso(cls, start: str, end: str) -> "Trip":
+        """Build a trip from ``YYYY-MM-DD`` strings, ignoring blank or bad input."""
+        return cls(_parse_date(start), _parse_date(end))
+
+    @property
+    def days(self) -> int:
+        return trip_days(self.start, self.end)
+
+
+class YearTrips(NamedTuple):
+    """Trips entered for the tax year and the two years before it.
+
+    The boxes only group trips for entry; days are counted by date.
+    """
+
+    current: Sequence[Trip] = ()
+    prior: Sequence[Trip] = ()
+    second_prior: Sequence[Trip] = ()
+
+
+class YearDays(NamedTuple):
+    """Days of presence counted for CY, CY-1 and CY-2."""
+
+    current: int
+    prior: int
+    second_prior: int
+
+
+@dataclass(frozen=True)
+class Result:
+    """Outcome of the residency test, shaped like the page's ``result`` state."""
+
+    status: str
+    code: str
+    form: str
+    reason: str
+    is_exempt: bool
+    score: Optional[float] = None
+    details: Optional[YearDays] = None
+    passed: bool = False
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def trip_days(start: Optional[date], end: Optional[date]) -> int:
+    """Inclusive day count of a trip; 0 if either date is missing.
+
+    Like the page's ``getDaysDiff`` the order of the dates does not matter.
+    """
+    if start is None or end is None:
+        return 0
+    return abs((end - start).days) + 1
+
+
+def exempt_reason(profile: Profile) -> Optional[str]:
+    """Reason text if ``profile`` is an exempt individual, else ``None``."""
+    limit = EXEMPT_YEAR_LIMITS.get(profile.visa_type)
+    if limit is not None and profile.exempt_years < limit:
+        return EXEMPT_REASONS[profile.visa_type]
+    return None
+
+
+def weighted_score(days_cy: int, days_cy1: int, days_cy2: int) -> float:
+    """``daysCY + daysCY1 / 3 + daysCY2 / 6`` in the page's evaluation order."""
+    return days_cy + days_cy1 / YEAR_DIVISORS[1] + days_cy2 / YEAR_DIVISORS[2]
+
+
+def _exempt_result(reason: str) -> Result:
+    return Result(
+        status=STATUS[NON_RESIDENT],
+        code=NON_RESIDENT,
+        form=FORMS[NON_RESIDENT],
+        reason=reason,
+        is_exempt=True,
+    )
+
+
+# Exempt outcomes carry no per-person data, so they are built once and shared.
+_EXEMPT_RESULTS = {visa: _exempt_result(reason) for visa, reason in EXEMPT_REASONS.items()}
+
+
+def classify(profile: Profile, days_cy: int, days_cy1: int, days_cy2: int) -> Result:
+    """Apply the SPT to already-counted days for each of the three years."""
+    if exempt_reason(profile) is not None:
+        return _EXEMPT_RESULTS[profile.visa_type]
+
+    if days_cy < MIN_CURRENT_YEAR_DAYS:
+        return Result(
+            status=STATUS[NON_RESIDENT],
+            code=NON_RESIDENT,
+            form=FORMS[NON_RESIDENT],
+            reason=REASON_UNDER_MINIMUM,
+            is_exempt=False,
+            score=days_cy,
+        )
+
+    score = weighted_score(days_cy, days_cy1, days_cy2)
+    passed = score >= SPT_THRESHOLD
+    code = RESIDENT if passed else NON_RESIDENT
+    return Result(
+        status=STATUS[code],
+        code=code,
+        form=FORMS[code],
+        reason=REASON_PASSED if passed else REASON_FAILED,
+        is_exempt=False,
+        score=score,
+        details=YearDays(days_cy, days_cy1, days_cy2),
+        passed=passed,
+    )
+
+
+def evaluate(profile: Profile, trips: YearTrips, tax_year: int) -> Result:
+    """Residency result for one person in ``tax_year``.
+
+    ``trips`` holds the trips entered for CY, CY-1 and CY-2; each day of
+    them counts once, in the year of its date.
+    """
+    if exempt_reason(profile) is not None:
+        return _EXEMPT_RESULTS[profile.visa_type]
+    # presence builds on this module, so it is imported when first needed.
+    from residency.presence import PresenceCalendar
+
+    return classify(profile, *PresenceCalendar(t for year in trips for t in year).year_days(tax_year))
+
+
+def evaluate_batch(profiles: Sequence[Profile], trips: Sequence[YearTrips], tax_year: int) -> list:
+    """Evaluate many people in one call.
+
+    Results are returned in input order. Exempt results are shared instances
+    and no intermediate containers are built per person.
+    """
+    if len(profiles) != len(trips):
+        raise ValueError("profiles and trips must have the same length")
+    _evaluate = evaluate
+    return [_evaluate(profile, history, tax_year) for profile, history in zip(profiles, trips)]
+
+
+def client_rules() -> dict:
+    """Rule constants for the in-browser calculator, so both sides agree."""
+    return {
+        "exemptYearLimits": EXEMPT_YEAR_LIMITS,
+        "exemptReasons": EXEMPT_REASONS,
+        "minCurrentYearDays": MIN_CURRENT_YEAR_DAYS,
+        "threshold": SPT_THRESHOLD,
+        "yearDivisors": YEAR_DIVISORS,
+        "status": STATUS,
+        "forms": FORMS,
+        "reasons": {
+            "underMinimum": REASON_UNDER_MINIMUM,
+            "passed": REASON_PASSED,
+            "failed": REASON_FAILED,
+        },
+    }
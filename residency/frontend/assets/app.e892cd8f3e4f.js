@@ -0,0 +1,464 @@
+// Minimal Streamlit custom-component bridge (component API v1).
+// Streamlit sends "streamlit:render" messages carrying the Python-side
+// arguments; the component reports its height and values back through
+// postMessage to the parent frame.
+const Streamlit = (() => {
+    const send = (type, data) =>
+        window.parent.postMessage({ isStreamlitMessage: true, type, ...data }, '*');
+
+    let lastHeight;
+    const setFrameHeight = (height = document.body.scrollHeight) => {
+        if (height === lastHeight) return;
+        lastHeight = height;
+        send('streamlit:setFrameHeight', { height });
+    };
+
+    const onRender = (callback) => {
+        window.addEventListener('message', (event) => {
+            if (event.data && event.data.type === 'streamlit:render') {
+                callback(event.data.args || {});
+            }
+        });
+    };
+
+    const ready = () => {
+        send('streamlit:componentReady', { apiVersion: 1 });
+        new ResizeObserver(() => setFrameHeight()).observe(document.body);
+    };
+
+    const setComponentValue = (value) =>
+        send('streamlit:setComponentValue', { value, dataType: 'json' });
+
+    return { onRender, ready, setFrameHeight, setComponentValue };
+})();
+
+const { useState, useReducer, useMemo, useCallback, useEffect, useLayoutEffect, useRef, memo } = React;
+let RULES = null;
+const PlusIcon = () => /* @__PURE__ */ React.createElement("svg", { xmlns: "http://www.w3.org/2000/svg", width: "16", height: "16", viewBox: "0 0 24 24", fill: "none", stroke: "currentColor", strokeWidth: "2", strokeLinecap: "round", strokeLinejoin: "round" }, /* @__PURE__ */ React.createElement("line", { x1: "12", y1: "5", x2: "12", y2: "19" }), /* @__PURE__ */ React.createElement("line", { x1: "5", y1: "12", x2: "19", y2: "12" }));
+const TrashIcon = () => /* @__PURE__ */ React.createElement("svg", { xmlns: "http://www.w3.org/2000/svg", width: "14", height: "14", viewBox: "0 0 24 24", fill: "none", stroke: "currentColor", strokeWidth: "2", strokeLinecap: "round", strokeLinejoin: "round" }, /* @__PURE__ */ React.createElement("polyline", { points: "3 6 5 6 21 6" }), /* @__PURE__ */ React.createElement("path", { d: "M19 6v14a2 2 0 0 1-2 2H7a2 2 0 0 1-2-2V6m3 0V4a2 2 0 0 1 2-2h4a2 2 0 0 1 2 2v2" }));
+const CalendarIcon = () => /* @__PURE__ */ React.createElement("svg", { xmlns: "http://www.w3.org/2000/svg", width: "18", height: "18", viewBox: "0 0 24 24", fill: "none", stroke: "currentColor", strokeWidth: "2", strokeLinecap: "round", strokeLinejoin: "round" }, /* @__PURE__ */ React.createElement("rect", { width: "18", height: "18", x: "3", y: "4", rx: "2", ry: "2" }), /* @__PURE__ */ React.createElement("line", { x1: "16", y1: "2", x2: "16", y2: "6" }), /* @__PURE__ */ React.createElement("line", { x1: "8", y1: "2", x2: "8", y2: "6" }), /* @__PURE__ */ React.createElement("line", { x1: "3", y1: "10", x2: "21", y2: "10" }));
+const AlertIcon = () => /* @__PURE__ */ React.createElement("svg", { xmlns: "http://www.w3.org/2000/svg", width: "20", height: "20", viewBox: "0 0 24 24", fill: "none", stroke: "currentColor", strokeWidth: "2", strokeLinecap: "round", strokeLinejoin: "round", className: "text-amber-500" }, /* @__PURE__ */ React.createElement("circle", { cx: "12", cy: "12", r: "10" }), /* @__PURE__ */ React.createElement("line", { x1: "12", y1: "8", x2: "12", y2: "12" }), /* @__PURE__ */ React.createElement("line", { x1: "12", y1: "16", x2: "12.01", y2: "16" }));
+const CheckIcon = () => /* @__PURE__ */ React.createElement("svg", { xmlns: "http://www.w3.org/2000/svg", width: "32", height: "32", viewBox: "0 0 24 24", fill: "none", stroke: "currentColor", strokeWidth: "3", strokeLinecap: "round", strokeLinejoin: "round", className: "text-green-600" }, /* @__PURE__ */ React.createElement("polyline", { points: "20 6 9 17 4 12" }));
+const XCircleIcon = () => /* @__PURE__ */ React.createElement("svg", { xmlns: "http://www.w3.org/2000/svg", width: "32", height: "32", viewBox: "0 0 24 24", fill: "none", stroke: "currentColor", strokeWidth: "2", strokeLinecap: "round", strokeLinejoin: "round", className: "text-blue-600" }, /* @__PURE__ */ React.createElement("circle", { cx: "12", cy: "12", r: "10" }), /* @__PURE__ */ React.createElement("line", { x1: "15", y1: "9", x2: "9", y2: "15" }), /* @__PURE__ */ React.createElement("line", { x1: "9", y1: "9", x2: "15", y2: "15" }));
+const MAX_PENDING_TIMINGS = 50;
+const pendingTimings = [];
+let reportSeq = 0;
+const measureSince = (stage, startMark) => {
+  const { duration } = performance.measure(stage, startMark);
+  pendingTimings.push([stage, duration]);
+  if (pendingTimings.length > MAX_PENDING_TIMINGS)
+    pendingTimings.shift();
+  performance.clearMarks(startMark);
+  performance.clearMeasures(stage);
+};
+const getDaysDiff = (start, end) => {
+  if (!start || !end)
+    return 0;
+  const s = new Date(start);
+  const e = new Date(end);
+  if (isNaN(s) || isNaN(e))
+    return 0;
+  const diffTime = Math.abs(e - s);
+  const diffDays = Math.ceil(diffTime / (1e3 * 60 * 60 * 24));
+  return diffDays + 1;
+};
+const emptyYear = { trips: [] };
+let nextTripId = 1;
+const loadYear = (pairs) => ({
+  trips: pairs.map(([start, end]) => ({ id: nextTripId++, start, end, days: getDaysDiff(start, end) }))
+});
+const yearReducer = (state, action) => {
+  switch (action.type) {
+    case "load":
+      return loadYear(action.trips);
+    case "add":
+      return { ...state, trips: [...state.trips, { id: nextTripId++, start: "", end: "", days: 0 }] };
+    case "update":
+      return {
+        trips: state.trips.map((t) => {
+          if (t.id !== action.id)
+            return t;
+          const next = { ...t, [action.field]: action.value };
+          next.days = getDaysDiff(next.start, next.end);
+          return next;
+        })
+      };
+    case "remove":
+      return { trips: state.trips.filter((t) => t.id !== action.id) };
+    default:
+      return state;
+  }
+};
+const DAY_MS = 1e3 * 60 * 60 * 24;
+const dayNumber = (iso) => {
+  const t = Date.parse(iso);
+  return isNaN(t) ? null : Math.floor(t / DAY_MS);
+};
+const firstDay = (year) => Date.UTC(year, 0, 1) / DAY_MS;
+const countPresence = (taxYear, years) => {
+  const year = Number(taxYear);
+  if (!Number.isInteger(year))
+    return { days: [0, 0, 0], present: new Uint8Array(0) };
+  const bounds = [year - 2, year - 1, year, year + 1].map(firstDay);
+  const present = new Uint8Array(bounds[3] - bounds[0]);
+  for (const { trips } of years) {
+    for (const trip of trips) {
+      const s = dayNumber(trip.start);
+      const e = dayNumber(trip.end);
+      if (s === null || e === null)
+        continue;
+      const lo = Math.max(Math.min(s, e), bounds[0]);
+      const hi = Math.min(Math.max(s, e), bounds[3] - 1);
+      if (lo <= hi)
+        present.fill(1, lo - bounds[0], hi - bounds[0] + 1);
+    }
+  }
+  const count = (k) => present.subarray(bounds[k] - bounds[0], bounds[k + 1] - bounds[0]).reduce((a, b) => a + b, 0);
+  return { days: [count(2), count(1), count(0)], present: present.subarray(bounds[2] - bounds[0]) };
+};
+const evaluateResidency = (visaType, exemptYears, daysCY, daysCY1, daysCY2) => {
+  const exemptLimit = RULES.exemptYearLimits[visaType];
+  if (exemptLimit !== void 0 && exemptYears < exemptLimit) {
+    return {
+      status: RULES.status.NRA,
+      code: "NRA",
+      form: RULES.forms.NRA,
+      reason: RULES.exemptReasons[visaType],
+      isExempt: true
+    };
+  }
+  if (daysCY < RULES.minCurrentYearDays) {
+    return {
+      status: RULES.status.NRA,
+      code: "NRA",
+      form: RULES.forms.NRA,
+      reason: RULES.reasons.underMinimum,
+      score: daysCY,
+      isExempt: false
+    };
+  }
+  const [, div1, div2] = RULES.yearDivisors;
+  const weightedScore2 = daysCY + daysCY1 / div1 + daysCY2 / div2;
+  const passed = weightedScore2 >= RULES.threshold;
+  const code = passed ? "RA" : "NRA";
+  return {
+    status: RULES.status[code],
+    code,
+    form: RULES.forms[code],
+    reason: passed ? RULES.reasons.passed : RULES.reasons.failed,
+    score: weightedScore2.toFixed(1),
+    details: { daysCY, daysCY1, daysCY2 },
+    isExempt: false,
+    passed
+  };
+};
+const TripRow = memo(({ trip, dispatch }) => /* @__PURE__ */ React.createElement("div", { className: "flex items-end gap-3 animate-fade-in" }, /* @__PURE__ */ React.createElement("div", { className: "flex-1" }, /* @__PURE__ */ React.createElement("label", { className: "text-[10px] uppercase font-bold text-gray-400 mb-1 block" }, "Start Date"), /* @__PURE__ */ React.createElement(
+  "input",
+  {
+    type: "date",
+    className: "w-full text-sm p-2 bg-gray-50 border border-gray-200 rounded-sm focus:ring-2 focus:ring-indigo-500 outline-hidden",
+    value: trip.start,
+    onChange: (e) => dispatch({ type: "update", id: trip.id, field: "start", value: e.target.value })
+  }
+)), /* @__PURE__ */ React.createElement("div", { className: "flex-1" }, /* @__PURE__ */ React.createElement("label", { className: "text-[10px] uppercase font-bold text-gray-400 mb-1 block" }, "End Date"), /* @__PURE__ */ React.createElement(
+  "input",
+  {
+    type: "date",
+    className: "w-full text-sm p-2 bg-gray-50 border border-gray-200 rounded-sm focus:ring-2 focus:ring-indigo-500 outline-hidden",
+    value: trip.end,
+    onChange: (e) => dispatch({ type: "update", id: trip.id, field: "end", value: e.target.value })
+  }
+)), /* @__PURE__ */ React.createElement("div", { className: "w-16 text-center pb-2" }, /* @__PURE__ */ React.createElement("span", { className: "text-xs font-semibold text-gray-600" }, trip.days > 0 ? trip.days : "-", " d")), /* @__PURE__ */ React.createElement(
+  "button",
+  {
+    onClick: () => dispatch({ type: "remove", id: trip.id }),
+    className: "p-2.5 mb-[1px] text-gray-400 hover:text-red-500 hover:bg-red-50 rounded-sm transition-colors"
+  },
+  /* @__PURE__ */ React.createElement(TrashIcon, null)
+)));
+const YearTripManager = memo(({ label, yearLabel, year, days, dispatch, weight }) => {
+  const addTrip = useCallback(() => dispatch({ type: "add" }), [dispatch]);
+  return /* @__PURE__ */ React.createElement("div", { className: "bg-white rounded-xl border border-gray-200 overflow-hidden shadow-xs hover:shadow-md transition-shadow duration-300" }, /* @__PURE__ */ React.createElement("div", { className: "bg-gray-50 px-5 py-3 border-b border-gray-100 flex justify-between items-center" }, /* @__PURE__ */ React.createElement("div", null, /* @__PURE__ */ React.createElement("h3", { className: "text-sm font-bold text-gray-700 uppercase tracking-wide" }, label), /* @__PURE__ */ React.createElement("p", { className: "text-xs text-gray-500" }, yearLabel)), /* @__PURE__ */ React.createElement("div", { className: "flex items-center gap-2" }, /* @__PURE__ */ React.createElement("span", { className: "text-xs font-medium px-2 py-1 bg-gray-200 rounded-sm text-gray-600" }, "Weight: ", weight), /* @__PURE__ */ React.createElement("span", { className: "text-sm font-bold text-indigo-600 bg-indigo-50 px-3 py-1 rounded-full border border-indigo-100" }, days, " Days"))), /* @__PURE__ */ React.createElement("div", { className: "p-4 space-y-3" }, year.trips.length === 0 ? /* @__PURE__ */ React.createElement("div", { className: "text-center py-6 text-gray-400 text-sm border-2 border-dashed border-gray-100 rounded-lg" }, "No trips added for this year.") : year.trips.map((trip) => /* @__PURE__ */ React.createElement(TripRow, { key: trip.id, trip, dispatch })), /* @__PURE__ */ React.createElement(
+    "button",
+    {
+      onClick: addTrip,
+      className: "w-full py-2 flex items-center justify-center gap-2 text-sm font-medium text-indigo-600 bg-white border border-indigo-100 rounded-lg hover:bg-indigo-50 transition-colors"
+    },
+    /* @__PURE__ */ React.createElement(PlusIcon, null),
+    " Add Trip"
+  )));
+});
+const formatDate = (iso) => (/* @__PURE__ */ new Date(`${iso}T00:00:00`)).toLocaleDateString(void 0, { year: "numeric", month: "short", day: "numeric" });
+const weightedScore = (daysCY, daysCY1, daysCY2) => {
+  const [, div1, div2] = RULES.yearDivisors;
+  return daysCY + daysCY1 / div1 + daysCY2 / div2;
+};
+const requiredCyDays = (daysCY1, daysCY2) => {
+  const [, div1, div2] = RULES.yearDivisors;
+  const passes = (cy) => weightedScore(cy, daysCY1, daysCY2) >= RULES.threshold;
+  let need = Math.max(Math.ceil(RULES.threshold - (daysCY1 / div1 + daysCY2 / div2)), 0);
+  if (need > 0 && passes(need - 1))
+    need -= 1;
+  if (!passes(need))
+    need += 1;
+  return Math.max(need, RULES.minCurrentYearDays);
+};
+const remainingDays = (daysCY, daysCY1, daysCY2) => Math.max(requiredCyDays(daysCY1, daysCY2) - 1 - daysCY, 0);
+const isoDate = (day) => new Date(day * DAY_MS).toISOString().slice(0, 10);
+const lastSafeIndex = (present, from, budget) => {
+  let added = 0;
+  for (let i = from; i < present.length; i++) {
+    added += 1 - present[i];
+    if (added > budget)
+      return i - 1 < from ? -1 : i - 1;
+  }
+  return present.length - 1;
+};
+const newDays = (present, lo, hi) => {
+  let added = 0;
+  for (let i = Math.max(lo, 0); i <= Math.min(hi, present.length - 1); i++)
+    added += 1 - present[i];
+  return added;
+};
+const PlannerPanel = memo(({ taxYear, days, present, passed }) => {
+  const [arrival, setArrival] = useState("");
+  const [departure, setDeparture] = useState("");
+  const yearStart = `${taxYear}-01-01`;
+  const yearEnd = `${taxYear}-12-31`;
+  const inYear = (iso) => iso >= yearStart && iso <= yearEnd;
+  const budget = remainingDays(...days);
+  const origin = dayNumber(yearStart);
+  const last = arrival && inYear(arrival) && !passed ? lastSafeIndex(present, dayNumber(arrival) - origin, budget) : -1;
+  const latestDeparture = last >= 0 ? isoDate(origin + last) : null;
+  const [lo, hi] = [dayNumber(arrival), dayNumber(departure)].sort((a, b) => a - b);
+  const stayDays = arrival && departure && lo !== null && hi !== null && !passed ? newDays(present, lo - origin, hi - origin) : 0;
+  const safe = stayDays <= budget;
+  return /* @__PURE__ */ React.createElement("div", { className: "bg-white rounded-2xl shadow-xs border border-gray-100 p-6 mt-6 space-y-4" }, /* @__PURE__ */ React.createElement("div", { className: "flex justify-between items-end" }, /* @__PURE__ */ React.createElement("h4", { className: "text-xs font-bold text-gray-400 uppercase tracking-wider" }, "Days Left as Non-Resident"), /* @__PURE__ */ React.createElement("span", { className: "text-2xl font-bold text-gray-800" }, budget)), /* @__PURE__ */ React.createElement("div", { className: "grid grid-cols-2 gap-3" }, /* @__PURE__ */ React.createElement("div", null, /* @__PURE__ */ React.createElement("label", { className: "text-[10px] uppercase font-bold text-gray-400 mb-1 block" }, "Planned Arrival"), /* @__PURE__ */ React.createElement(
+    "input",
+    {
+      type: "date",
+      min: yearStart,
+      max: yearEnd,
+      className: "w-full text-sm p-2 bg-gray-50 border border-gray-200 rounded-sm focus:ring-2 focus:ring-indigo-500 outline-hidden",
+      value: arrival,
+      onChange: (e) => setArrival(e.target.value)
+    }
+  )), /* @__PURE__ */ React.createElement("div", null, /* @__PURE__ */ React.createElement("label", { className: "text-[10px] uppercase font-bold text-gray-400 mb-1 block" }, "Planned Departure"), /* @__PURE__ */ React.createElement(
+    "input",
+    {
+      type: "date",
+      className: "w-full text-sm p-2 bg-gray-50 border border-gray-200 rounded-sm focus:ring-2 focus:ring-indigo-500 outline-hidden",
+      value: departure,
+      onChange: (e) => setDeparture(e.target.value)
+    }
+  ))), arrival && !inYear(arrival) && /* @__PURE__ */ React.createElement("p", { className: "text-sm text-gray-700" }, "Choose an arrival in ", taxYear, " to plan this tax year."), arrival && inYear(arrival) && /* @__PURE__ */ React.createElement("p", { className: "text-sm text-gray-700" }, passed ? /* @__PURE__ */ React.createElement(React.Fragment, null, "You already meet the test for ", taxYear, ".") : !latestDeparture ? "No days left: any further stay makes you a Resident Alien." : latestDeparture === yearEnd ? /* @__PURE__ */ React.createElement(React.Fragment, null, "Any departure keeps NRA status for ", taxYear, ": days after Dec 31 count toward ", Number(taxYear) + 1, ".") : /* @__PURE__ */ React.createElement(React.Fragment, null, "Latest departure that keeps NRA status: ", /* @__PURE__ */ React.createElement("strong", null, formatDate(latestDeparture)))), stayDays > 0 && /* @__PURE__ */ React.createElement("p", { className: `text-sm font-medium ${safe ? "text-emerald-600" : "text-red-500"}` }, stayDays, " new days in ", taxYear, " ", safe ? "keep you a Non-Resident Alien." : "would make you a Resident Alien."));
+});
+const ROW_HEIGHT = 36;
+const ROSTER_HEIGHT = 560;
+const OVERSCAN_ROWS = 8;
+const CELL_LABELS = ["Exempt", "NRA", "RA", "NRA"];
+const CELL_STYLES = [
+  "bg-gray-100 text-gray-500",
+  "bg-emerald-50 text-emerald-600",
+  "bg-indigo-100 text-indigo-800",
+  "bg-emerald-50 text-emerald-700"
+];
+const RosterRow = memo(({ id, codes, scores, offset, years, top }) => /* @__PURE__ */ React.createElement("div", { className: "absolute left-0 right-0 flex items-center border-b border-gray-50", style: { top, height: ROW_HEIGHT } }, /* @__PURE__ */ React.createElement("div", { className: "w-40 shrink-0 px-3 truncate text-sm font-medium text-gray-700", title: id }, id), years.map((year, j) => {
+  const code = codes.charCodeAt(j) - 48;
+  const score = scores[offset + j];
+  return /* @__PURE__ */ React.createElement("div", { key: year, className: "flex-1 min-w-0 px-0.5" }, /* @__PURE__ */ React.createElement(
+    "span",
+    {
+      title: score < 0 ? `${year}: exempt individual` : `${year}: score ${(score / 10).toFixed(1)}`,
+      className: `block text-center text-xs font-bold rounded-sm py-1 ${CELL_STYLES[code]}`
+    },
+    CELL_LABELS[code]
+  ));
+})));
+const Roster = ({ data }) => {
+  const { years, ids, codes, scores } = data;
+  const nYears = years.length;
+  const [query, setQuery] = useState("");
+  const [scrollTop, setScrollTop] = useState(0);
+  const scroller = useRef(null);
+  const rows = useMemo(() => {
+    const q = query.trim().toLowerCase();
+    const out = [];
+    for (let i = 0; i < ids.length; i++) {
+      if (!q || ids[i].toLowerCase().includes(q))
+        out.push(i);
+    }
+    return out;
+  }, [ids, query]);
+  const residents = useMemo(() => {
+    const counts = new Array(nYears).fill(0);
+    for (let k = 0; k < codes.length; k++) {
+      if (codes.charCodeAt(k) === 50)
+        counts[k % nYears]++;
+    }
+    return counts;
+  }, [codes, nYears]);
+  useEffect(() => {
+    if (scroller.current)
+      scroller.current.scrollTop = 0;
+    setScrollTop(0);
+  }, [query, data]);
+  const first = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN_ROWS);
+  const last = Math.min(rows.length, Math.ceil((scrollTop + ROSTER_HEIGHT) / ROW_HEIGHT) + OVERSCAN_ROWS);
+  const visible = [];
+  for (let r = first; r < last; r++) {
+    const i = rows[r];
+    visible.push(
+      /* @__PURE__ */ React.createElement(
+        RosterRow,
+        {
+          key: i,
+          id: ids[i],
+          codes: codes.substr(i * nYears, nYears),
+          scores,
+          offset: i * nYears,
+          years,
+          top: r * ROW_HEIGHT
+        }
+      )
+    );
+  }
+  return /* @__PURE__ */ React.createElement("div", { className: "bg-white p-6 rounded-2xl shadow-xs border border-gray-100 font-sans text-gray-800" }, /* @__PURE__ */ React.createElement("div", { className: "flex items-center justify-between gap-4 mb-4" }, /* @__PURE__ */ React.createElement("h2", { className: "text-lg font-bold" }, "Roster: ", ids.length.toLocaleString(), " people, ", years[0], "\u2013", years[nYears - 1]), /* @__PURE__ */ React.createElement(
+    "input",
+    {
+      type: "search",
+      placeholder: "Filter by person",
+      value: query,
+      onChange: (e) => setQuery(e.target.value),
+      className: "p-2 bg-gray-50 border border-gray-200 rounded-lg text-sm focus:ring-2 focus:ring-blue-500 outline-hidden transition"
+    }
+  )), /* @__PURE__ */ React.createElement("div", { className: "flex items-end border-b border-gray-200 pb-2 text-xs font-bold text-gray-500 uppercase" }, /* @__PURE__ */ React.createElement("div", { className: "w-40 shrink-0 px-3" }, rows.length.toLocaleString(), " shown"), years.map((year, j) => /* @__PURE__ */ React.createElement("div", { key: year, className: "flex-1 min-w-0 px-0.5 text-center" }, year, /* @__PURE__ */ React.createElement("div", { className: "font-medium normal-case text-indigo-600", title: "Resident Aliens" }, residents[j], " RA")))), /* @__PURE__ */ React.createElement(
+    "div",
+    {
+      ref: scroller,
+      className: "overflow-y-auto",
+      style: { height: ROSTER_HEIGHT },
+      onScroll: (e) => setScrollTop(e.currentTarget.scrollTop)
+    },
+    /* @__PURE__ */ React.createElement("div", { className: "relative", style: { height: rows.length * ROW_HEIGHT } }, visible)
+  ));
+};
+const SYNC_DELAY_MS = 300;
+const App = ({ startDate, history }) => {
+  performance.mark("render-start");
+  const [visaType, setVisaType] = useState("H1B");
+  const [exemptYears, setExemptYears] = useState(0);
+  const [taxYear, setTaxYear] = useState((/* @__PURE__ */ new Date()).getFullYear());
+  const [yearCY, dispatchCY] = useReducer(yearReducer, emptyYear);
+  const [yearCY1, dispatchCY1] = useReducer(yearReducer, emptyYear);
+  const [yearCY2, dispatchCY2] = useReducer(yearReducer, emptyYear);
+  const [windowYear, setWindowYear] = useState(null);
+  useEffect(() => {
+    if (!history || history.taxYear === windowYear)
+      return;
+    if (windowYear === null) {
+      setVisaType(history.visaType);
+      setExemptYears(history.exemptYears);
+      setTaxYear(history.taxYear);
+    }
+    [dispatchCY, dispatchCY1, dispatchCY2].forEach((dispatch, i) => dispatch({ type: "load", trips: history.trips[i] }));
+    setWindowYear(history.taxYear);
+  }, [history]);
+  const presence = useMemo(
+    () => countPresence(taxYear, [yearCY, yearCY1, yearCY2]),
+    [taxYear, yearCY, yearCY1, yearCY2]
+  );
+  const [daysCY, daysCY1, daysCY2] = presence.days;
+  const result = useMemo(() => {
+    performance.mark("evaluate-start");
+    const evaluated = evaluateResidency(visaType, exemptYears, daysCY, daysCY1, daysCY2);
+    measureSince("evaluate", "evaluate-start");
+    return evaluated;
+  }, [visaType, exemptYears, daysCY, daysCY1, daysCY2]);
+  useLayoutEffect(() => measureSince("render", "render-start"));
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      Streamlit.setComponentValue({
+        visaType,
+        exemptYears,
+        taxYear,
+        window: windowYear,
+        trips: [yearCY, yearCY1, yearCY2].map((year) => year.trips.map((t) => [t.start, t.end])),
+        seq: ++reportSeq,
+        timings: pendingTimings.splice(0)
+      });
+    }, SYNC_DELAY_MS);
+    return () => clearTimeout(timer);
+  }, [visaType, exemptYears, taxYear, windowYear, yearCY, yearCY1, yearCY2]);
+  return /* @__PURE__ */ React.createElement("div", { className: "grid grid-cols-1 lg:grid-cols-12 gap-8 font-sans text-gray-800" }, /* @__PURE__ */ React.createElement("div", { className: "lg:col-span-7 space-y-6" }, /* @__PURE__ */ React.createElement("div", { className: "bg-white p-6 rounded-2xl shadow-xs border border-gray-100" }, /* @__PURE__ */ React.createElement("h2", { className: "text-lg font-bold mb-4 flex items-center gap-2" }, /* @__PURE__ */ React.createElement("span", { className: "w-8 h-8 rounded-full bg-blue-100 flex items-center justify-center text-blue-600" }, /* @__PURE__ */ React.createElement(CalendarIcon, null)), "Profile & Visa"), /* @__PURE__ */ React.createElement("div", { className: "grid grid-cols-1 md:grid-cols-2 gap-4" }, /* @__PURE__ */ React.createElement("div", null, /* @__PURE__ */ React.createElement("label", { className: "block text-xs font-bold text-gray-500 uppercase mb-1" }, "Visa Type"), /* @__PURE__ */ React.createElement(
+    "select",
+    {
+      value: visaType,
+      onChange: (e) => setVisaType(e.target.value),
+      className: "w-full p-3 bg-gray-50 border border-gray-200 rounded-lg font-medium focus:ring-2 focus:ring-blue-500 outline-hidden transition"
+    },
+    /* @__PURE__ */ React.createElement("option", { value: "H1B" }, "H1B (Specialty Occupation)"),
+    /* @__PURE__ */ React.createElement("option", { value: "L1" }, "L1 (Intracompany)"),
+    /* @__PURE__ */ React.createElement("option", { value: "F1" }, "F1 (Student)"),
+    /* @__PURE__ */ React.createElement("option", { value: "J1" }, "J1 (Teacher/Trainee)")
+  )), /* @__PURE__ */ React.createElement("div", null, /* @__PURE__ */ React.createElement("label", { className: "block text-xs font-bold text-gray-500 uppercase mb-1" }, "Tax Year"), /* @__PURE__ */ React.createElement(
+    "input",
+    {
+      type: "number",
+      value: taxYear,
+      onChange: (e) => setTaxYear(e.target.value),
+      className: "w-full p-3 bg-gray-50 border border-gray-200 rounded-lg font-medium focus:ring-2 focus:ring-blue-500 outline-hidden transition"
+    }
+  )), (visaType === "F1" || visaType === "J1") && /* @__PURE__ */ React.createElement("div", { className: "animate-fade-in" }, /* @__PURE__ */ React.createElement("label", { className: "block text-xs font-bold text-gray-500 uppercase mb-1" }, "Prior Exempt Years"), /* @__PURE__ */ React.createElement(
+    "input",
+    {
+      type: "number",
+      min: "0",
+      value: exemptYears,
+      onChange: (e) => setExemptYears(e.target.value),
+      className: "w-full p-3 bg-gray-50 border border-gray-200 rounded-lg font-medium focus:ring-2 focus:ring-blue-500 outline-hidden transition"
+    }
+  ), /* @__PURE__ */ React.createElement("p", { className: "text-[10px] text-gray-400 mt-1" }, "Calendar years already spent on F/J status.")))), result && result.isExempt ? /* @__PURE__ */ React.createElement("div", { className: "bg-blue-50 border border-blue-100 rounded-2xl p-8 text-center" }, /* @__PURE__ */ React.createElement("p", { className: "text-blue-800 font-medium" }, "You are currently an Exempt Individual."), /* @__PURE__ */ React.createElement("p", { className: "text-blue-600 text-sm mt-1" }, "You do not need to count your days for the Substantial Presence Test.")) : /* @__PURE__ */ React.createElement("div", { className: "space-y-4 animate-fade-in" }, /* @__PURE__ */ React.createElement("div", { className: "flex items-center justify-between" }, /* @__PURE__ */ React.createElement("h2", { className: "text-lg font-bold text-gray-800" }, "Travel History"), /* @__PURE__ */ React.createElement("p", { className: "text-xs text-gray-400" }, "Add all US visits for calculation")), /* @__PURE__ */ React.createElement(
+    YearTripManager,
+    {
+      label: "Current Year",
+      yearLabel: "(Tax Year)",
+      weight: "100%",
+      year: yearCY,
+      days: daysCY,
+      dispatch: dispatchCY
+    }
+  ), /* @__PURE__ */ React.createElement("div", { className: "grid grid-cols-1 md:grid-cols-2 gap-4" }, /* @__PURE__ */ React.createElement(
+    YearTripManager,
+    {
+      label: "Last Year",
+      yearLabel: "(CY - 1)",
+      weight: "~33%",
+      year: yearCY1,
+      days: daysCY1,
+      dispatch: dispatchCY1
+    }
+  ), /* @__PURE__ */ React.createElement(
+    YearTripManager,
+    {
+      label: "Year Before",
+      yearLabel: "(CY - 2)",
+      weight: "~17%",
+      year: yearCY2,
+      days: daysCY2,
+      dispatch: dispatchCY2
+    }
+  )))), /* @__PURE__ */ React.createElement("div", { className: "lg:col-span-5" }, /* @__PURE__ */ React.createElement("div", { className: "sticky top-4" }, result && /* @__PURE__ */ React.createElement("div", { className: `rounded-3xl shadow-lg border overflow-hidden transition-all duration-500 ${result.code === "RA" ? "bg-white border-blue-100" : "bg-white border-green-100"}` }, /* @__PURE__ */ React.createElement("div", { className: `p-8 text-center ${result.code === "RA" ? "bg-linear-to-br from-blue-600 to-indigo-700 text-white" : "bg-linear-to-br from-emerald-500 to-teal-600 text-white"}` }, /* @__PURE__ */ React.createElement("div", { className: "bg-white/20 w-16 h-16 rounded-full flex items-center justify-center mx-auto mb-4 backdrop-blur-xs" }, result.code === "RA" ? /* @__PURE__ */ React.createElement(AlertIcon, { className: "text-white" }) : /* @__PURE__ */ React.createElement(CheckIcon, { className: "text-white" })), /* @__PURE__ */ React.createElement("h3", { className: "text-3xl font-bold mb-1" }, result.status), /* @__PURE__ */ React.createElement("p", { className: "opacity-90 font-medium text-lg" }, result.form)), /* @__PURE__ */ React.createElement("div", { className: "p-6 space-y-6" }, /* @__PURE__ */ React.createElement("div", null, /* @__PURE__ */ React.createElement("h4", { className: "text-xs font-bold text-gray-400 uppercase tracking-wider mb-2" }, "Reasoning"), /* @__PURE__ */ React.createElement("p", { className: "text-sm text-gray-700 leading-relaxed font-medium bg-gray-50 p-3 rounded-lg border border-gray-100" }, result.reason)), !result.isExempt && /* @__PURE__ */ React.createElement("div", null, /* @__PURE__ */ React.createElement("div", { className: "flex justify-between items-end mb-2" }, /* @__PURE__ */ React.createElement("h4", { className: "text-xs font-bold text-gray-400 uppercase tracking-wider" }, "SPT Score"), /* @__PURE__ */ React.createElement("span", { className: "text-2xl font-bold text-gray-800" }, result.score)), /* @__PURE__ */ React.createElement("div", { className: "relative h-4 bg-gray-100 rounded-full overflow-hidden" }, /* @__PURE__ */ React.createElement(
+    "div",
+    {
+      className: `absolute top-0 left-0 h-full transition-all duration-1000 ${result.passed ? "bg-blue-600" : "bg-emerald-500"}`,
+      style: { width: `${Math.min(result.score / 200 * 100, 100)}%` }
+    }
+  ), /* @__PURE__ */ React.createElement("div", { className: "absolute top-0 bottom-0 w-0.5 bg-red-400 z-10", style: { left: `${RULES.threshold / 200 * 100}%` } })), /* @__PURE__ */ React.createElement("div", { className: "flex justify-between text-[10px] text-gray-400 mt-1 font-medium" }, /* @__PURE__ */ React.createElement("span", null, "0 Days"), /* @__PURE__ */ React.createElement("span", { className: "text-red-500" }, "Threshold: ", RULES.threshold, " Days"), /* @__PURE__ */ React.createElement("span", null, "200+ Days")), startDate && String(startDate.taxYear) === String(taxYear) && /* @__PURE__ */ React.createElement("div", { className: "flex justify-between items-center mt-4 text-sm" }, /* @__PURE__ */ React.createElement("span", { className: "text-xs font-bold text-gray-400 uppercase tracking-wider" }, startDate.reached ? "Residency Start" : "Projected Start"), /* @__PURE__ */ React.createElement("span", { className: "font-semibold text-gray-800" }, startDate.reached ? formatDate(startDate.reached) : startDate.projected ? formatDate(startDate.projected) : `Not reached in ${taxYear}`))), /* @__PURE__ */ React.createElement("div", { className: "bg-amber-50 border border-amber-100 p-3 rounded-lg flex gap-3 items-start" }, /* @__PURE__ */ React.createElement("div", { className: "mt-0.5" }, /* @__PURE__ */ React.createElement(AlertIcon, null)), /* @__PURE__ */ React.createElement("p", { className: "text-xs text-amber-800 leading-relaxed" }, /* @__PURE__ */ React.createElement("strong", null, "Disclaimer:"), " This tool is for estimation only. Tax laws are complex. Consult a CPA for official filing.")))), !result.isExempt && /* @__PURE__ */ React.createElement(PlannerPanel, { taxYear, days: presence.days, present: presence.present, passed: Boolean(result.passed) }))));
+};
+const root = ReactDOM.createRoot(document.getElementById("root"));
+Streamlit.onRender((args) => {
+  RULES = args.rules;
+  root.render(args.roster ? /* @__PURE__ */ React.createElement(Roster, { data: args.roster }) : /* @__PURE__ */ React.createElement(App, { startDate: args.start_date, history: args.history }));
+});
+Streamlit.ready();
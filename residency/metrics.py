@@ -0,0 +1,131 @@
+"""Stage timings for the page, the service and the browser.
+
+Every timing is recorded three ways:
+
+- a ``residency_stage_seconds`` histogram, labelled by ``side`` (server or
+  client) and ``stage``, rendered in the Prometheus text format by
+  :func:`render` (the service serves it at ``GET /metrics``);
+- a JSON line on the ``residency.metrics`` logger at DEBUG level;
+- a bounded list of recent timings (:func:`recent`) for the page's debug
+  panel.
+
+Server code wraps a stage in ``with metrics.timer("stage"):``. Browser
+timings arrive as ``(stage, milliseconds)`` pairs through
+:func:`record_client`.
+"""
+
+import bisect
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterable, List, NamedTuple
+
+SERVER = "server"
+CLIENT = "client"
+NAME = "residency_stage_seconds"
+BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+RECENT_LIMIT = 200
+# Stages the page reports; anything else it sends is dropped.
+CLIENT_STAGES = ("evaluate", "render")
+
+_log = logging.getLogger("residency.metrics")
+
+
+class Timing(NamedTuple):
+    at: float  # Unix time the stage finished
+    side: str
+    stage: str
+    seconds: float
+
+
+class _Histogram:
+    __slots__ = ("counts", "total")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # the last slot is +Inf
+        self.total = 0.0
+
+
+_lock = threading.Lock()
+_histograms = {}
+_recent = deque(maxlen=RECENT_LIMIT)
+
+
+def observe(stage: str, seconds: float, side: str = SERVER) -> None:
+    """Record one duration."""
+    with _lock:
+        histogram = _histograms.get((side, stage))
+        if histogram is None:
+            histogram = _histograms[side, stage] = _Histogram()
+        histogram.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        histogram.total += seconds
+        _recent.append(Timing(time.time(), side, stage, seconds))
+    if _log.isEnabledFor(logging.DEBUG):
+        _log.debug(json.dumps({"side": side, "stage": stage, "ms": round(seconds * 1000, 3)}))
+
+
+@contextmanager
+def timer(stage: str):
+    """Time the ``with`` block as a server ``stage``, whether or not it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+def record_client(timings: Iterable) -> int:
+    """Record browser ``[stage, milliseconds]`` pairs.
+
+    Entries that are malformed or name an unknown stage are skipped.
+    """
+    recorded = 0
+    for entry in timings:
+        try:
+            stage, ms = entry
+            seconds = float(ms) / 1000
+        except (TypeError, ValueError):
+            continue
+        if stage in CLIENT_STAGES and seconds >= 0:
+            observe(stage, seconds, CLIENT)
+            recorded += 1
+    return recorded
+
+
+def recent(limit: int = RECENT_LIMIT) -> List[Timing]:
+    """The last ``limit`` timings, newest first."""
+    with _lock:
+        items = list(_recent)
+    return items[::-1][:limit]
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+        _recent.clear()
+
+
+def render() -> str:
+    """All histograms in the Prometheus text exposition format."""
+    with _lock:
+        snapshot = {key: (list(h.counts), h.total) for key, h in sorted(_histograms.items())}
+    lines = [
+        f"# HELP {NAME} Time spent per calculator stage.",
+        f"# TYPE {NAME} histogram",
+    ]
+    for (side, stage), (counts, total) in snapshot.items():
+        labels = f'side="{side}",stage="{_escape(stage)}"'
+        cumulative = 0
+        for bound, count in zip((*BUCKETS, "+Inf"), counts):
+            cumulative += count
+            lines.append(f'{NAME}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{NAME}_sum{{{labels}}} {total!r}")
+        lines.append(f"{NAME}_count{{{labels}}} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
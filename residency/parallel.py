@@ -0,0 +1,159 @@
+"""Multi-process SPT evaluation over memory-mapped trip columns.
+
+People are sharded into contiguous ranges of ``chunk_people`` and handed to
+a :class:`concurrent.futures.ProcessPoolExecutor`. Trip and profile columns
+are not pickled per task. They are written once to memory-mapped files,
+which live on ``/dev/shm`` when available so they stay in RAM, and workers
+map them read-only. Each worker writes its shard's results into
+memory-mapped output arrays at the shard's own offset. The combined result
+is therefore in person order and identical to the serial
+:func:`residency.presence.evaluate_batch`, however the shards are scheduled.
+"""
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from residency import presence, vectorized
+
+DEFAULT_CHUNK_PEOPLE = 65_536
+
+_INPUTS = ("person", "start", "end", "visa", "exempt_years")
+_SHM_DIR = "/dev/shm"
+
+
+def _scratch_dir() -> Optional[str]:
+    return _SHM_DIR if os.path.isdir(_SHM_DIR) and os.access(_SHM_DIR, os.W_OK) else None
+
+
+def _store(path: Path, array: np.ndarray) -> str:
+    """Copy ``array`` into a memory-mapped ``.npy`` file at ``path``."""
+    mapped = np.lib.format.open_memmap(path, mode="w+", dtype=array.dtype, shape=array.shape)
+    mapped[...] = array
+    mapped.flush()
+    return str(path)
+
+
+def _allocate(path: Path, dtype, shape) -> str:
+    np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape).flush()
+    return str(path)
+
+
+def _evaluate_shard(inputs: dict, outputs: dict, people: tuple, trips: tuple, tax_year: int) -> None:
+    """Worker task: evaluate people ``[p0, p1)`` whose trips are rows ``[t0, t1)``."""
+    p0, p1 = people
+    t0, t1 = trips
+    col = {name: np.load(path, mmap_mode="r") for name, path in inputs.items()}
+    result = presence.evaluate_batch(
+        col["person"][t0:t1] - p0,
+        col["start"][t0:t1],
+        col["end"][t0:t1],
+        col["visa"][p0:p1],
+        col["exempt_years"][p0:p1],
+        tax_year,
+    )
+    for name, path in outputs.items():
+        out = np.load(path, mmap_mode="r+")
+        out[p0:p1] = getattr(result, name)
+        out.flush()
+
+
+class ParallelEvaluator:
+    """A reusable worker pool for :meth:`evaluate`.
+
+    Use as a context manager, or call :meth:`close` when done.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_people: int = DEFAULT_CHUNK_PEOPLE):
+        if chunk_people < 1:
+            raise ValueError("chunk_people must be positive")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_people = chunk_people
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+    def evaluate(
+        self,
+        person: np.ndarray,
+        start: np.ndarray,
+        end: np.ndarray,
+        visa: np.ndarray,
+        exempt_years: np.ndarray,
+        tax_year: int,
+    ) -> vectorized.BatchResult:
+        """Same inputs and result as :func:`residency.presence.evaluate_batch`."""
+        person = np.asarray(person, dtype=np.int64)
+        start = np.asarray(start, dtype="datetime64[D]")
+        end = np.asarray(end, dtype="datetime64[D]")
+        visa = np.asarray(visa, dtype=np.int64)
+        exempt_years = np.asarray(exempt_years, dtype=np.int64)
+        n_people = len(visa)
+        if n_people == 0:
+            return presence.evaluate_batch(person, start, end, visa, exempt_years, tax_year)
+
+        # Shards are contiguous row ranges, so trips must be ordered by person.
+        if len(person) and (np.diff(person) < 0).any():
+            order = np.argsort(person, kind="stable")
+            person, start, end = person[order], start[order], end[order]
+        bounds = np.arange(0, n_people + self.chunk_people, self.chunk_people).clip(max=n_people)
+        bounds = np.unique(bounds)
+        trip_bounds = np.searchsorted(person, bounds)
+
+        with tempfile.TemporaryDirectory(prefix="residency-", dir=_scratch_dir()) as tmp:
+            tmp = Path(tmp)
+            arrays = dict(zip(_INPUTS, (person, start, end, visa, exempt_years)))
+            inputs = {name: _store(tmp / f"{name}.npy", a) for name, a in arrays.items()}
+            outputs = {
+                name: _allocate(tmp / f"{name}.npy", dtype, shape)
+                for name, dtype, shape in (
+                    ("days", np.int64, (n_people, 3)),
+                    ("score", np.float64, (n_people,)),
+                    ("resident", np.bool_, (n_people,)),
+                    ("exempt", np.bool_, (n_people,)),
+                    ("reason", np.uint8, (n_people,)),
+                )
+            }
+            futures = [
+                self._pool.submit(
+                    _evaluate_shard,
+                    inputs,
+                    outputs,
+                    (int(bounds[i]), int(bounds[i + 1])),
+                    (int(trip_bounds[i]), int(trip_bounds[i + 1])),
+                    tax_year,
+                )
+                for i in range(len(bounds) - 1)
+            ]
+            for future in futures:
+                future.result()
+            return vectorized.BatchResult(
+                **{name: np.load(path) for name, path in outputs.items()}
+            )
+
+
+def evaluate(
+    person: np.ndarray,
+    start: np.ndarray,
+    end: np.ndarray,
+    visa: np.ndarray,
+    exempt_years: np.ndarray,
+    tax_year: int,
+    *,
+    workers: Optional[int] = None,
+    chunk_people: int = DEFAULT_CHUNK_PEOPLE,
+) -> vectorized.BatchResult:
+    """One-shot :meth:`ParallelEvaluator.evaluate` with a temporary pool."""
+    with ParallelEvaluator(workers, chunk_people) as evaluator:
+        return evaluator.evaluate(person, start, end, visa, exempt_years, tax_year)
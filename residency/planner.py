@@ -0,0 +1,84 @@
+"""What-if planning: how many more US days keep someone a Non-Resident Alien.
+
+This inverts the SPT. From the three year totals,
+:func:`residency.solver.required_cy_days` gives the smallest current-year
+count that would make a Resident Alien. Every day short of that is still
+available. The budget takes constant time from the totals and the latest
+departure one pass over the tax year's days, so the page can re-evaluate
+them while a date range is being dragged. The page's planner panel mirrors
+these functions.
+
+A planned stay in the US runs from an *arrival* to a *departure* date, both
+days present. Days are counted as everywhere else, once each and in the
+year they fall in, so days of the stay already covered by a recorded trip
+cost nothing. Only days in the tax year count toward its test, so the
+latest safe departure is never later than Dec 31.
+"""
+
+from calendar import isleap
+from datetime import date, timedelta
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from residency import engine, presence, solver
+
+
+class Plan(NamedTuple):
+    """``remaining_days`` is ``None`` for exempt individuals, who have no limit."""
+
+    remaining_days: Optional[int]
+    latest_departure: Optional[date]
+
+
+def remaining_days(days_cy, days_cy1, days_cy2):
+    """Further current-year days that still leave the person a Non-Resident Alien.
+
+    0 when the test is already met. Accepts scalars or NumPy arrays.
+    """
+    budget = solver.required_cy_days(np.asarray(days_cy1), np.asarray(days_cy2)) - 1 - np.asarray(days_cy)
+    budget = np.maximum(budget, 0)
+    return int(budget) if budget.ndim == 0 else budget
+
+
+def latest_safe_departure(
+    arrive: date, budget: int, tax_year: int, present: Optional[bytes] = None
+) -> Optional[date]:
+    """Last departure date for a stay from ``arrive`` that adds at most ``budget`` days to ``tax_year``.
+
+    ``present`` is the year's bitmap of days already present
+    (:meth:`residency.presence.PresenceCalendar.bitmap`); those days are
+    not added again. Both travel days count. ``None`` if not even the
+    arrival day fits; Dec 31 if the budget lasts the rest of the year, as
+    later days count toward the next tax year. Raises ``ValueError`` if
+    ``arrive`` is not in ``tax_year``.
+    """
+    if arrive.year != tax_year:
+        raise ValueError(f"arrival {arrive} is not in the tax year {tax_year}")
+    year_len = 366 if isleap(tax_year) else 365
+    first = (arrive - date(tax_year, 1, 1)).days
+    if present is None:
+        added = np.ones(year_len - first, dtype=np.int64)
+    else:
+        bits = np.unpackbits(np.frombuffer(present, dtype=np.uint8), count=year_len, bitorder="little")
+        added = 1 - bits[first:].astype(np.int64)
+    # Days from ``arrive`` whose running count of added days stays within budget.
+    fits = int(np.searchsorted(np.cumsum(added), max(budget, 0), side="right"))
+    return None if fits == 0 else arrive + timedelta(days=fits - 1)
+
+
+def plan(
+    profile: engine.Profile, trips: engine.YearTrips, tax_year: int, arrive: Optional[date] = None
+) -> Plan:
+    """Remaining budget and, for a stay from ``arrive``, the latest safe departure.
+
+    There is no safe departure for someone who already meets the test.
+    """
+    if engine.exempt_reason(profile) is not None:
+        return Plan(None, None)
+    calendar = presence.PresenceCalendar(t for year in trips for t in year)
+    days = calendar.year_days(tax_year)
+    budget = remaining_days(*days)
+    if arrive is None or engine.classify(profile, *days).passed:
+        return Plan(budget, None)
+    return Plan(budget, latest_safe_departure(arrive, budget, tax_year, calendar.bitmap(tax_year)))
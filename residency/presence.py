@@ -0,0 +1,208 @@
+"""Day-bitmap presence: one bit per calendar day, per person, per year.
+
+Summing trip lengths double-counts overlapping trips and credits a trip that
+crosses Dec 31 entirely to one year. Here trips are OR-ed into per-year
+bitmaps instead, so every day is counted at most once and in the year it
+falls in. Day counts come from a popcount of the bitmap, which costs
+O(days / 8) however many trips went into it.
+
+Bit ``i`` of a year's bitmap (little-endian within each byte, as
+``numpy.packbits(..., bitorder="little")``) is day ``i`` of that year,
+Jan 1 being day 0. Each year occupies ``YEAR_BYTES`` bytes.
+"""
+
+from datetime import date
+from typing import Iterable, Optional
+
+import numpy as np
+
+from residency import engine, vectorized
+
+YEAR_BYTES = 46  # 366 days rounded up to whole bytes
+_YEARS = len(engine.YEAR_DIVISORS)
+# People x days per chunk of the dense day grid in bulk counting (4,096
+# people over a three-year window).
+_CHUNK_CELLS = 4_096 * 1_097
+
+
+class PresenceCalendar:
+    """Days of US presence for one person, stored as packed per-year bitmaps."""
+
+    __slots__ = ("_years",)
+
+    def __init__(self, trips: Iterable[engine.Trip] = ()):
+        self._years = {}
+        for trip in trips:
+            self.add(trip.start, trip.end)
+
+    def add(self, start: Optional[date], end: Optional[date]) -> None:
+        """Mark every day from ``start`` to ``end`` inclusive as present.
+
+        Blank dates are ignored and reversed dates are accepted, like
+        :func:`residency.engine.trip_days`.
+        """
+        if start is None or end is None:
+            return
+        if end < start:
+            start, end = end, start
+        for year in range(start.year, end.year + 1):
+            jan1 = date(year, 1, 1)
+            lo = (max(start, jan1) - jan1).days
+            hi = (min(end, date(year, 12, 31)) - jan1).days
+            _set_bits(self._bitmap(year), lo, hi)
+
+    def days_in(self, year: int) -> int:
+        """Number of distinct days present in ``year``."""
+        bitmap = self._years.get(year)
+        if bitmap is None:
+            return 0
+        return int.from_bytes(bitmap, "little").bit_count()
+
+    def year_days(self, tax_year: int) -> engine.YearDays:
+        """Distinct days present in ``tax_year`` and the two years before it."""
+        return engine.YearDays(*(self.days_in(tax_year - k) for k in range(_YEARS)))
+
+    def bitmap(self, year: int) -> bytes:
+        """Packed bitmap for ``year``; all zeros if nothing was recorded."""
+        return bytes(self._years.get(year, bytes(YEAR_BYTES)))
+
+    def __eq__(self, other):
+        if not isinstance(other, PresenceCalendar):
+            return NotImplemented
+        years = set(self._years) | set(other._years)
+        return all(self.bitmap(y) == other.bitmap(y) for y in years)
+
+    def _bitmap(self, year: int) -> bytearray:
+        bitmap = self._years.get(year)
+        if bitmap is None:
+            bitmap = self._years[year] = bytearray(YEAR_BYTES)
+        return bitmap
+
+
+def _set_bits(bitmap: bytearray, lo: int, hi: int) -> None:
+    """Set bits ``lo`` to ``hi`` inclusive."""
+    lo_byte, hi_byte = lo >> 3, hi >> 3
+    lo_mask = (0xFF << (lo & 7)) & 0xFF
+    hi_mask = 0xFF >> (7 - (hi & 7))
+    if lo_byte == hi_byte:
+        bitmap[lo_byte] |= lo_mask & hi_mask
+        return
+    bitmap[lo_byte] |= lo_mask
+    bitmap[lo_byte + 1:hi_byte] = b"\xff" * (hi_byte - lo_byte - 1)
+    bitmap[hi_byte] |= hi_mask
+
+
+def evaluate(profile: engine.Profile, trips: Iterable[engine.Trip], tax_year: int) -> engine.Result:
+    """Residency result for one person from dated trips, counting each day once.
+
+    :func:`residency.engine.evaluate` for trips not grouped into year boxes.
+    """
+    if engine.exempt_reason(profile) is not None:
+        return engine.classify(profile, 0, 0, 0)
+    return engine.classify(profile, *PresenceCalendar(trips).year_days(tax_year))
+
+
+# --- Bulk (NumPy) form ---
+
+def _window(tax_year: int):
+    """First day of CY-2 and the day index where each of CY-2, CY-1, CY begins."""
+    first = np.datetime64(f"{tax_year - _YEARS + 1}-01-01", "D")
+    bounds = [
+        int((np.datetime64(f"{year}-01-01", "D") - first).astype(np.int64))
+        for year in range(tax_year - _YEARS + 1, tax_year + 2)
+    ]
+    return first, bounds
+
+
+def _present(person, start, end, n_people: int, first: np.datetime64, span: int):
+    """Yield ``(p0, p1, present)`` for consecutive chunks of people.
+
+    ``present`` is a ``(p1 - p0, span)`` boolean grid: day ``d`` of person
+    ``p0 + i`` is ``first + d``. Trips outside the span are clipped away.
+    """
+    person = np.asarray(person, dtype=np.int64)
+    start = np.asarray(start, dtype="datetime64[D]")
+    end = np.asarray(end, dtype="datetime64[D]")
+
+    valid = ~(np.isnat(start) | np.isnat(end))
+    lo = (np.minimum(start, end)[valid] - first).astype(np.int64)
+    hi = (np.maximum(start, end)[valid] - first).astype(np.int64)
+    who = person[valid]
+    inside = (hi >= 0) & (lo < span)
+    lo, hi, who = np.clip(lo[inside], 0, span - 1), np.clip(hi[inside], 0, span - 1), who[inside]
+
+    order = np.argsort(who, kind="stable")
+    lo, hi, who = lo[order], hi[order], who[order]
+    chunk = max(_CHUNK_CELLS // (span + 1), 1)
+    for chunk_start in range(0, n_people, chunk):
+        chunk_end = min(chunk_start + chunk, n_people)
+        a, b = np.searchsorted(who, [chunk_start, chunk_end])
+        rows = who[a:b] - chunk_start
+        # Difference array: +1 where a trip starts, -1 the day after it ends.
+        size = (chunk_end - chunk_start) * (span + 1)
+        row_base = rows * (span + 1)
+        diff = np.bincount(row_base + lo[a:b], minlength=size) - np.bincount(
+            row_base + hi[a:b] + 1, minlength=size
+        )
+        present = np.cumsum(diff.reshape(-1, span + 1)[:, :span], axis=1, dtype=np.int32) > 0
+        yield chunk_start, chunk_end, present
+
+
+def pack(
+    person: np.ndarray, start: np.ndarray, end: np.ndarray, n_people: int, tax_year: int
+) -> np.ndarray:
+    """Packed presence bitmaps, shape ``(n_people, 3, YEAR_BYTES)`` uint8.
+
+    Axis 1 is CY, CY-1, CY-2. Trips outside those years are clipped away.
+    """
+    first, bounds = _window(tax_year)
+    out = np.zeros((n_people, _YEARS, YEAR_BYTES), dtype=np.uint8)
+    for p0, p1, present in _present(person, start, end, n_people, first, bounds[-1]):
+        for k in range(_YEARS):
+            y0, y1 = bounds[_YEARS - 1 - k], bounds[_YEARS - k]
+            packed = np.packbits(present[:, y0:y1], axis=1, bitorder="little")
+            out[p0:p1, k, : packed.shape[1]] = packed
+    return out
+
+
+def year_counts(
+    person: np.ndarray,
+    start: np.ndarray,
+    end: np.ndarray,
+    n_people: int,
+    first_year: int,
+    last_year: int,
+) -> np.ndarray:
+    """Distinct days present in each calendar year ``first_year..last_year``.
+
+    Returns an ``(n_people, last_year - first_year + 1)`` int64 array, in
+    year order. Each year is counted once, however many tax years use it.
+    """
+    first = np.datetime64(f"{first_year}-01-01", "D")
+    bounds = [
+        int((np.datetime64(f"{year}-01-01", "D") - first).astype(np.int64))
+        for year in range(first_year, last_year + 2)
+    ]
+    out = np.zeros((n_people, len(bounds) - 1), dtype=np.int64)
+    for p0, p1, present in _present(person, start, end, n_people, first, bounds[-1]):
+        out[p0:p1] = np.add.reduceat(present, bounds[:-1], axis=1, dtype=np.int64)
+    return out
+
+
+def count_days(bitmaps: np.ndarray) -> np.ndarray:
+    """Popcount of packed bitmaps over the last axis."""
+    return np.bitwise_count(bitmaps).sum(axis=-1, dtype=np.int64)
+
+
+def evaluate_batch(
+    person: np.ndarray,
+    start: np.ndarray,
+    end: np.ndarray,
+    visa: np.ndarray,
+    exempt_years: np.ndarray,
+    tax_year: int,
+) -> vectorized.BatchResult:
+    """Bulk counterpart of :func:`evaluate` with the columns of :mod:`residency.vectorized`."""
+    visa = np.asarray(visa, dtype=np.int64)
+    bitmaps = pack(person, start, end, len(visa), tax_year)
+    return vectorized.classify(visa, np.asarray(exempt_years, dtype=np.int64), count_days(bitmaps))
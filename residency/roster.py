@@ -0,0 +1,83 @@
+"""Residency of many people over a range of tax years.
+
+The test for tax year Y reads the days present in Y, Y-1 and Y-2.
+Evaluating years A..B one at a time would count every calendar year three
+times. Here the distinct days of each calendar year A-2..B are counted
+once (:func:`residency.presence.year_counts`). Every tax year's test is a
+view of three adjacent columns of that table, and all person-years are
+classified in one :func:`residency.vectorized.classify` call.
+
+``exempt_years`` is given as of the first tax year. Each later year adds
+one for every year since the first in which the person was present. That
+follows the F1/J1 rule, which counts calendar years spent in the US.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from residency import engine, presence, vectorized
+
+_YEARS = len(engine.YEAR_DIVISORS)
+
+
+class Roster(NamedTuple):
+    """Per-person, per-tax-year outcome arrays, shape ``(n_people, n_years)``."""
+
+    years: np.ndarray  # (n_years,) the tax years
+    days: np.ndarray  # (n_people, n_years + 2) days in each calendar year from years[0] - 2
+    exempt_years: np.ndarray  # exempt years counted before each tax year
+    score: np.ndarray
+    resident: np.ndarray
+    exempt: np.ndarray
+    reason: np.ndarray
+
+
+def exempt_years_by_year(exempt_years: np.ndarray, days_in_year: np.ndarray) -> np.ndarray:
+    """Exempt years before each tax year, from the count before the first one.
+
+    ``days_in_year`` is ``(n_people, n_years)`` days present in each tax year.
+    """
+    present = (days_in_year > 0).astype(np.int64)
+    before = np.cumsum(present, axis=1) - present
+    return np.asarray(exempt_years, dtype=np.int64)[:, None] + before
+
+
+def evaluate(
+    person: np.ndarray,
+    start: np.ndarray,
+    end: np.ndarray,
+    visa: np.ndarray,
+    exempt_years: np.ndarray,
+    first_year: int,
+    last_year: int,
+) -> Roster:
+    """Classify everyone for every tax year ``first_year..last_year``.
+
+    Inputs are the trip and profile columns of :mod:`residency.vectorized`.
+    Days are counted as in :mod:`residency.presence`, each day once.
+    """
+    if last_year < first_year:
+        raise ValueError("last_year must not be before first_year")
+    visa = np.asarray(visa, dtype=np.int64)
+    n_people, n_years = len(visa), last_year - first_year + 1
+    days = presence.year_counts(person, start, end, n_people, first_year - _YEARS + 1, last_year)
+
+    # Column j + 2 is tax year j; its CY, CY-1, CY-2 columns are j+2, j+1, j.
+    windows = np.lib.stride_tricks.sliding_window_view(days, _YEARS, axis=1)[:, :, ::-1]
+    by_year = exempt_years_by_year(exempt_years, days[:, _YEARS - 1:])
+    result = vectorized.classify(
+        np.repeat(visa, n_years),
+        by_year.reshape(-1),
+        windows.reshape(-1, _YEARS),
+    )
+    shape = (n_people, n_years)
+    return Roster(
+        years=np.arange(first_year, last_year + 1),
+        days=days,
+        exempt_years=by_year,
+        score=result.score.reshape(shape),
+        resident=result.resident.reshape(shape),
+        exempt=result.exempt.reshape(shape),
+        reason=result.reason.reshape(shape),
+    )
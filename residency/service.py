@@ -0,0 +1,149 @@
+"""Headless HTTP/JSON residency checks (ASGI, Starlette).
+
+    POST /evaluate         one person in the format of :mod:`residency.api`
+                           -> that person's result
+    POST /evaluate:batch   {"people": [person, ...]} -> {"results": [result, ...]}
+    GET  /metrics          stage timings, Prometheus text format
+
+Run it with ``python -m residency serve`` or any ASGI server
+(``uvicorn residency.service:app``). Malformed input gets a 400 response
+with ``{"error": message}``.
+
+Single evaluations are micro-batched. Each request waits in a
+:class:`MicroBatcher` for up to ``max_delay`` seconds, or until
+``max_batch`` requests are waiting. All waiting requests are then scored
+in one :func:`residency.api.evaluate_many` call. Under concurrent load the
+per-request overhead is paid once per batch. A lone request waits at most
+``max_delay``.
+"""
+
+import asyncio
+import json
+from typing import Optional
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from residency import api, metrics
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_DELAY = 0.0005  # seconds
+MAX_BATCH_PEOPLE = 100_000
+
+
+class MicroBatcher:
+    """Coalesces concurrent :meth:`evaluate` calls into batched evaluations.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, max_batch: int = DEFAULT_MAX_BATCH, max_delay: float = DEFAULT_MAX_DELAY):
+        if max_batch < 1:
+            raise ValueError("max_batch must be positive")
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0  # evaluations run so far
+        self._pending = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def evaluate(self, person: api.Person) -> dict:
+        """Result JSON for ``person``, computed together with concurrent callers."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((person, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self.batches += 1
+        try:
+            with metrics.timer("service_batch"):
+                results = api.evaluate_many([person for person, _ in pending])
+        except Exception:
+            # Score each person alone, so the failure reaches only its own request.
+            for person, future in pending:
+                try:
+                    result = api.evaluate_many([person])[0]
+                except Exception as exc:
+                    if not future.done():
+                        future.set_exception(exc)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            return
+        for (_, future), result in zip(pending, results):
+            # A caller that disconnected has had its future cancelled.
+            if not future.done():
+                future.set_result(result)
+
+
+def _error(message: str, status_code: int = 400) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status_code)
+
+
+async def _read_json(request: Request):
+    try:
+        return json.loads(await request.body())
+    except ValueError:
+        raise ValueError("request body must be JSON") from None
+
+
+def create_app(max_batch: int = DEFAULT_MAX_BATCH, max_delay: float = DEFAULT_MAX_DELAY) -> Starlette:
+    """The service, with its own :class:`MicroBatcher` (``app.state.batcher``)."""
+    batcher = MicroBatcher(max_batch, max_delay)
+
+    async def evaluate(request: Request):
+        try:
+            person = api.parse_person(await _read_json(request))
+        except ValueError as exc:
+            return _error(str(exc))
+        return JSONResponse(await batcher.evaluate(person))
+
+    async def evaluate_batch(request: Request):
+        try:
+            body = await _read_json(request)
+            people = body.get("people") if isinstance(body, dict) else None
+            if not isinstance(people, list):
+                raise ValueError('expected {"people": [...]}')
+            if len(people) > MAX_BATCH_PEOPLE:
+                return _error(f"at most {MAX_BATCH_PEOPLE:,} people per request", 413)
+            parsed = []
+            for i, value in enumerate(people):
+                try:
+                    parsed.append(api.parse_person(value))
+                except ValueError as exc:
+                    raise ValueError(f"people[{i}]: {exc}") from None
+        except ValueError as exc:
+            return _error(str(exc))
+        # A large batch would hold up every other request on the event loop.
+        with metrics.timer("service_evaluate_batch"):
+            results = await run_in_threadpool(api.evaluate_many, parsed)
+        return JSONResponse({"results": results})
+
+    async def metrics_text(request: Request):
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+    app = Starlette(
+        routes=[
+            Route("/evaluate", evaluate, methods=["POST"]),
+            Route("/evaluate:batch", evaluate_batch, methods=["POST"]),
+            Route("/metrics", metrics_text, methods=["GET"]),
+        ]
+    )
+    app.state.batcher = batcher
+    return app
+
+
+app = create_app()
@@ -0,0 +1,150 @@
+"""The date in the tax year on which the Substantial Presence Test is first met.
+
+For each day of the tax year the score is
+``days present in CY up to and including that day + daysCY1 / 3 + daysCY2 / 6``.
+The answer is the first day on which that score reaches 183 while CY
+presence is at least 31 days.
+
+Both conditions only grow as the year goes on. So one prefix sum of the
+year's daily presence is enough. The number of CY days needed is worked
+out once from the prior-year part of the score. The day is then the number
+of prefix-sum entries still below it. That is O(days) per person, not one
+full test per candidate day.
+
+Days are counted as by :func:`residency.engine.evaluate`, each once and in
+the year it falls in, so a date is found exactly when that result for the
+tax year is a Resident Alien.
+
+A *projected* date can also be asked for as of some day in the year. It
+assumes the person is present every day after ``as_of`` and ignores any
+presence already recorded after it. If the test is already met by
+``as_of``, the projection is the actual date.
+"""
+
+from calendar import isleap
+from datetime import date
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from residency import engine, presence, vectorized
+
+_NONE = -1
+
+
+class StartDate(NamedTuple):
+    """Per-person answer; ``None`` if the test is not (or cannot be) met in the year."""
+
+    reached: Optional[date]
+    projected: Optional[date]
+
+
+def required_cy_days(days_cy1: np.ndarray, days_cy2: np.ndarray) -> np.ndarray:
+    """Smallest CY day count that passes both the 31-day floor and the 183 test.
+
+    The comparison is done in the same floating-point form as
+    :func:`residency.engine.weighted_score`, so the answer agrees with
+    :func:`residency.engine.classify` exactly.
+    """
+
+    def passes(cy):
+        return engine.weighted_score(cy, days_cy1, days_cy2) >= engine.SPT_THRESHOLD
+
+    _, div1, div2 = engine.YEAR_DIVISORS
+    prior = days_cy1 / div1 + days_cy2 / div2
+    need = np.maximum(np.ceil(engine.SPT_THRESHOLD - prior), 0).astype(np.int64)
+    # The estimate can be one off either way because of rounding; settle it
+    # with the engine's own score expression.
+    need = np.where((need > 0) & passes(need - 1), need - 1, need)
+    need = np.where(passes(need), need, need + 1)
+    return np.maximum(need, engine.MIN_CURRENT_YEAR_DAYS)
+
+
+def crossing_days(
+    cy_present: np.ndarray, days_cy1: np.ndarray, days_cy2: np.ndarray, as_of: Optional[int] = None
+):
+    """Day-of-year indices at which the test is met, ``-1`` where it is not.
+
+    ``cy_present`` is an ``(n_people, days_in_year)`` 0/1 array. Returns
+    ``(reached, projected)``; ``projected`` is all ``-1`` when ``as_of`` (a
+    day-of-year index) is not given.
+    """
+    n, year_len = cy_present.shape
+    prefix = np.cumsum(cy_present, axis=1, dtype=np.int32)
+    need = required_cy_days(np.asarray(days_cy1), np.asarray(days_cy2))
+
+    reached = np.full(n, _NONE, dtype=np.int64)
+    met = prefix[:, -1] >= need if year_len else np.zeros(n, dtype=bool)
+    # The first index where the (non-decreasing) prefix sum reaches ``need``.
+    reached[met] = (prefix[met] < need[met, None]).sum(axis=1)
+
+    projected = np.full(n, _NONE, dtype=np.int64)
+    if as_of is not None:
+        as_of = min(max(as_of, -1), year_len - 1)
+        by_as_of = prefix[:, as_of] if as_of >= 0 else np.zeros(n, dtype=np.int32)
+        later = as_of + (need - by_as_of)
+        projected = np.where(by_as_of >= need, reached, np.where(later < year_len, later, _NONE))
+    return reached, projected
+
+
+def _to_dates(index: np.ndarray, tax_year: int) -> np.ndarray:
+    dates = np.datetime64(f"{tax_year}-01-01", "D") + index.astype("timedelta64[D]")
+    dates[index < 0] = np.datetime64("NaT")
+    return dates
+
+
+def start_dates(
+    bitmaps: np.ndarray,
+    visa: np.ndarray,
+    exempt_years: np.ndarray,
+    tax_year: int,
+    as_of: Optional[np.datetime64] = None,
+):
+    """Bulk solver over packed presence from :func:`residency.presence.pack`.
+
+    Returns ``(reached, projected)`` as ``datetime64[D]`` arrays, NaT where
+    the test is not met or the person is an exempt individual.
+    """
+    year_len = 366 if isleap(tax_year) else 365
+    cy_present = np.unpackbits(bitmaps[:, 0], axis=1, count=year_len, bitorder="little")
+    prior_days = presence.count_days(bitmaps[:, 1:])
+    day = None
+    if as_of is not None:
+        day = int((np.datetime64(as_of, "D") - np.datetime64(f"{tax_year}-01-01", "D")).astype(np.int64))
+    reached, projected = crossing_days(cy_present, prior_days[:, 0], prior_days[:, 1], day)
+
+    exempt = vectorized.classify(
+        np.asarray(visa, dtype=np.int64),
+        np.asarray(exempt_years, dtype=np.int64),
+        np.zeros((len(visa), len(engine.YEAR_DIVISORS)), dtype=np.int64),
+    ).exempt
+    reached[exempt] = _NONE
+    projected[exempt] = _NONE
+    return _to_dates(reached, tax_year), _to_dates(projected, tax_year)
+
+
+def start_date(
+    profile: engine.Profile, trips: engine.YearTrips, tax_year: int, as_of: Optional[date] = None
+) -> StartDate:
+    """Solver for one person as entered in the calculator.
+
+    The trips of all three boxes are counted by date, as by
+    :func:`residency.engine.evaluate`.
+    """
+    if engine.exempt_reason(profile) is not None:
+        return StartDate(None, None)
+    calendar = presence.PresenceCalendar(t for year in trips for t in year)
+    year_len = 366 if isleap(tax_year) else 365
+    cy_present = np.unpackbits(
+        np.frombuffer(calendar.bitmap(tax_year), dtype=np.uint8)[None, :],
+        axis=1,
+        count=year_len,
+        bitorder="little",
+    )
+    _, days_cy1, days_cy2 = calendar.year_days(tax_year)
+    day = None if as_of is None else (as_of - date(tax_year, 1, 1)).days
+    reached, projected = crossing_days(cy_present, np.array([days_cy1]), np.array([days_cy2]), day)
+    jan1 = date(tax_year, 1, 1).toordinal()
+    return StartDate(
+        *(None if i[0] < 0 else date.fromordinal(jan1 + int(i[0])) for i in (reached, projected))
+    )
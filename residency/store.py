@@ -0,0 +1,188 @@
+"""Persistent per-person travel histories in SQLite.
+
+Each trip is stored once, as an inclusive interval of day numbers
+(``date.toordinal()``) with ``start_day <= end_day``. No year buckets are
+stored. The CY/CY-1/CY-2 view of any tax year is derived from the trips
+that overlap its three-year window. The index on
+``(person_id, end_day, start_day)`` finds those trips with one range scan
+that never touches the table. Loading and scoring one person therefore
+depends on that person's trips, not on the size of the store.
+
+People are identified by a caller-chosen key (e.g. a login e-mail) and
+also keep their visa profile.
+"""
+
+import sqlite3
+import threading
+from datetime import date
+from typing import Iterable, List, Optional
+
+from residency import engine, presence
+
+_YEARS = len(engine.YEAR_DIVISORS)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS people (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    visa_type TEXT NOT NULL,
+    exempt_years INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trips (
+    id INTEGER PRIMARY KEY,
+    person_id INTEGER NOT NULL REFERENCES people (id) ON DELETE CASCADE,
+    start_day INTEGER NOT NULL,
+    end_day INTEGER NOT NULL,
+    CHECK (start_day <= end_day)
+);
+CREATE INDEX IF NOT EXISTS trips_by_person_date ON trips (person_id, end_day, start_day);
+"""
+
+_OVERLAPPING = (
+    "SELECT start_day, end_day FROM trips WHERE person_id = ? AND end_day >= ? AND start_day <= ?"
+)
+
+
+def window(tax_year: int):
+    """First and last day of ``tax_year``'s three-year window (CY-2 to CY)."""
+    return date(tax_year - _YEARS + 1, 1, 1), date(tax_year, 12, 31)
+
+
+def _interval(trip: engine.Trip):
+    """``(start_day, end_day)`` of a dated trip, ``None`` if a date is blank."""
+    if trip.start is None or trip.end is None:
+        return None
+    lo, hi = sorted((trip.start.toordinal(), trip.end.toordinal()))
+    return lo, hi
+
+
+class TripStore:
+    """Travel histories in the SQLite database at ``path``.
+
+    One store may be shared across threads; calls are serialized.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode = WAL")
+            self._db.execute("PRAGMA synchronous = NORMAL")
+        with self._db:
+            self._db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _person_id(self, key: str, create: bool = False) -> Optional[int]:
+        row = self._db.execute("SELECT id FROM people WHERE key = ?", (key,)).fetchone()
+        if row is not None or not create:
+            return row and row[0]
+        default = engine.Profile()
+        return self._db.execute(
+            "INSERT INTO people (key, visa_type, exempt_years) VALUES (?, ?, ?)",
+            (key, default.visa_type, default.exempt_years),
+        ).lastrowid
+
+    def profile(self, key: str) -> Optional[engine.Profile]:
+        """The saved profile, or ``None`` for an unknown person."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT visa_type, exempt_years FROM people WHERE key = ?", (key,)
+            ).fetchone()
+        return row and engine.Profile(*row)
+
+    def set_profile(self, key: str, profile: engine.Profile) -> None:
+        with self._lock, self._db:
+            person = self._person_id(key, create=True)
+            self._db.execute(
+                "UPDATE people SET visa_type = ?, exempt_years = ? WHERE id = ?",
+                (profile.visa_type, profile.exempt_years, person),
+            )
+
+    def add_trips(self, key: str, trips: Iterable[engine.Trip]) -> int:
+        """Store ``trips``; trips with a blank date are skipped. Returns the number stored."""
+        rows = [r for r in map(_interval, trips) if r is not None]
+        with self._lock, self._db:
+            person = self._person_id(key, create=True)
+            self._db.executemany(
+                "INSERT INTO trips (person_id, start_day, end_day) VALUES (?, ?, ?)",
+                [(person, lo, hi) for lo, hi in rows],
+            )
+        return len(rows)
+
+    def trips(self, key: str, first: date, last: date) -> List[engine.Trip]:
+        """Stored trips overlapping ``first``..``last``, whole and ordered by start."""
+        with self._lock:
+            person = self._person_id(key)
+            if person is None:
+                return []
+            rows = self._db.execute(
+                _OVERLAPPING + " ORDER BY start_day", (person, first.toordinal(), last.toordinal())
+            ).fetchall()
+        fromordinal = date.fromordinal
+        return [engine.Trip(fromordinal(lo), fromordinal(hi)) for lo, hi in rows]
+
+    def year_trips(self, key: str, tax_year: int) -> engine.YearTrips:
+        """CY, CY-1 and CY-2 views of ``tax_year``.
+
+        A trip that spans Dec 31 appears in each year it touches, cut at
+        the year boundary, so a bucket's summed trip lengths are days in
+        that year.
+        """
+        buckets = [[] for _ in range(_YEARS)]
+        for trip in self.trips(key, *window(tax_year)):
+            for year in range(trip.start.year, trip.end.year + 1):
+                k = tax_year - year
+                if 0 <= k < _YEARS:
+                    buckets[k].append(
+                        engine.Trip(max(trip.start, date(year, 1, 1)), min(trip.end, date(year, 12, 31)))
+                    )
+        return engine.YearTrips(*buckets)
+
+    def replace_window(self, key: str, tax_year: int, trips: Iterable[engine.Trip]) -> None:
+        """Make ``trips`` the whole history inside ``tax_year``'s window.
+
+        Stored days outside the window are kept, including the outside part
+        of a trip that crosses its edge. The new trips are clipped to the
+        window, so saving the same view twice changes nothing.
+        """
+        first, last = (d.toordinal() for d in window(tax_year))
+        rows = []
+        for interval in map(_interval, trips):
+            if interval is not None and interval[1] >= first and interval[0] <= last:
+                rows.append((max(interval[0], first), min(interval[1], last)))
+        with self._lock, self._db:
+            person = self._person_id(key, create=True)
+            kept = []
+            for lo, hi in self._db.execute(_OVERLAPPING, (person, first, last)).fetchall():
+                if lo < first:
+                    kept.append((lo, first - 1))
+                if hi > last:
+                    kept.append((last + 1, hi))
+            self._db.execute(
+                "DELETE FROM trips WHERE person_id = ? AND end_day >= ? AND start_day <= ?",
+                (person, first, last),
+            )
+            self._db.executemany(
+                "INSERT INTO trips (person_id, start_day, end_day) VALUES (?, ?, ?)",
+                [(person, lo, hi) for lo, hi in kept + rows],
+            )
+
+    def evaluate(self, key: str, tax_year: int) -> engine.Result:
+        """Residency result for ``tax_year`` from the stored history.
+
+        Days are counted as in :func:`residency.presence.evaluate`. An
+        unknown person is scored with the default profile and no trips.
+        """
+        profile = self.profile(key) or engine.Profile()
+        first, last = window(tax_year)
+        return presence.evaluate(profile, self.trips(key, first, last), tax_year)
+
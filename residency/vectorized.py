@@ -0,0 +1,61 @@
+"""Columnar NumPy form of the SPT rules for many people at once.
+
+The bulk evaluators (:func:`residency.presence.evaluate_batch` and the
+modules built on it) share these inputs: flat trip columns plus per-person
+profile columns::
+
+    person        int    index into the per-person arrays, one per trip
+    start, end    datetime64[D], NaT where a date was left blank
+    visa          int    code from VISA_CODES, one per person
+    exempt_years  int    one per person
+
+They count the days and hand an ``(n_people, 3)`` day table to
+:func:`classify`. There is no Python-level loop over people; the rules are
+the same as :func:`residency.engine.classify`.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from residency import engine
+
+VISA_CODES = {visa: code for code, visa in enumerate(engine.VISA_TYPES)}
+
+# Reason codes for BatchResult.reason.
+EXEMPT, UNDER_MINIMUM, PASSED, FAILED = range(4)
+
+# Exempt-year limit per visa code; 0 means the visa is never exempt.
+_EXEMPT_LIMITS = np.array(
+    [engine.EXEMPT_YEAR_LIMITS.get(visa, 0) for visa in engine.VISA_TYPES], dtype=np.int64
+)
+
+
+class BatchResult(NamedTuple):
+    """Per-person outcome arrays, all of length ``n_people``."""
+
+    days: np.ndarray  # (n_people, 3) int64 days in CY, CY-1, CY-2
+    score: np.ndarray  # float64; days in CY below the 31-day floor, NaN if exempt
+    resident: np.ndarray  # bool, True for RA
+    exempt: np.ndarray  # bool
+    reason: np.ndarray  # uint8 reason code
+
+
+def classify(visa: np.ndarray, exempt_years: np.ndarray, days: np.ndarray) -> BatchResult:
+    """Apply the SPT to an ``(n_people, 3)`` day table."""
+    exempt = exempt_years < _EXEMPT_LIMITS[visa]
+    days_cy = days[:, 0]
+    under = ~exempt & (days_cy < engine.MIN_CURRENT_YEAR_DAYS)
+
+    _, div1, div2 = engine.YEAR_DIVISORS
+    score = days_cy + days[:, 1] / div1 + days[:, 2] / div2
+    score = np.where(under, days_cy, score)
+    score[exempt] = np.nan
+
+    resident = ~exempt & ~under & (score >= engine.SPT_THRESHOLD)
+    reason = np.full(len(visa), FAILED, dtype=np.uint8)
+    reason[resident] = PASSED
+    reason[under] = UNDER_MINIMUM
+    reason[exempt] = EXEMPT
+    return BatchResult(days, score, resident, exempt, reason)
+
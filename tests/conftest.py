@@ -0,0 +1,5 @@
+from hypothesis import settings
+
+# The first call into NumPy or a process pool can be slow; judge correctness only.
+settings.register_profile("default", deadline=None)
+settings.load_profile("default")
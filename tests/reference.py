@@ -0,0 +1,79 @@
+"""A deliberately plain model of the calculator, for the property tests.
+
+Nothing here is shared with :mod:`residency`. The constants are written out,
+and days are counted one calendar day at a time. Each fast path is checked
+against this model rather than against another fast path.
+"""
+
+from datetime import date, timedelta
+
+
+def is_exempt(visa_type, exempt_years):
+    return (visa_type == "F1" and exempt_years < 5) or (visa_type == "J1" and exempt_years < 2)
+
+
+def spt(visa_type, exempt_years, days_cy, days_cy1, days_cy2):
+    """``(code, score)``; the score is ``None`` for exempt individuals."""
+    if is_exempt(visa_type, exempt_years):
+        return "NRA", None
+    if days_cy < 31:
+        return "NRA", days_cy
+    score = days_cy + days_cy1 / 3 + days_cy2 / 6
+    return ("RA" if score >= 183 else "NRA"), score
+
+
+def days_present(trips):
+    """Every calendar day covered by at least one trip."""
+    days = set()
+    for trip in trips:
+        if trip.start is None or trip.end is None:
+            continue
+        day, last = sorted((trip.start, trip.end))
+        while day <= last:
+            days.add(day)
+            day += timedelta(days=1)
+    return days
+
+
+def days_in_year(days, year):
+    return sum(1 for day in days if day.year == year)
+
+
+def window_days(trips, tax_year):
+    """Distinct days present in the tax year and the two years before it."""
+    days = days_present(trips)
+    return [days_in_year(days, tax_year - k) for k in range(3)]
+
+
+def year_of(tax_year):
+    day = date(tax_year, 1, 1)
+    while day.year == tax_year:
+        yield day
+        day += timedelta(days=1)
+
+
+def first_day_met(days_cy, days_cy1, days_cy2, tax_year, as_of=None):
+    """First date of ``tax_year`` on which the test is met, or ``None``.
+
+    ``days_cy`` is the set of dates present in the tax year. With ``as_of``,
+    presence after that date is replaced by every day being present.
+    """
+    count = 0
+    for day in year_of(tax_year):
+        if as_of is None or day <= as_of:
+            count += day in days_cy
+        else:
+            count += 1
+        if spt("H1B", 0, count, days_cy1, days_cy2)[0] == "RA":
+            return day
+    return None
+
+
+def remaining_days(days_cy, days_cy1, days_cy2):
+    """More CY days that still leave a non-exempt person a Non-Resident Alien."""
+    if spt("H1B", 0, days_cy, days_cy1, days_cy2)[0] == "RA":
+        return 0
+    extra = 0
+    while spt("H1B", 0, days_cy + extra + 1, days_cy1, days_cy2)[0] == "NRA":
+        extra += 1
+    return extra
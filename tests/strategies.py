@@ -0,0 +1,58 @@
+"""Hypothesis strategies for profiles and travel histories."""
+
+from datetime import date
+
+import numpy as np
+from hypothesis import strategies as st
+
+from residency import engine, vectorized
+
+TAX_YEAR = 2025
+
+profiles = st.builds(
+    engine.Profile,
+    visa_type=st.sampled_from(engine.VISA_TYPES),
+    exempt_years=st.integers(0, 7),
+)
+
+day_counts = st.integers(0, 400)
+
+# Dates around the three-year window, so trips also cross its edges and Dec 31.
+dates = st.dates(date(TAX_YEAR - 3, 10, 1), date(TAX_YEAR + 1, 3, 31))
+optional_dates = st.none() | dates
+trips = st.builds(engine.Trip, optional_dates, optional_dates)
+trip_lists = st.lists(trips, max_size=6)
+year_trips = st.builds(engine.YearTrips, trip_lists, trip_lists, trip_lists)
+
+people = st.lists(st.tuples(profiles, year_trips), min_size=1, max_size=12)
+dated_people = st.lists(st.tuples(profiles, trip_lists), min_size=1, max_size=12)
+
+
+def columns(history):
+    """Flatten ``[(profile, YearTrips), ...]`` into :mod:`residency.vectorized` columns.
+
+    Returns ``(person, start, end, year_offset, visa, exempt_years)``.
+    """
+    rows = [
+        (i, trip.start, trip.end, offset)
+        for i, (_, buckets) in enumerate(history)
+        for offset, bucket in enumerate(buckets)
+        for trip in bucket
+    ]
+    person, start, end, year_offset = zip(*rows) if rows else ((), (), (), ())
+    return (
+        np.array(person, dtype=np.int64),
+        np.array(start, dtype="datetime64[D]"),
+        np.array(end, dtype="datetime64[D]"),
+        np.array(year_offset, dtype=np.int64),
+        np.array([vectorized.VISA_CODES[p.visa_type] for p, _ in history], dtype=np.int64),
+        np.array([p.exempt_years for p, _ in history], dtype=np.int64),
+    )
+
+
+def dated_columns(history):
+    """:func:`columns` for ``[(profile, trips), ...]`` with undivided trip lists."""
+    person, start, end, _, visa, exempt_years = columns(
+        [(profile, (trips,)) for profile, trips in history]
+    )
+    return person, start, end, visa, exempt_years
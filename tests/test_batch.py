@@ -0,0 +1,100 @@
+import csv
+from datetime import date
+
+import pytest
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from hypothesis import given, settings
+
+from residency import batch, cli, presence
+from strategies import TAX_YEAR, dated_people
+
+
+def write_input(path, history):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(batch.INPUT_COLUMNS)
+        for i, (profile, trips) in enumerate(history):
+            # Blank dates are not valid input rows; keep one row so the person is listed.
+            rows = [t for t in trips if t.start and t.end] or [None]
+            for trip in rows:
+                writer.writerow(
+                    [f"p{i:03d}", profile.visa_type, profile.exempt_years]
+                    + ([trip.start, trip.end] if trip else ["", ""])
+                )
+
+
+@settings(max_examples=20)
+@given(history=dated_people)
+def test_run_matches_presence_evaluate(tmp_path_factory, history):
+    tmp = tmp_path_factory.mktemp("batch")
+    write_input(tmp / "in.csv", history)
+    # Tiny chunks so that people are carried across chunk boundaries.
+    stats = batch.run(tmp / "in.csv", tmp / "out.parquet", TAX_YEAR, chunk_rows=3)
+    out = pq.read_table(tmp / "out.parquet").to_pylist()
+    assert stats.people == len(history) == len(out)
+    for row, (profile, trips) in zip(out, history):
+        expected = presence.evaluate(profile, trips, TAX_YEAR)
+        assert (row["code"], row["reason"], row["score"]) == (
+            expected.code,
+            expected.reason,
+            expected.score,
+        )
+
+
+def test_cli_reports_unknown_visa(tmp_path, capsys):
+    (tmp_path / "in.csv").write_text(
+        ",".join(batch.INPUT_COLUMNS) + "\np1,O1,0,2025-01-01,2025-02-01\n"
+    )
+    assert cli.main(["batch", str(tmp_path / "in.csv"), "-o", str(tmp_path / "out.csv"), "--tax-year", "2025"]) != 0
+    assert "unknown visa type 'O1'" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("chunk_rows", [1, batch.DEFAULT_CHUNK_ROWS])
+def test_rejects_unsorted_people(tmp_path, chunk_rows):
+    # p1's trips add up to 243 days; evaluated in two pieces they would be NRA twice.
+    (tmp_path / "in.csv").write_text(
+        ",".join(batch.INPUT_COLUMNS)
+        + "\np1,H1B,0,2025-01-01,2025-04-30"
+        + "\np2,H1B,0,2025-01-01,2025-01-31"
+        + "\np1,H1B,0,2025-05-01,2025-08-31\n"
+    )
+    with pytest.raises(ValueError, match="sorted by person_id; 'p1' follows 'p2'"):
+        batch.run(tmp_path / "in.csv", tmp_path / "out.csv", 2025, chunk_rows=chunk_rows)
+
+
+@pytest.mark.parametrize("name", ["out.csv", "out.parquet"])
+def test_failed_run_leaves_no_output(tmp_path, name):
+    # The first chunk is written before the second one turns out to be unsorted.
+    (tmp_path / "in.csv").write_text(
+        ",".join(batch.INPUT_COLUMNS)
+        + "\np1,H1B,0,2025-01-01,2025-01-31"
+        + "\np2,H1B,0,2025-01-01,2025-01-31"
+        + "\np0,H1B,0,2025-01-01,2025-01-31\n"
+    )
+    with pytest.raises(ValueError):
+        batch.run(tmp_path / "in.csv", tmp_path / name, 2025, chunk_rows=1)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["in.csv"]
+
+    (tmp_path / name).write_bytes(b"earlier")
+    with pytest.raises(ValueError):
+        batch.run(tmp_path / "in.csv", tmp_path / name, 2025, chunk_rows=1)
+    assert (tmp_path / name).read_bytes() == b"earlier"
+
+
+def test_rejects_missing_person_id(tmp_path):
+    table = pa.table(
+        {
+            "person_id": ["p1", None],
+            "visa_type": ["H1B", "H1B"],
+            "exempt_years": [0, 0],
+            "start": [date(2025, 1, 1)] * 2,
+            "end": [date(2025, 2, 1)] * 2,
+        }
+    )
+    pq.write_table(table, tmp_path / "in.parquet")
+    with pytest.raises(ValueError, match=r"person_id is missing in 1 row\(s\)"):
+        batch.run(tmp_path / "in.parquet", tmp_path / "out.csv", 2025)
+    with pytest.raises(ValueError, match="person_id is missing"):
+        batch.columns(table)
@@ -0,0 +1,63 @@
+from datetime import date
+
+import pytest
+
+from residency import component, engine
+from residency.store import TripStore
+
+TODAY = date(2025, 6, 1)
+
+
+def report(trips, window=2025, tax_year=None, **profile):
+    return {
+        "visaType": "H1B",
+        "exemptYears": 0,
+        **profile,
+        "taxYear": tax_year or window,
+        "window": window,
+        "trips": trips,
+    }
+
+
+def test_history_round_trips_the_boxes():
+    trips = [[["2025-01-02", "2025-03-01"]], [["2024-12-01", "2024-12-31"]], [["2023-05-01", "2023-05-02"]]]
+    with TripStore() as store:
+        component.history(store, "u", report(trips, visaType="L1", exemptYears="2"), TODAY)
+        view = component.history(store, "u", None, TODAY)
+    assert view == {"warnings": [], "taxYear": 2025, "visaType": "L1", "exemptYears": 2, "trips": trips}
+
+
+def test_history_keeps_trips_out_of_place_unsaved():
+    saved = [[["2025-01-02", "2025-03-01"]], [], []]
+    with TripStore() as store:
+        component.history(store, "u", report(saved), TODAY)
+        view = component.history(
+            store, "u", report([[["2019-03-01", "2019-03-10"]], [["2026-01-01", "2026-02-01"]], []]), TODAY
+        )
+    assert view["trips"] == saved
+    assert view["warnings"] == [
+        "Current Year: the trip 2019-03-01 to 2019-03-10 is not within 2025.",
+        "Last Year: the trip 2026-01-01 to 2026-02-01 is not within 2024.",
+    ]
+
+
+def test_misplaced_trips_flags_a_trip_across_new_year():
+    trips = engine.YearTrips([], [engine.Trip(date(2024, 12, 20), date(2025, 1, 5))], [engine.Trip(None, None)])
+    assert component.misplaced_trips(trips, 2025) == [
+        "Last Year: the trip 2024-12-20 to 2025-01-05 is not within 2024."
+    ]
+
+
+def test_history_ignores_malformed_reports():
+    with TripStore() as store:
+        view = component.history(store, "u", report([[], [], []], exemptYears=float("inf")), TODAY)
+        assert store.profile("u") is None
+    assert view["visaType"] == engine.Profile().visa_type
+
+
+def test_roster_payload_caps_the_range():
+    data = b"person_id,visa_type,exempt_years,start,end\np1,H1B,0,2025-01-01,2025-01-31\n"
+    last = 2025 + component.MAX_ROSTER_YEARS
+    assert len(component.roster_payload(data, False, 2026, last)["years"]) == component.MAX_ROSTER_YEARS
+    with pytest.raises(ValueError, match="at most"):
+        component.roster_payload(data, False, 2025, last)
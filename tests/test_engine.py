@@ -0,0 +1,74 @@
+import pytest
+from hypothesis import given
+
+import reference
+from residency import engine
+from strategies import TAX_YEAR, day_counts, people, profiles, year_trips
+
+
+def assert_matches(result, expected):
+    code, score = expected
+    assert result.code == code
+    assert result.status == engine.STATUS[code]
+    assert result.form == engine.FORMS[code]
+    if score is None:
+        assert result.is_exempt and result.score is None
+    else:
+        assert not result.is_exempt and result.score == score
+
+
+@given(profiles, day_counts, day_counts, day_counts)
+def test_classify_matches_reference(profile, cy, cy1, cy2):
+    result = engine.classify(profile, cy, cy1, cy2)
+    assert_matches(result, reference.spt(profile.visa_type, profile.exempt_years, cy, cy1, cy2))
+
+
+@given(profiles, year_trips)
+def test_evaluate_counts_each_day_once_by_date(profile, trips):
+    days = reference.window_days([t for bucket in trips for t in bucket], TAX_YEAR)
+    expected = reference.spt(profile.visa_type, profile.exempt_years, *days)
+    assert_matches(engine.evaluate(profile, trips, TAX_YEAR), expected)
+
+
+def test_overlaps_and_new_year_are_not_double_counted():
+    overlapping = engine.YearTrips(
+        [engine.Trip.from_iso("2025-01-01", "2025-04-30"), engine.Trip.from_iso("2025-03-01", "2025-06-30")]
+    )
+    assert engine.evaluate(engine.Profile(), overlapping, 2025).score == 181
+    # Entered in the CY box, but only Jan 1-10 fall in 2025.
+    across = engine.YearTrips([engine.Trip.from_iso("2024-07-01", "2025-01-10")])
+    assert engine.evaluate(engine.Profile(), across, 2025).reason == engine.REASON_UNDER_MINIMUM
+
+
+@given(people)
+def test_evaluate_batch_is_evaluate_per_person(history):
+    profiles_, trips = zip(*history)
+    assert engine.evaluate_batch(profiles_, trips, TAX_YEAR) == [
+        engine.evaluate(p, t, TAX_YEAR) for p, t in history
+    ]
+
+
+@pytest.mark.parametrize(
+    "visa, exempt_years, days, code",
+    [
+        ("F1", 4, (365, 365, 365), "NRA"),
+        ("F1", 5, (365, 0, 0), "RA"),
+        ("J1", 1, (365, 0, 0), "NRA"),
+        ("J1", 2, (365, 0, 0), "RA"),
+        ("H1B", 0, (30, 365, 365), "NRA"),
+        ("H1B", 0, (31, 366, 366), "RA"),
+        ("L1", 0, (183, 0, 0), "RA"),
+        ("L1", 0, (182, 2, 0), "NRA"),
+        ("L1", 0, (182, 3, 0), "RA"),
+        ("H1B", 0, (120, 120, 126), "NRA"),
+        ("H1B", 0, (120, 126, 126), "RA"),
+    ],
+)
+def test_thresholds(visa, exempt_years, days, code):
+    assert engine.classify(engine.Profile(visa, exempt_years), *days).code == code
+
+
+def test_trip_days_ignores_order_and_blanks():
+    trip = engine.Trip.from_iso("2025-03-10", "2025-03-01")
+    assert trip.days == 10
+    assert engine.Trip.from_iso("2025-03-10", "").days == 0
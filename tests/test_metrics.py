@@ -0,0 +1,57 @@
+import pytest
+
+from residency import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_render_is_cumulative_prometheus_text():
+    for seconds in (0.0002, 0.003, 0.003, 10.0):
+        metrics.observe("stage", seconds)
+    lines = metrics.render().splitlines()
+    assert lines[:2] == [
+        "# HELP residency_stage_seconds Time spent per calculator stage.",
+        "# TYPE residency_stage_seconds histogram",
+    ]
+    labels = 'side="server",stage="stage"'
+    assert f'residency_stage_seconds_bucket{{{labels},le="0.0001"}} 0' in lines
+    assert f'residency_stage_seconds_bucket{{{labels},le="0.0005"}} 1' in lines
+    assert f'residency_stage_seconds_bucket{{{labels},le="0.005"}} 3' in lines
+    assert f'residency_stage_seconds_bucket{{{labels},le="2.5"}} 3' in lines
+    assert f'residency_stage_seconds_bucket{{{labels},le="+Inf"}} 4' in lines
+    assert f"residency_stage_seconds_count{{{labels}}} 4" in lines
+    total = next(line for line in lines if line.startswith("residency_stage_seconds_sum"))
+    assert float(total.rsplit(" ", 1)[1]) == pytest.approx(10.0062)
+
+
+def test_timer_records_failures_too():
+    with pytest.raises(RuntimeError):
+        with metrics.timer("failing"):
+            raise RuntimeError
+    (timing,) = metrics.recent()
+    assert (timing.side, timing.stage) == (metrics.SERVER, "failing")
+
+
+def test_record_client_keeps_known_stages_only():
+    recorded = metrics.record_client(
+        [["evaluate", 0.25], ["render", "3.5"], ["mystery", 1], ["render"], None, ["render", -1]]
+    )
+    assert recorded == 2
+    assert [(t.side, t.stage, t.seconds) for t in metrics.recent()] == [
+        (metrics.CLIENT, "render", 0.0035),
+        (metrics.CLIENT, "evaluate", 0.00025),
+    ]
+
+
+def test_recent_is_bounded_and_newest_first():
+    for i in range(metrics.RECENT_LIMIT + 5):
+        metrics.observe(f"s{i}", 0.001)
+    stages = [t.stage for t in metrics.recent()]
+    assert len(stages) == metrics.RECENT_LIMIT
+    assert stages[0] == f"s{metrics.RECENT_LIMIT + 4}"
+    assert [t.stage for t in metrics.recent(2)] == stages[:2]
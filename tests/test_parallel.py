@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from hypothesis import given, settings
+
+from residency import parallel, presence
+from strategies import TAX_YEAR, dated_columns, dated_people
+
+
+@pytest.fixture(scope="module")
+def evaluator():
+    with parallel.ParallelEvaluator(workers=2, chunk_people=3) as pool:
+        yield pool
+
+
+@settings(max_examples=25)
+@given(history=dated_people)
+def test_matches_serial(evaluator, history):
+    person, start, end, visa, exempt_years = dated_columns(history)
+    # Shuffle the rows: the evaluator must not depend on them being sorted.
+    order = np.random.default_rng(len(person)).permutation(len(person))
+    result = evaluator.evaluate(
+        person[order], start[order], end[order], visa, exempt_years, TAX_YEAR
+    )
+    serial = presence.evaluate_batch(person, start, end, visa, exempt_years, TAX_YEAR)
+    for name, expected in serial._asdict().items():
+        np.testing.assert_array_equal(getattr(result, name), expected, err_msg=name)
+
+
+def test_rejects_empty_chunks():
+    with pytest.raises(ValueError):
+        parallel.ParallelEvaluator(workers=1, chunk_people=0)
@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st
+
+import reference
+from residency import engine, planner
+from strategies import day_counts, profiles, year_trips
+
+
+@given(day_counts, day_counts, day_counts)
+def test_remaining_days_matches_day_by_day_search(cy, cy1, cy2):
+    assert planner.remaining_days(cy, cy1, cy2) == reference.remaining_days(cy, cy1, cy2)
+
+
+@given(st.lists(st.tuples(day_counts, day_counts, day_counts), min_size=1, max_size=20))
+def test_remaining_days_on_arrays(rows):
+    cy, cy1, cy2 = (np.array(column) for column in zip(*rows))
+    assert planner.remaining_days(cy, cy1, cy2).tolist() == [reference.remaining_days(*r) for r in rows]
+
+
+@given(profiles, year_trips, st.dates(date(2025, 1, 1), date(2025, 12, 31)))
+def test_plan_stays_non_resident(profile, trips, arrive):
+    budget, latest = planner.plan(profile, trips, 2025, arrive)
+    if reference.is_exempt(profile.visa_type, profile.exempt_years):
+        assert (budget, latest) == (None, None)
+        return
+    days = reference.window_days([t for bucket in trips for t in bucket], 2025)
+    assert budget == reference.remaining_days(*days)
+
+    def with_stay(last):
+        stay = engine.Trip(arrive, last)
+        return engine.evaluate(profile, trips._replace(current=[*trips.current, stay]), 2025).code
+
+    # The stay to ``latest`` keeps NRA status and one more day would not.
+    if latest is None:
+        assert with_stay(arrive) == engine.RESIDENT
+        return
+    assert with_stay(latest) == engine.NON_RESIDENT
+    if latest < date(2025, 12, 31):
+        assert with_stay(latest + timedelta(days=1)) == engine.RESIDENT
+
+
+def test_days_already_present_are_free():
+    present = planner.presence.PresenceCalendar([engine.Trip(date(2025, 6, 1), date(2025, 6, 30))])
+    latest = planner.latest_safe_departure(date(2025, 5, 27), 10, 2025, present.bitmap(2025))
+    # May 27-31 and Jul 1-5 are new; June is already counted.
+    assert latest == date(2025, 7, 5)
+
+
+def test_latest_safe_departure_counts_both_travel_days():
+    assert planner.latest_safe_departure(date(2025, 6, 1), 1, 2025) == date(2025, 6, 1)
+    assert planner.latest_safe_departure(date(2025, 6, 1), 10, 2025) == date(2025, 6, 1) + timedelta(days=9)
+    assert planner.latest_safe_departure(date(2025, 6, 1), 0, 2025) is None
+
+
+def test_latest_safe_departure_stops_at_the_end_of_the_tax_year():
+    assert planner.latest_safe_departure(date(2025, 11, 1), 100, 2025) == date(2025, 12, 31)
+    with pytest.raises(ValueError, match="not in the tax year 2025"):
+        planner.latest_safe_departure(date(2026, 1, 5), 100, 2025)
@@ -0,0 +1,58 @@
+import numpy as np
+from hypothesis import given
+
+import reference
+from residency import engine, presence, vectorized
+from strategies import TAX_YEAR, dated_columns, dated_people, profiles, trip_lists
+
+
+def reference_days(trips):
+    days = reference.days_present(trips)
+    return [reference.days_in_year(days, TAX_YEAR - k) for k in range(3)]
+
+
+@given(trip_lists)
+def test_calendar_counts_each_day_once(trips):
+    assert list(presence.PresenceCalendar(trips).year_days(TAX_YEAR)) == reference_days(trips)
+
+
+@given(trip_lists, trip_lists)
+def test_calendar_is_order_independent(first, second):
+    assert presence.PresenceCalendar(first + second) == presence.PresenceCalendar(second + first)
+
+
+@given(profiles, trip_lists)
+def test_evaluate_matches_reference(profile, trips):
+    result = presence.evaluate(profile, trips, TAX_YEAR)
+    code, score = reference.spt(profile.visa_type, profile.exempt_years, *reference_days(trips))
+    assert (result.code, result.score) == (code, score)
+
+
+@given(dated_people)
+def test_pack_matches_calendar(history):
+    person, start, end, visa, _ = dated_columns(history)
+    bitmaps = presence.pack(person, start, end, len(visa), TAX_YEAR)
+    for i, (_, trips) in enumerate(history):
+        calendar = presence.PresenceCalendar(trips)
+        for k in range(3):
+            assert bitmaps[i, k].tobytes() == calendar.bitmap(TAX_YEAR - k)
+
+
+@given(dated_people)
+def test_evaluate_batch_matches_reference(history):
+    person, start, end, visa, exempt_years = dated_columns(history)
+    result = presence.evaluate_batch(person, start, end, visa, exempt_years, TAX_YEAR)
+    for i, (profile, trips) in enumerate(history):
+        days = reference_days(trips)
+        code, score = reference.spt(profile.visa_type, profile.exempt_years, *days)
+        assert result.days[i].tolist() == days
+        assert bool(result.resident[i]) == (code == "RA")
+        assert np.isnan(result.score[i]) if score is None else result.score[i] == score
+        expected_reason = engine.classify(profile, *days).reason
+        assert result.exempt[i] == (result.reason[i] == vectorized.EXEMPT)
+        if not result.exempt[i]:
+            assert {
+                vectorized.UNDER_MINIMUM: engine.REASON_UNDER_MINIMUM,
+                vectorized.PASSED: engine.REASON_PASSED,
+                vectorized.FAILED: engine.REASON_FAILED,
+            }[int(result.reason[i])] == expected_reason
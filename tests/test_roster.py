@@ -0,0 +1,54 @@
+from datetime import date
+
+import numpy as np
+import pytest
+from hypothesis import given
+
+import reference
+from residency import engine, presence, roster, vectorized
+from strategies import TAX_YEAR, dated_columns, dated_people
+
+FIRST, LAST = TAX_YEAR - 1, TAX_YEAR + 1
+
+
+@given(dated_people)
+def test_year_counts_match_reference(history):
+    person, start, end, visa, _ = dated_columns(history)
+    counts = presence.year_counts(person, start, end, len(visa), FIRST - 2, LAST)
+    for i, (_, trips) in enumerate(history):
+        days = reference.days_present(trips)
+        assert counts[i].tolist() == [reference.days_in_year(days, y) for y in range(FIRST - 2, LAST + 1)]
+
+
+@given(dated_people)
+def test_roster_matches_per_year_evaluation(history):
+    person, start, end, visa, exempt_years = dated_columns(history)
+    result = roster.evaluate(person, start, end, visa, exempt_years, FIRST, LAST)
+    assert result.years.tolist() == list(range(FIRST, LAST + 1))
+    for j, year in enumerate(result.years.tolist()):
+        single = presence.evaluate_batch(person, start, end, visa, result.exempt_years[:, j], year)
+        assert result.days[:, j:j + 3][:, ::-1].tolist() == single.days.tolist()
+        assert result.reason[:, j].tolist() == single.reason.tolist()
+        assert result.resident[:, j].tolist() == single.resident.tolist()
+        np.testing.assert_array_equal(result.score[:, j], single.score)
+
+
+def test_exempt_years_count_years_present():
+    # F-1 with 3 exempt years before 2024, present every year: exempt in 2024 and 2025 only.
+    trips = [engine.Trip(date(y, 1, 1), date(y, 12, 31)) for y in range(2022, 2028)]
+    person, start, end, visa, exempt_years = dated_columns([(engine.Profile("F1", 3), trips)])
+    result = roster.evaluate(person, start, end, visa, exempt_years, 2024, 2027)
+    assert result.exempt_years[0].tolist() == [3, 4, 5, 6]
+    assert result.exempt[0].tolist() == [True, True, False, False]
+    assert result.reason[0].tolist() == [vectorized.EXEMPT] * 2 + [vectorized.PASSED] * 2
+
+
+def test_absent_years_do_not_count():
+    days = np.array([[10, 0, 0, 5]])
+    assert roster.exempt_years_by_year(np.array([1]), days).tolist() == [[1, 2, 2, 2]]
+
+
+def test_rejects_reversed_range():
+    person, start, end, visa, exempt_years = dated_columns([(engine.Profile(), [])])
+    with pytest.raises(ValueError):
+        roster.evaluate(person, start, end, visa, exempt_years, TAX_YEAR, TAX_YEAR - 1)
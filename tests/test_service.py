@@ -0,0 +1,196 @@
+import asyncio
+import json
+import re
+
+import pytest
+from hypothesis import given
+
+from residency import api, batch, engine, service
+from residency.store import TripStore
+from strategies import TAX_YEAR, people
+
+
+def person_json(profile, trips):
+    return {
+        "visaType": profile.visa_type,
+        "exemptYears": profile.exempt_years,
+        "taxYear": TAX_YEAR,
+        "trips": [
+            [[t.start and t.start.isoformat(), t.end and t.end.isoformat()] for t in bucket]
+            for bucket in trips
+        ],
+    }
+
+
+async def call(app, method, path, body=b""):
+    """One request through the ASGI interface; returns ``(status, body bytes)``."""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    return sent[0]["status"], b"".join(m.get("body", b"") for m in sent[1:])
+
+
+async def post(app, path, body):
+    """POST ``body`` as JSON; returns ``(status, json)``."""
+    status, raw = await call(app, "POST", path, json.dumps(body).encode())
+    return status, json.loads(raw)
+
+
+@given(people)
+def test_evaluate_many_matches_engine(history):
+    parsed = [api.parse_person(person_json(*p)) for p in history]
+    expected = [api.result_json(engine.evaluate(*p, TAX_YEAR)) for p in history]
+    assert api.evaluate_many(parsed) == expected
+
+
+@pytest.mark.parametrize(
+    "value, message",
+    [
+        ([], "JSON object"),
+        ({"visaType": "O1"}, "unknown visa type"),
+        ({"visaType": "H1B", "exemptYears": "two"}, "whole number"),
+        ({"visaType": "H1B", "exemptYears": float("inf")}, "whole number"),
+        ({"visaType": "H1B", "exemptYears": 1.5}, "whole number"),
+        ({"visaType": "H1B", "exemptYears": 10**24}, "at most"),
+        ({"visaType": "H1B", "taxYear": "next"}, "taxYear must be a year"),
+        ({"visaType": "H1B", "taxYear": 20250}, "four-digit year"),
+        ({"visaType": "H1B", "trips": [[], []]}, "3 year lists"),
+        ({"visaType": "H1B", "trips": [[["2025-01-01"]], [], []]}, "[start, end] pair"),
+        ({"visaType": "H1B", "trips": [[["2025-02-30", ""]], [], []]}, "invalid date"),
+    ],
+)
+def test_parse_person_rejects(value, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        api.parse_person(value)
+
+
+@given(people)
+def test_concurrent_requests_share_one_batch(history):
+    app = service.create_app(max_batch=len(history), max_delay=60)
+
+    async def run():
+        return await asyncio.gather(*(post(app, "/evaluate", person_json(*p)) for p in history))
+
+    responses = asyncio.run(run())
+    assert app.state.batcher.batches == 1
+    assert responses == [(200, api.result_json(engine.evaluate(*p, TAX_YEAR))) for p in history]
+
+
+def test_bad_request_does_not_fail_its_batch():
+    # The bad request is rejected before it joins the batch; the good one waits out max_delay.
+    app = service.create_app(max_batch=2, max_delay=0.05)
+    good = {"visaType": "H1B", "taxYear": 2025, "trips": [[["2025-01-01", "2025-12-31"]], [], []]}
+
+    async def run():
+        return await asyncio.gather(
+            call(app, "POST", "/evaluate", json.dumps(good).encode()),
+            call(app, "POST", "/evaluate", b'{"visaType": "F1", "exemptYears": Infinity}'),
+        )
+
+    (ok, body), (bad, error) = asyncio.run(run())
+    assert (ok, json.loads(body)["code"]) == (200, "RA")
+    assert bad == 400 and "whole number" in json.loads(error)["error"]
+
+
+def test_failing_person_is_isolated_in_batch():
+    batcher = service.MicroBatcher(max_batch=2, max_delay=60)
+    good = api.Person(engine.Profile("H1B"), engine.YearTrips([], [], []), TAX_YEAR)
+    broken = api.Person(engine.Profile("H1B", 10**24), engine.YearTrips([], [], []), TAX_YEAR)  # overflows int64
+
+    async def run():
+        return await asyncio.gather(
+            batcher.evaluate(good), batcher.evaluate(broken), return_exceptions=True
+        )
+
+    result, error = asyncio.run(run())
+    assert result == api.result_json(engine.evaluate(*good))
+    assert isinstance(error, OverflowError)
+
+
+def test_lone_request_is_not_held_back():
+    app = service.create_app(max_delay=0.001)
+    status, body = asyncio.run(post(app, "/evaluate", {"visaType": "J1", "exemptYears": 0}))
+    assert (status, body["isExempt"]) == (200, True)
+
+
+def test_batch_endpoint():
+    app = service.create_app()
+    people_ = [
+        {"visaType": "H1B", "taxYear": 2025, "trips": [[["2025-01-01", "2025-12-31"]], [], []]},
+        {"visaType": "F1", "exemptYears": 6, "taxYear": 2025, "trips": [[["2025-03-01", "2025-03-31"]], [], []]},
+    ]
+    status, body = asyncio.run(post(app, "/evaluate:batch", {"people": people_}))
+    assert status == 200
+    assert [r["code"] for r in body["results"]] == ["RA", "NRA"]
+    assert body["results"][1]["score"] == 31
+
+
+@pytest.mark.parametrize(
+    "path, body, message",
+    [
+        ("/evaluate", {"visaType": "H1B", "exemptYears": -1}, "negative"),
+        ("/evaluate:batch", [], 'expected {"people"'),
+        ("/evaluate:batch", {"people": [{"visaType": "H1B"}, {}]}, "people[1]: unknown visa type"),
+    ],
+)
+def test_bad_requests(path, body, message):
+    status, response = asyncio.run(post(service.create_app(), path, body))
+    assert status == 400
+    assert message in response["error"]
+
+
+def test_metrics_endpoint():
+    app = service.create_app(max_delay=0)
+    asyncio.run(post(app, "/evaluate", {"visaType": "H1B"}))
+    status, raw = asyncio.run(call(app, "GET", "/metrics"))
+    assert status == 200
+    assert 'residency_stage_seconds_count{side="server",stage="service_batch"}' in raw.decode()
+
+
+@pytest.mark.parametrize(
+    "trips, code",
+    [
+        # Overlapping trips: 181 distinct days, not 242.
+        ([["2025-01-01", "2025-04-30"], ["2025-03-01", "2025-06-30"]], "NRA"),
+        # Only ten of these days fall in 2025.
+        ([["2024-07-01", "2025-01-10"]], "NRA"),
+        ([["2025-01-01", "2025-07-02"]], "RA"),
+    ],
+)
+def test_every_path_counts_days_alike(tmp_path, trips, code):
+    value = {"visaType": "H1B", "exemptYears": 0, "taxYear": 2025, "trips": [trips, [], []]}
+    _, served = asyncio.run(post(service.create_app(max_delay=0), "/evaluate", value))
+
+    (tmp_path / "in.csv").write_text(
+        ",".join(batch.INPUT_COLUMNS) + "".join(f"\np1,H1B,0,{s},{e}" for s, e in trips) + "\n"
+    )
+    batch.run(tmp_path / "in.csv", tmp_path / "out.csv", 2025)
+    batched = (tmp_path / "out.csv").read_text().splitlines()[1].split(",")[1].strip('"')
+
+    profile, year_trips, _ = api.parse_person(value)
+    store = TripStore(":memory:")
+    store.set_profile("p1", profile)
+    store.add_trips("p1", year_trips.current)
+
+    assert served["code"] == batched == store.evaluate("p1", 2025).code == code
@@ -0,0 +1,71 @@
+from datetime import date
+
+import numpy as np
+from hypothesis import given, settings, strategies as st
+
+import reference
+from residency import engine, presence, solver
+from strategies import TAX_YEAR, dated_columns, dated_people, profiles, year_trips
+
+tax_year_dates = st.dates(date(TAX_YEAR, 1, 1), date(TAX_YEAR, 12, 31))
+
+
+@given(st.integers(0, 400), st.integers(0, 400))
+def test_required_cy_days_is_the_smallest_passing_count(cy1, cy2):
+    need = int(solver.required_cy_days(np.array(cy1), np.array(cy2)))
+    assert reference.spt("H1B", 0, need, cy1, cy2)[0] == "RA"
+    assert reference.spt("H1B", 0, need - 1, cy1, cy2)[0] == "NRA"
+
+
+@given(profiles, year_trips, st.none() | tax_year_dates)
+def test_start_date_matches_day_by_day_search(profile, trips, as_of):
+    answer = solver.start_date(profile, trips, TAX_YEAR, as_of)
+    if reference.is_exempt(profile.visa_type, profile.exempt_years):
+        assert answer == (None, None)
+        return
+    days = reference.days_present([t for bucket in trips for t in bucket])
+    days_cy = {day for day in days if day.year == TAX_YEAR}
+    cy1, cy2 = (reference.days_in_year(days, TAX_YEAR - k) for k in (1, 2))
+    assert answer.reached == reference.first_day_met(days_cy, cy1, cy2, TAX_YEAR)
+    if as_of is None:
+        assert answer.projected is None
+    else:
+        assert answer.projected == reference.first_day_met(days_cy, cy1, cy2, TAX_YEAR, as_of)
+
+
+@given(profiles, year_trips)
+def test_start_date_is_set_exactly_when_result_is_resident(profile, trips):
+    answer = solver.start_date(profile, trips, TAX_YEAR)
+    resident = engine.evaluate(profile, trips, TAX_YEAR).code == engine.RESIDENT
+    assert (answer.reached is not None) == resident
+
+
+def test_days_outside_the_tax_year_do_not_reach_it():
+    # Entered in the CY box, but only 10 of its days are in 2025.
+    trips = engine.YearTrips([engine.Trip(date(2024, 7, 1), date(2025, 1, 10))])
+    assert solver.start_date(engine.Profile(), trips, 2025).reached is None
+    # Overlapping trips cover Jan 1 to Jun 30 once: 181 days, never 183.
+    trips = engine.YearTrips(
+        [engine.Trip(date(2025, 1, 1), date(2025, 4, 30)), engine.Trip(date(2025, 3, 1), date(2025, 6, 30))]
+    )
+    assert solver.start_date(engine.Profile(), trips, 2025).reached is None
+
+
+@settings(max_examples=50)
+@given(dated_people, tax_year_dates)
+def test_start_dates_matches_calendar_search(history, as_of):
+    person, start, end, visa, exempt_years = dated_columns(history)
+    bitmaps = presence.pack(person, start, end, len(visa), TAX_YEAR)
+    reached, projected = solver.start_dates(bitmaps, visa, exempt_years, TAX_YEAR, np.datetime64(as_of))
+    for i, (profile, trips) in enumerate(history):
+        got = tuple(None if np.isnat(d) else d.astype(date) for d in (reached[i], projected[i]))
+        if reference.is_exempt(profile.visa_type, profile.exempt_years):
+            assert got == (None, None)
+            continue
+        days = reference.days_present(trips)
+        days_cy = {day for day in days if day.year == TAX_YEAR}
+        cy1, cy2 = (reference.days_in_year(days, TAX_YEAR - k) for k in (1, 2))
+        assert got == (
+            reference.first_day_met(days_cy, cy1, cy2, TAX_YEAR),
+            reference.first_day_met(days_cy, cy1, cy2, TAX_YEAR, as_of),
+        )
@@ -0,0 +1,78 @@
+from datetime import date
+
+from hypothesis import given, settings, strategies as st
+
+import reference
+from residency import engine, presence
+from residency.store import TripStore, window
+from strategies import TAX_YEAR, dates, profiles, trip_lists
+
+tax_years = st.integers(TAX_YEAR - 2, TAX_YEAR + 1)
+
+
+def store_with(trips, profile=None):
+    store = TripStore()
+    if profile is not None:
+        store.set_profile("p", profile)
+    store.add_trips("p", trips)
+    return store
+
+
+@given(profiles, trip_lists, tax_years)
+def test_evaluate_matches_presence(profile, trips, tax_year):
+    with store_with(trips, profile) as store:
+        assert store.evaluate("p", tax_year) == presence.evaluate(profile, trips, tax_year)
+
+
+@given(trip_lists, dates, dates)
+def test_range_query_returns_overlapping_trips(trips, a, b):
+    first, last = min(a, b), max(a, b)
+    with store_with(trips) as store:
+        found = store.trips("p", first, last)
+    expected = [
+        tuple(sorted((t.start, t.end)))
+        for t in trips
+        if t.start and t.end and max(t.start, t.end) >= first and min(t.start, t.end) <= last
+    ]
+    assert sorted((t.start, t.end) for t in found) == sorted(expected)
+
+
+@given(trip_lists, tax_years)
+def test_year_views_hold_each_years_days(trips, tax_year):
+    with store_with(trips) as store:
+        view = store.year_trips("p", tax_year)
+    days = reference.days_present(trips)
+    for k, bucket in enumerate(view):
+        assert all(t.start.year == t.end.year == tax_year - k for t in bucket)
+        assert reference.days_present(bucket) == {d for d in days if d.year == tax_year - k}
+
+
+@settings(max_examples=50)
+@given(trip_lists, trip_lists, tax_years)
+def test_replace_window_keeps_outside_days(stored, replacement, tax_year):
+    first, last = window(tax_year)
+    with store_with(stored) as store:
+        store.replace_window("p", tax_year, replacement)
+        once = store.trips("p", date.min, date.max)
+        store.replace_window("p", tax_year, replacement)
+        assert store.trips("p", date.min, date.max) == once
+    outside = {d for d in reference.days_present(stored) if not first <= d <= last}
+    inside = {d for d in reference.days_present(replacement) if first <= d <= last}
+    assert reference.days_present(once) == outside | inside
+
+
+def test_unknown_person():
+    with TripStore() as store:
+        assert store.profile("nobody") is None
+        assert store.year_trips("nobody", TAX_YEAR) == engine.YearTrips([], [], [])
+        assert store.evaluate("nobody", TAX_YEAR).code == engine.NON_RESIDENT
+
+
+def test_persists_across_connections(tmp_path):
+    path = str(tmp_path / "trips.db")
+    with TripStore(path) as store:
+        store.set_profile("p", engine.Profile("F1", 6))
+        store.add_trips("p", [engine.Trip(date(2025, 1, 1), date(2025, 7, 2))])
+    with TripStore(path) as store:
+        assert store.profile("p") == engine.Profile("F1", 6)
+        assert store.evaluate("p", 2025).code == engine.RESIDENT
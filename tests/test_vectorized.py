@@ -0,0 +1,28 @@
+import numpy as np
+from hypothesis import given, strategies as st
+
+import reference
+from residency import engine, vectorized
+from strategies import day_counts, profiles
+
+day_tables = st.lists(st.tuples(profiles, day_counts, day_counts, day_counts), min_size=1, max_size=20)
+
+
+@given(day_tables)
+def test_classify_matches_reference(rows):
+    visa = np.array([vectorized.VISA_CODES[p.visa_type] for p, *_ in rows])
+    exempt_years = np.array([p.exempt_years for p, *_ in rows])
+    days = np.array([d for _, *d in rows], dtype=np.int64).reshape(-1, 3)
+    result = vectorized.classify(visa, exempt_years, days)
+    for i, (profile, *counts) in enumerate(rows):
+        code, score = reference.spt(profile.visa_type, profile.exempt_years, *counts)
+        assert bool(result.resident[i]) == (code == "RA")
+        if score is None:
+            assert result.exempt[i] and np.isnan(result.score[i])
+        else:
+            assert not result.exempt[i] and result.score[i] == score
+        assert result.reason[i] == vectorized.EXEMPT or engine.classify(profile, *counts).reason == {
+            vectorized.UNDER_MINIMUM: engine.REASON_UNDER_MINIMUM,
+            vectorized.PASSED: engine.REASON_PASSED,
+            vectorized.FAILED: engine.REASON_FAILED,
+        }[int(result.reason[i])]